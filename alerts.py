@@ -0,0 +1,239 @@
+"""
+관심 목록 알림 — 수집 경로에서 새 기사를 모든 관심 목록과 한 번에 대조
+- 관심 목록 = 이름 → 티커 · 코인 · 키워드(여러 단어 구문 가능), 설정 파일 NEWS_WATCHLISTS_FILE (기본 ./.cache/watchlists.json)
+- 모든 목록의 단어를 토큰 트라이 하나로 미리 컴파일 → 기사 1건 평가 비용은 (기사 토큰 수 × 최장 구문 길이),
+  목록이 몇 개든 같음. 컴파일된 Matcher 는 바꾸지 않고 통째로 교체하므로 읽을 때 잠금이 필요 없음
+- $NVDA · (NASDAQ: AAPL) · Bitcoin → BTC 같은 표기는 history.extract_tickers 로 티커 토큰을 덧붙여 맞춤
+- 수집 경로(ItemStore.put · 백필 · CLI 리포트)에서 호출, 제목 해시로 이미 평가한 기사는 건너뜀 → news_data 를 다시 훑지 않음
+- 알림은 번호가 붙은 최근 로그에 쌓이고 화면은 since(번호)로 새 알림만 가져감
+- outbox 를 켠 목록의 알림은 NEWS_ALERT_OUTBOX (기본 ./.cache/alerts.jsonl) 에 한 줄씩 추가 (외부 전송은 이 파일을 읽는 쪽 몫)
+"""
+
+import collections
+import json
+import os
+import re
+import threading
+import time
+
+from history import extract_tickers
+from newsbatch import title_digest
+from normalize import epoch_to_iso
+
+_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+WATCHLISTS_FILE = os.getenv("NEWS_WATCHLISTS_FILE") or os.path.join(_CACHE_DIR, "watchlists.json")
+OUTBOX_FILE = os.getenv("NEWS_ALERT_OUTBOX") or os.path.join(_CACHE_DIR, "alerts.jsonl")
+LOG_SIZE = 1000
+SEEN_CAP = 50000
+
+Watchlist = collections.namedtuple("Watchlist", "name terms outbox")
+Alert = collections.namedtuple("Alert", "seq at watchlist terms item")
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9&.-]*[a-z0-9]|[a-z0-9]")
+_END = ""  # 트라이 노드에서 '여기서 끝나는 구문' 자리 (토큰은 빈 문자열이 될 수 없음)
+
+
+def _tokens(text: str) -> list:
+    return _TOKEN.findall(text.lower())
+
+
+def parse_terms(text: str) -> tuple:
+    """'NVDA, $TSLA, rate cut' → ('NVDA', 'TSLA', 'rate cut'). 쉼표 구분, 구문 안의 공백은 유지."""
+    terms = (term.strip().lstrip("$").strip() for term in (text or "").split(","))
+    return tuple(dict.fromkeys(term for term in terms if _tokens(term)))
+
+
+class Matcher:
+    """관심 목록 전체를 컴파일한 토큰 트라이. 만든 뒤에는 바꾸지 않는다."""
+
+    def __init__(self, watchlists):
+        self.root = {}
+        self.depth = 0
+        for wl in watchlists:
+            for term in wl.terms:
+                toks = _tokens(term)
+                if not toks:
+                    continue
+                node = self.root
+                for tok in toks:
+                    node = node.setdefault(tok, {})
+                node.setdefault(_END, {}).setdefault(wl.name, []).append(term)
+                self.depth = max(self.depth, len(toks))
+
+    def match(self, text: str) -> dict:
+        """목록 이름 → 걸린 단어 목록."""
+        if not self.root:
+            return {}
+        # 본문 토큰 뒤에 추출한 티커를 따로 붙임 (None 으로 끊어 구문이 경계를 넘지 않게)
+        toks = _tokens(text) + [None] + [ticker.lower() for ticker in extract_tickers(text)]
+        hits = {}
+        for i in range(len(toks)):
+            node = self.root
+            for tok in toks[i : i + self.depth]:
+                node = node.get(tok) if tok is not None else None
+                if node is None:
+                    break
+                for name, terms in node.get(_END, {}).items():
+                    found = hits.setdefault(name, [])
+                    found += [term for term in terms if term not in found]
+        return hits
+
+
+class AlertBook:
+    def __init__(self, path: str = None, outbox: str = None, log_size: int = LOG_SIZE, seen_cap: int = SEEN_CAP):
+        self.path = path or WATCHLISTS_FILE
+        self.outbox = outbox or OUTBOX_FILE
+        self.seen_cap = seen_cap
+        self.seq = 0
+        self._log = collections.deque(maxlen=log_size)
+        self._seen = {}  # 제목 해시 → None (삽입 순서로 오래된 것부터 정리)
+        self._lock = threading.Lock()
+        self._outbox_lock = threading.Lock()
+        self._mtime = None
+        self._watchlists = {}
+        self._matcher = Matcher(())
+        self._reload()
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                entries = json.load(f).get("watchlists", [])
+        except (OSError, ValueError):
+            return {}
+        return {
+            e["name"]: Watchlist(e["name"], tuple(e.get("terms", ())), bool(e.get("outbox")))
+            for e in entries
+            if e.get("name")
+        }
+
+    def _reload(self) -> None:
+        """설정 파일이 바뀌었으면(CLI · 다른 프로세스) 다시 읽어 컴파일한다."""
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            mtime = None
+        if mtime == self._mtime:
+            return
+        watchlists = self._read()
+        self._watchlists, self._matcher, self._mtime = watchlists, Matcher(watchlists.values()), mtime
+
+    def _write(self, watchlists: dict) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            entries = [{"name": wl.name, "terms": list(wl.terms), "outbox": wl.outbox} for wl in watchlists.values()]
+            json.dump({"watchlists": entries}, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        os.replace(tmp, self.path)
+        self._watchlists, self._matcher = watchlists, Matcher(watchlists.values())
+        self._mtime = os.path.getmtime(self.path)
+
+    def watchlists(self) -> list:
+        with self._lock:
+            self._reload()
+            return list(self._watchlists.values())
+
+    def save_watchlist(self, name: str, terms, outbox: bool = False) -> Watchlist:
+        """목록을 추가하거나 바꾼다 (같은 이름이면 덮어씀)."""
+        wl = Watchlist(name.strip(), tuple(terms), bool(outbox))
+        if not wl.name or not wl.terms:
+            raise ValueError("관심 목록에는 이름과 단어가 하나 이상 필요합니다.")
+        with self._lock:
+            self._reload()
+            self._write({**self._watchlists, wl.name: wl})
+        return wl
+
+    def remove_watchlist(self, name: str) -> bool:
+        with self._lock:
+            self._reload()
+            if name not in self._watchlists:
+                return False
+            self._write({key: wl for key, wl in self._watchlists.items() if key != name})
+        return True
+
+    def evaluate(self, items, source: str = "", now: float = None) -> list:
+        """처음 보는 기사만 모든 목록과 대조해 새 알림 목록을 돌려준다."""
+        now = time.time() if now is None else now
+        with self._lock:
+            self._reload()
+            matcher, watchlists = self._matcher, self._watchlists
+            fresh = []
+            for item in items:
+                key = title_digest(item.get("title", ""))
+                if key not in self._seen:
+                    self._seen[key] = None
+                    fresh.append(item)
+            while len(self._seen) > self.seen_cap:
+                del self._seen[next(iter(self._seen))]
+        if not matcher.root or not fresh:
+            return []
+        found = []
+        for item in fresh:
+            for name, terms in matcher.match(f"{item.get('title', '')} {item.get('description') or ''}").items():
+                found.append((name, tuple(terms), item))
+        if not found:
+            return []
+        with self._lock:
+            alerts = []
+            for name, terms, item in found:
+                self.seq += 1
+                alerts.append(Alert(self.seq, now, name, terms, item))
+            self._log.extend(alerts)
+        self._write_outbox([alert for alert in alerts if watchlists[alert.watchlist].outbox], source)
+        return alerts
+
+    def _write_outbox(self, alerts: list, source: str) -> None:
+        if not alerts:
+            return
+        lines = [
+            json.dumps(
+                {
+                    "at": epoch_to_iso(alert.at),
+                    "watchlist": alert.watchlist,
+                    "terms": list(alert.terms),
+                    "feed": source,
+                    "title": alert.item.get("title", ""),
+                    "url": alert.item.get("url", ""),
+                    "source": alert.item.get("source", ""),
+                    "published_at": alert.item.get("published_at", ""),
+                },
+                ensure_ascii=False,
+            )
+            for alert in alerts
+        ]
+        try:
+            os.makedirs(os.path.dirname(self.outbox), exist_ok=True)
+            with self._outbox_lock, open(self.outbox, "a", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+        except OSError:
+            pass
+
+    def since(self, seq: int = 0, names=None) -> list:
+        """seq 이후 알림 (최신 먼저). names 를 주면 그 목록의 알림만."""
+        with self._lock:
+            log = [alert for alert in self._log if alert.seq > seq]
+        if names is not None:
+            names = set(names)
+            log = [alert for alert in log if alert.watchlist in names]
+        return log[::-1]
+
+
+_book = None
+_book_lock = threading.Lock()
+
+
+def book() -> AlertBook:
+    """프로세스 공용 알림 장부 (수집 경로 · 화면 · CLI 가 같이 씀)."""
+    global _book
+    with _book_lock:
+        if _book is None:
+            _book = AlertBook()
+        return _book
+
+
+def evaluate(items, source: str = "") -> list:
+    """수집 경로용: 실패해도 수집을 막지 않는다."""
+    try:
+        return book().evaluate(items, source)
+    except Exception:
+        return []
@@ -0,0 +1,92 @@
+"""
+API 소스 백필 (화면 수집과 별개의 백그라운드 작업)
+- Finnhub: 카테고리별(general · merger · crypto) 전체 응답, 이후에는 minId 로 새 기사만
+- CryptoPanic: page 번호를 1씩 올려 최대 NEWS_BACKFILL_PAGES 쪽 (응답에 next 가 없거나 어제 이전 기사만 남으면 멈춤)
+- MKT News: 플래시 JSON 전체 (화면 수집은 앞 50건)
+- 작업들은 동시에 돌고 결과는 ItemStore 의 소스별 이력에 합쳐짐 → 두 모드 화면 모두에서 보임
+- 요청은 ratelimit 예산을 그대로 거치므로 한도를 넘지 않음
+"""
+
+import concurrent.futures
+import os
+import threading
+
+from newscore import fetch_cryptopanic, fetch_finnhub_page, fetch_mktnews
+
+BACKFILL_PAGES = int(os.getenv("NEWS_BACKFILL_PAGES", "5") or 5)
+BACKFILL_INTERVAL = float(os.getenv("NEWS_BACKFILL_INTERVAL", "900") or 900)
+FINNHUB_CATEGORIES = ("general", "merger", "crypto")
+
+
+class Backfiller:
+    def __init__(
+        self,
+        store,
+        api_keys: dict,
+        pages: int = BACKFILL_PAGES,
+        interval: float = BACKFILL_INTERVAL,
+        max_workers: int = 4,
+        on_update=None,
+    ):
+        self.store = store
+        self.api_keys = api_keys
+        self.pages = pages
+        self.interval = interval
+        self.max_workers = max_workers
+        self.on_update = on_update  # 새 기사가 들어오면 호출 (예: BackgroundCollector.refresh)
+        self.runs = 0
+        self.added = {}
+        self._min_ids = {}  # Finnhub 카테고리 → 마지막으로 본 id
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _finnhub(self, category: str) -> list:
+        api_key = self.api_keys.get("FINNHUB_API_KEY", "")
+        items, max_id = fetch_finnhub_page(api_key, category, self._min_ids.get(category, 0))
+        self._min_ids[category] = max_id
+        return items
+
+    def jobs(self) -> list:
+        """(저장소 소스 이름, 함수, 인자) 목록. 키가 없는 API 는 건너뜀."""
+        jobs = [("MKT News", fetch_mktnews, (0,))]
+        if self.api_keys.get("FINNHUB_API_KEY"):
+            jobs += [("Finnhub API", self._finnhub, (category,)) for category in FINNHUB_CATEGORIES]
+        if self.api_keys.get("CRYPTOPANIC_API_KEY"):
+            jobs.append(("CryptoPanic", fetch_cryptopanic, (self.api_keys["CRYPTOPANIC_API_KEY"], self.pages)))
+        return jobs
+
+    def run_once(self) -> dict:
+        """모든 백필 작업을 동시에 돌리고 소스별 새로 추가된 건수를 돌려준다."""
+        added = {}
+        jobs = self.jobs()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(self.max_workers, len(jobs))) as pool:
+            futures = {pool.submit(fn, *args): name for name, fn, args in jobs}
+            for fut in concurrent.futures.as_completed(futures):
+                name = futures[fut]
+                try:
+                    items = fut.result()
+                except Exception:
+                    continue
+                added[name] = added.get(name, 0) + self.store.add_history(name, items)
+        self.runs += 1
+        self.added = added
+        if self.on_update and any(added.values()):
+            self.on_update()
+        return added
+
+    def run_forever(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception:
+                pass
+            self._stop.wait(self.interval)
+
+    def start(self) -> "Backfiller":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.run_forever, name="news-backfill", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
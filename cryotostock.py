@@ -1,19 +1,49 @@
 """
 통합 Streamlit 앱: 주식 뉴스 + 코인 뉴스
 - 사이드바에서 '주식 뉴스' / '코인 뉴스' 선택 후 각각 수집·AI 요약·목록 표시
+- 수집·요약 로직은 newscore 에 있고, 이 스크립트는 rerun 마다 UI 만 다시 그린다
 """
 
+import time
+
+_T0 = time.perf_counter()
+
 import datetime
+import html
 import os
-import re
-from email.utils import parsedate_to_datetime
 
-import requests
 import streamlit as st
-from bs4 import BeautifulSoup
-from dotenv import load_dotenv
 
-load_dotenv()
+import alerts
+import datasets
+import enrich
+import health
+import history
+import lazydeps
+import ranking
+import rendercache
+import reports
+import singleflight
+import snapshots
+import topics
+from backfill import Backfiller
+from itemstore import ItemStore
+from newsbatch import title_digest
+from newscore import (
+    AI_ALIASES,
+    AI_PROVIDERS,
+    PROMPT_COIN_DEEP,
+    PROMPT_COIN_QUICK,
+    PROMPT_STOCK_DEEP,
+    PROMPT_STOCK_QUICK,
+    SOURCES,
+    FEEDS,
+    build_tasks,
+)
+from normalize import item_kst
+from rendercache import content_version
+from reports import ReportScheduler
+from scheduler import BackgroundCollector
 
 st.set_page_config(
     page_title="주식·코인 뉴스 리포트",
@@ -22,6 +52,27 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
+# ── 프로파일링 (NEWS_PROFILE=1 또는 ?profile=1) ───
+_PERF: list = [("import", (time.perf_counter() - _T0) * 1000)]
+
+
+def perf_mark(label: str) -> None:
+    _PERF.append((label, (time.perf_counter() - _T0) * 1000))
+
+
+def render_profile() -> None:
+    if not (os.getenv("NEWS_PROFILE") or st.query_params.get("profile")):
+        return
+    perf_mark("total")
+    recent_ms = st.session_state.setdefault("_perf_history", [])
+    recent_ms.append(round(_PERF[-1][1], 1))
+    del recent_ms[:-20]
+    with st.sidebar.expander("⏱️ 렌더 프로파일", expanded=False):
+        st.text("\n".join(f"{label:<10} {ms:8.1f} ms" for label, ms in _PERF))
+        st.caption(f"최근 rerun(ms): {recent_ms}")
+        st.caption(f"렌더 캐시: {rendercache.stats()}")
+        st.caption(f"공유 데이터셋: {get_datasets().stats()}")
+
 
 def get_secret(key: str) -> str:
     try:
@@ -30,12 +81,23 @@ def get_secret(key: str) -> str:
         return os.getenv(key, "")
 
 
+@st.cache_resource(show_spinner=False)
+def load_secrets() -> dict:
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    keys = ("FINNHUB_API_KEY", "CRYPTOPANIC_API_KEY", "OPENAI_API_KEY", "GEMINI_API_KEY", "APP_PASSWORD")
+    return {key: get_secret(key) for key in keys}
+
+
 # ── API 키 (공통 + 주식/코인) ─────────────────────
-FINNHUB_API_KEY = get_secret("FINNHUB_API_KEY")
-CRYPTOPANIC_API_KEY = get_secret("CRYPTOPANIC_API_KEY")
-OPENAI_API_KEY = get_secret("OPENAI_API_KEY")
-GEMINI_API_KEY = get_secret("GEMINI_API_KEY")
-APP_PASSWORD = get_secret("APP_PASSWORD")
+_secrets = load_secrets()
+FINNHUB_API_KEY = _secrets["FINNHUB_API_KEY"]
+CRYPTOPANIC_API_KEY = _secrets["CRYPTOPANIC_API_KEY"]
+OPENAI_API_KEY = _secrets["OPENAI_API_KEY"]
+GEMINI_API_KEY = _secrets["GEMINI_API_KEY"]
+APP_PASSWORD = _secrets["APP_PASSWORD"]
+perf_mark("secrets")
 
 # ── 비밀번호 인증 (한 번만) ───────────────────────
 if "authenticated" not in st.session_state:
@@ -96,13 +158,14 @@ SOURCE_COLORS = {
     "decrypt": "#00d4aa",
 }
 
-HEADERS = {
-    "User-Agent": (
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-    ),
-    "Accept-Language": "en-US,en;q=0.9",
-}
+LIVE_POLL_SECONDS = 15
+ENRICH_WAIT_SECONDS = 8  # 요약 전에 본문 가져오기를 기다리는 최대 시간
+SUMMARY_REUSE_SECONDS = 120  # 같은 기사 묶음의 요약 결과를 다른 세션이 재사용하는 시간
+ALERT_SHOW = 20  # 화면에 보여 줄 최근 알림 수
+
+_fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+
+FEED_DEFAULTS = {feed.name: feed.enabled for feed in FEEDS}  # 피드 설정(feeds.json)의 사이드바 기본 선택
 
 # ── 공통 CSS ─────────────────────────────────────
 st.markdown("""
@@ -119,6 +182,8 @@ st.markdown("""
 .news-meta { display: flex; flex-wrap: wrap; gap: 5px; align-items: center; }
 .src-badge { font-size: .7rem; border: 1px solid; border-radius: 4px; padding: 1px 7px; font-weight: 600; }
 .time-tag { font-size: .72rem; color: #6e7681; }
+.topic-group { margin: -4px 0 10px 34px; }
+.topic-group summary { font-size: .75rem; color: #8b949e; cursor: pointer; margin-bottom: 6px; }
 .sec-title { font-size: 1rem; font-weight: 700; color: #f0f6fc; margin: 24px 0 12px; padding-left: 10px; border-left: 4px solid #64ffda; }
 </style>
 """, unsafe_allow_html=True)
@@ -133,596 +198,55 @@ def src_color(source: str) -> str:
     return "#8b949e"
 
 
-def _strip_html(text: str) -> str:
-    if not text:
-        return ""
-    cleaned = BeautifulSoup(text, "html.parser").get_text(separator=" ")
-    return re.sub(r"\s+", " ", cleaned).strip()
-
-
-def make_item(title, url="", source="", published_at="", description=""):
-    desc = _strip_html(description or "")
-    return {
-        "title": re.sub(r"\s+", " ", title).strip(),
-        "url": url,
-        "source": source,
-        "published_at": published_at,
-        "description": desc,
-    }
-
-
-def is_recent(pub: str) -> bool:
-    if not pub:
-        return True
-    return pub[:10] >= YESTERDAY_STR
-
-
-def dedup(news_list: list) -> list:
-    seen, result = {}, []
-    for item in news_list:
-        key = re.sub(r"[^a-z0-9]", "", item["title"].lower())[:60]
-        if key not in seen:
-            seen[key] = True
-            result.append(item)
-    return result
-
-
-def utc_to_kst(iso_str: str) -> str:
-    if not iso_str:
-        return ""
-    try:
-        dt = datetime.datetime.fromisoformat(iso_str.replace("Z", "+00:00"))
-        return (dt + datetime.timedelta(hours=9)).strftime("%m/%d %H:%M")
-    except Exception:
-        return iso_str[:16]
-
-
-def build_news_text(news_list: list, limit: int = 60) -> str:
-    lines = []
-    for item in news_list[:limit]:
-        line = f"- [{item['source']}] {item['title']}"
-        if item.get("description"):
-            line += f"\n  {item['description'][:120]}"
-        lines.append(line)
-    return "\n".join(lines)
-
-
-def render_news_card(item: dict, idx: int) -> None:
-    import html as _html
-
-    title = _html.escape(item.get("title", "") or "")
+def news_card_html(item: dict, idx: int) -> str:
+    title = html.escape(item.get("title", "") or "")
     url = item.get("url", "")
     source = item.get("source", "")
-    pub = item.get("published_at", "")
-    desc = _html.escape((item.get("description", "") or "").strip())
+    desc = html.escape((item.get("description", "") or "").strip())
     color = src_color(source)
-    kst = utc_to_kst(pub)
+    kst = item_kst(item)
 
     title_html = f'<a href="{url}" target="_blank">{title}</a>' if url else title
     desc_html = f'<div class="news-desc">{desc[:150]}</div>' if desc and desc != title else ""
     time_html = f'<span class="time-tag">🕐 KST {kst}</span>' if kst else ""
 
-    st.markdown(f"""
-    <div class="news-card">
-      <div style="display:flex;gap:10px;align-items:flex-start">
-        <div style="flex-shrink:0;width:24px;height:24px;background:#21262d;border-radius:5px; display:flex;align-items:center;justify-content:center; font-size:.7rem;color:#8b949e;font-weight:600;margin-top:2px">{idx}</div>
-        <div style="flex:1;min-width:0">
-          <div class="news-title">{title_html}</div>
-          {desc_html}
-          <div class="news-meta">
-            <span class="src-badge" style="background:{color}22;color:{color};border-color:{color}55">{source}</span>
-            {time_html}
-          </div>
-        </div>
-      </div>
-    </div>
-    """, unsafe_allow_html=True)
-
-
-# ── AI 요약 (프롬프트 인자로 주식/코인 구분) ──────
-def summarize_gemini(news_list: list, api_key: str, prompt_quick: str, prompt_deep: str) -> tuple:
-    try:
-        from google import genai
-        from google.genai import types
-    except ImportError:
-        st.error("google-genai 패키지가 없습니다.")
-        return "", ""
-
-    client = genai.Client(api_key=api_key)
-    content = build_news_text(news_list, 60)
-
-    def _extract(resp):
-        if resp.text is not None:
-            return resp.text
-        try:
-            return resp.candidates[0].content.parts[0].text or ""
-        except Exception:
-            return ""
-
-    quick, deep = "", ""
-    try:
-        resp = client.models.generate_content(
-            model="gemini-2.5-pro",
-            contents=prompt_quick.format(date=TODAY_STR, content=content),
-            config=types.GenerateContentConfig(temperature=0.4, max_output_tokens=8000),
-        )
-        quick = _extract(resp)
-    except Exception as e:
-        st.warning(f"Gemini Quick Summary 오류: {e}")
-    try:
-        resp = client.models.generate_content(
-            model="gemini-2.5-pro",
-            contents=prompt_deep.format(date=TODAY_STR, content=content),
-            config=types.GenerateContentConfig(temperature=0.35, max_output_tokens=16000),
-        )
-        deep = _extract(resp)
-    except Exception as e:
-        st.warning(f"Gemini Deep Dive 오류: {e}")
-    return quick, deep
-
-
-def summarize_openai(news_list: list, api_key: str, prompt_quick: str, prompt_deep: str) -> tuple:
-    try:
-        from openai import OpenAI
-    except ImportError:
-        st.error("openai 패키지가 없습니다.")
-        return "", ""
-
-    client = OpenAI(api_key=api_key)
-    content = build_news_text(news_list, 60)
-    quick, deep = "", ""
-    try:
-        resp = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt_quick.format(date=TODAY_STR, content=content)}],
-            max_tokens=1200,
-            temperature=0.4,
-        )
-        quick = resp.choices[0].message.content or ""
-    except Exception as e:
-        st.warning(f"GPT Quick Summary 오류: {e}")
-    try:
-        resp = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt_deep.format(date=TODAY_STR, content=content)}],
-            max_tokens=2500,
-            temperature=0.35,
-        )
-        deep = resp.choices[0].message.content or ""
-    except Exception as e:
-        st.warning(f"GPT Deep Dive 오류: {e}")
-    return quick, deep
-
-
-# ── 주식 전용: 스크래퍼 + 프롬프트 ───────────────
-PROMPT_STOCK_QUICK = """다음은 {date} (KST) 미국 주식 및 금융 시장 뉴스입니다.
-
-{content}
-
-위 뉴스만을 바탕으로 한국어 Quick Summary를 작성해주세요.
-1. **오늘의 증시 핵심 테마** (거시경제, S&P500 흐름 등 3~5가지, 각 1~2문장)
-2. **주요 기업/섹터별 이슈** (특징주 중심, 각 1문장)
-3. **한줄 시장 요약** (전체를 한 문장으로)
-가독성 좋고 간결하게 작성해주세요."""
-
-PROMPT_STOCK_DEEP = """다음은 {date} (KST) 미국 증시 주요 뉴스입니다.
-
-{content}
-
-위 뉴스만을 바탕으로 한국어 Deep Dive 심층 분석을 작성해주세요.
-1. **거시 경제 및 연준(Fed) 동향 분석** (금리, 인플레이션 등)
-2. **주요 기업 실적 및 펀더멘털 분석** (언급된 기업 위주 상세히)
-3. **섹터별 자금 흐름 및 특징** (기술주, 금융주 등)
-4. **리스크 요인 및 시장의 우려**
-5. **단기 시장 전망 및 월가 시각**
-각 섹션을 전문적인 금융 리포트 톤으로 충분히 상세하게 작성해주세요."""
-
-
-def fetch_finnhub(api_key: str) -> list:
-    if not api_key:
-        return []
-    try:
-        r = requests.get(
-            "https://finnhub.io/api/v1/news",
-            params={"category": "general", "token": api_key},
-            headers=HEADERS,
-            timeout=15,
-        )
-        r.raise_for_status()
-        data = r.json()
-    except Exception:
-        return []
-    results = []
-    for item in data[:30]:
-        try:
-            dt = datetime.datetime.utcfromtimestamp(item.get("datetime", 0))
-            pub = dt.strftime("%Y-%m-%dT%H:%M:%SZ")
-            if not is_recent(pub):
-                continue
-            results.append(
-                make_item(
-                    title=item.get("headline", ""),
-                    url=item.get("url", ""),
-                    source=item.get("source", "Finnhub"),
-                    published_at=pub,
-                    description=item.get("summary", ""),
-                )
-            )
-        except Exception:
-            continue
-    return results
-
-
-def fetch_mktnews() -> list:
-    results = []
-    try:
-        import time as _time
-        t = int(_time.time() * 1000)
-        r = requests.get(
-            f"https://static.mktnews.net/json/flash/en.json?t={t}",
-            headers=HEADERS,
-            timeout=15,
-        )
-        if r.status_code != 200:
-            return []
-        data = r.json()
-        for item in data[:50]:
-            try:
-                content = (item.get("data") or {}).get("content", "").strip()
-                title_field = (item.get("data") or {}).get("title", "").strip()
-                title = title_field if title_field else content[:120]
-                if not title:
-                    continue
-                pub = item.get("time", "")
-                if pub and not is_recent(pub):
-                    continue
-                item_id = item.get("id", "")
-                url = f"https://mktnews.com/flashDetail.html?id={item_id}" if item_id else ""
-                desc = content if title_field and content != title else ""
-                results.append(
-                    make_item(title=title, url=url, source="MKT News", published_at=pub, description=desc)
-                )
-            except Exception:
-                continue
-    except Exception:
-        pass
-    return results
-
-
-def fetch_mni_markets() -> list:
-    results = []
-    try:
-        r = requests.get("https://www.mnimarkets.com/articles", headers=HEADERS, timeout=15)
-        if r.status_code != 200:
-            r = requests.get("https://www.mnimarkets.com/", headers=HEADERS, timeout=15)
-        soup = BeautifulSoup(r.text, "html.parser")
-        seen_urls = set()
-        for a in soup.find_all("a", href=True):
-            href = a["href"]
-            if "/articles/" not in href:
-                continue
-            url = href if href.startswith("http") else "https://www.mnimarkets.com" + href
-            if url in seen_urls:
-                continue
-            seen_urls.add(url)
-            title = a.get_text(strip=True)
-            if not title or len(title) < 10:
-                parent = a.find_parent()
-                if parent:
-                    title = parent.get_text(separator=" ", strip=True)[:200]
-            if not title or len(title) < 10:
-                continue
-            results.append(make_item(title=title[:200], url=url, source="MNI Markets", published_at="", description=""))
-            if len(results) >= 30:
-                break
-    except Exception:
-        pass
-    return results
-
-
-def fetch_rss_feed(rss_url: str, source_name: str) -> list:
-    results = []
-    try:
-        r = requests.get(rss_url, headers=HEADERS, timeout=15)
-        if r.status_code != 200:
-            return []
-        soup = BeautifulSoup(r.text, "xml")
-        for item in soup.find_all("item") or soup.find_all("entry"):
-            title_el = item.find("title")
-            link_el = item.find("link")
-            pub_el = item.find("pubDate") or item.find("published")
-            desc_el = item.find("description") or item.find("summary")
-            title = title_el.get_text(strip=True) if title_el else ""
-            link = link_el.get_text(strip=True) if link_el else ""
-            pub_raw = pub_el.get_text(strip=True) if pub_el else ""
-            desc = (
-                BeautifulSoup(desc_el.get_text(strip=True), "html.parser").get_text(strip=True)[:200]
-                if desc_el
-                else ""
-            )
-            if not title:
-                continue
-            try:
-                pub_iso = parsedate_to_datetime(pub_raw).strftime("%Y-%m-%dT%H:%M:%SZ")
-            except Exception:
-                pub_iso = pub_raw[:19]
-            if pub_iso and not is_recent(pub_iso):
-                continue
-            results.append(make_item(title=title, url=link, source=source_name, published_at=pub_iso, description=desc))
-    except Exception:
-        pass
-    return results
-
-
-# ── 코인 전용: 유틸 + 스크래퍼 + 프롬프트 ────────
-PROMPT_COIN_QUICK = """다음은 {date} (KST) 기준 코인 뉴스입니다.
-
-{content}
-
-위 뉴스만 바탕으로 한국어 Quick Summary를 작성해주세요.
-1. **오늘의 핵심 이슈** (3~5개, 각 1~2문장)
-2. **코인/프로젝트별 주요 이슈** (언급된 코인 중심, 각 1문장)
-3. **시장 한줄 요약** (전체를 한 문장으로)
-간결하고 명확하게 작성해주세요."""
-
-PROMPT_COIN_DEEP = """다음은 {date} (KST) 기준 코인 뉴스입니다.
-
-{content}
-
-위 뉴스만 바탕으로 한국어 Deep Dive 분석을 작성해주세요.
-1. **거시 경제 및 규제 환경 분석**
-2. **주요 코인별/섹터별 테마 분석** (각 코인 2~4문장)
-3. **기관 투자자 동향** (ETF, 기업 보유, 기관 포지션)
-4. **리스크 요인 및 주의 포인트**
-5. **단기 시장 전망 및 투자 시사점**
-각 섹션을 충분히 구체적으로 작성해주세요."""
-
-
-def find_time_in_parents(element):
-    current = element
-    for _ in range(6):
-        if not current:
-            break
-        current = getattr(current, "parent", None)
-        if not current:
-            break
-        time_tag = current.find("time")
-        if time_tag:
-            return time_tag.get("datetime", "")
-    return ""
-
-
-def parse_rss_datetime(raw: str) -> str:
-    try:
-        return parsedate_to_datetime(raw).strftime("%Y-%m-%dT%H:%M:%SZ")
-    except Exception:
-        return raw[:19]
+    # 여러 카드를 한 번의 st.markdown 으로 내보내므로 빈 줄 · 들여쓰기 없이 한 줄로 만든다
+    return (
+        '<div class="news-card"><div style="display:flex;gap:10px;align-items:flex-start">'
+        '<div style="flex-shrink:0;width:24px;height:24px;background:#21262d;border-radius:5px; display:flex;'
+        'align-items:center;justify-content:center; font-size:.7rem;color:#8b949e;font-weight:600;margin-top:2px">'
+        f'{idx}</div><div style="flex:1;min-width:0"><div class="news-title">{title_html}</div>{desc_html}'
+        '<div class="news-meta">'
+        f'<span class="src-badge" style="background:{color}22;color:{color};border-color:{color}55">{source}</span>'
+        f'{time_html}</div></div></div></div>'
+    )
 
 
-def fetch_cryptopanic(api_key: str) -> list:
-    if not api_key:
-        return []
-    try:
-        response = requests.get(
-            "https://cryptopanic.com/api/developer/v2/posts/",
-            params={"auth_token": api_key, "public": "true", "kind": "news", "regions": "en"},
-            headers=HEADERS,
-            timeout=15,
-        )
-        if response.status_code in (403, 429):
-            return []
-        response.raise_for_status()
-        data = response.json()
-    except Exception:
-        return []
-    results = []
-    for item in data.get("results", []):
-        pub = item.get("published_at", "")
-        if not is_recent(pub):
-            continue
-        results.append(
-            make_item(
-                title=item.get("title", ""),
-                source="CryptoPanic",
-                published_at=pub,
-                description=item.get("description", "") or "",
-            )
-        )
-    return results
+def render_news_card(item: dict, idx: int) -> None:
+    st.markdown(news_card_html(item, idx), unsafe_allow_html=True)
 
 
-def fetch_coindesk() -> list:
-    try:
-        response = requests.get("https://www.coindesk.com/latest-crypto-news", headers=HEADERS, timeout=15)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, "html.parser")
-    except Exception:
-        return []
-    results = []
-    seen = set()
-    for selector in ["a[href*='/markets/']", "a[href*='/business/']", "a[href*='/tech/']", "a[href*='/policy/']"]:
-        for link in soup.select(selector):
-            href = link.get("href", "")
-            title = link.get_text(strip=True)
-            if not title or len(title) < 15 or href in seen:
-                continue
-            seen.add(href)
-            full_url = f"https://www.coindesk.com{href}" if href.startswith("/") else href
-            pub = find_time_in_parents(link)
-            if pub and not is_recent(pub):
-                continue
-            results.append(make_item(title=title, url=full_url, source="CoinDesk", published_at=pub))
-    return results
-
-
-def fetch_cryptonews_net() -> list:
-    results = []
-    seen = set()
-    for url in [
-        "https://cryptonews.net/news/bitcoin/",
-        "https://cryptonews.net/news/ethereum/",
-        "https://cryptonews.net/",
-    ]:
-        try:
-            response = requests.get(url, headers=HEADERS, timeout=15)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, "html.parser")
-        except Exception:
-            continue
-        for item in soup.select(".news-item"):
-            link = item.find("a", href=True)
-            if not link:
-                continue
-            href = link["href"]
-            full_url = f"https://cryptonews.net{href}" if href.startswith("/") else href
-            if full_url in seen:
-                continue
-            seen.add(full_url)
-            title_el = item.select_one(".news-item__title, h2, h3, h4, .title")
-            title = title_el.get_text(strip=True) if title_el else item.get_text(separator=" ", strip=True)[:120]
-            time_el = item.find("time")
-            pub = time_el.get("datetime", "") if time_el else ""
-            if pub and not is_recent(pub):
-                continue
-            source_el = item.select_one(".news-item__source, .source")
-            source = source_el.get_text(strip=True) if source_el else "cryptonews.net"
-            results.append(make_item(title=title, url=full_url, source=source or "cryptonews.net", published_at=pub))
-    return results
-
-
-def fetch_coincarp() -> list:
-    results = []
-    seen = set()
-    for url in [
-        "https://www.coincarp.com/news/bitcoin/",
-        "https://www.coincarp.com/news/ethereum/",
-        "https://www.coincarp.com/news/",
-    ]:
-        try:
-            response = requests.get(url, headers=HEADERS, timeout=15)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, "html.parser")
-        except Exception:
-            continue
-        for link in soup.find_all("a", href=True):
-            href = link.get("href", "")
-            if not href.startswith("http") or "coincarp.com" in href:
-                continue
-            raw = link.get_text(strip=True)
-            title = re.sub(r"^\d+\s*(min|mins|hour|hours|sec|secs|day|days)\s*(Ago|ago)\s*", "", raw).strip()
-            if not title or len(title) < 15 or href in seen:
-                continue
-            seen.add(href)
-            match = re.search(r"(\d+)\s*(min|mins|hour|hours)", raw)
-            pub = ""
-            if match:
-                value = int(match.group(1))
-                delta = datetime.timedelta(minutes=value) if "min" in match.group(2) else datetime.timedelta(hours=value)
-                pub = (NOW_UTC - delta).strftime("%Y-%m-%dT%H:%M:%SZ")
-            domain = re.search(r"https?://(?:www\.)?([^/]+)", href)
-            source = domain.group(1) if domain else "coincarp"
-            results.append(make_item(title=title, url=href, source=source, published_at=pub))
-    return results
-
-
-def fetch_theblock_rss() -> list:
-    results = []
-    for rss_url in ["https://www.theblock.co/rss.xml", "https://www.theblock.co/feeds/rss.xml"]:
-        try:
-            response = requests.get(rss_url, headers=HEADERS, timeout=15)
-            if response.status_code != 200:
-                continue
-            soup = BeautifulSoup(response.text, "xml")
-        except Exception:
-            continue
-        for item in soup.find_all("item") or soup.find_all("entry"):
-            title_el = item.find("title")
-            link_el = item.find("link")
-            pub_el = item.find("pubDate") or item.find("published") or item.find("updated")
-            desc_el = item.find("description") or item.find("summary")
-            title = title_el.get_text(strip=True) if title_el else ""
-            link = link_el.get_text(strip=True) if link_el else ""
-            pub_raw = pub_el.get_text(strip=True) if pub_el else ""
-            desc = (
-                BeautifulSoup(desc_el.get_text(strip=True), "html.parser").get_text(strip=True)[:200] if desc_el else ""
-            )
-            if not title:
-                continue
-            pub_iso = parse_rss_datetime(pub_raw)
-            if pub_iso and not is_recent(pub_iso):
-                continue
-            results.append(make_item(title=title, url=link, source="The Block", published_at=pub_iso, description=desc))
-        if results:
-            break
-    return results
-
-
-def fetch_cryptonews_com() -> list:
-    results = []
-    seen = set()
-    for url in [
-        "https://cryptonews.com/news/",
-        "https://cryptonews.com/news/bitcoin-news/",
-        "https://cryptonews.com/news/ethereum-news/",
-    ]:
-        try:
-            response = requests.get(url, headers=HEADERS, timeout=15)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, "html.parser")
-        except Exception:
-            continue
-        for link in soup.find_all("a", href=True):
-            href = link.get("href", "")
-            full_url = f"https://cryptonews.com{href}" if href.startswith("/") else href
-            if not re.search(r"cryptonews\.com/news/[a-z]", full_url):
-                continue
-            title = link.get_text(strip=True)
-            if not title or len(title) < 15 or full_url in seen:
-                continue
-            seen.add(full_url)
-            pub = find_time_in_parents(link)
-            if pub and not is_recent(pub):
-                continue
-            results.append(make_item(title=title, url=full_url, source="cryptonews.com", published_at=pub))
-    return results
-
-
-def fetch_decrypt() -> list:
-    try:
-        response = requests.get("https://decrypt.co/feed", headers=HEADERS, timeout=15)
-        if response.status_code != 200:
-            return []
-        soup = BeautifulSoup(response.text, "xml")
-    except Exception:
-        return []
-    results = []
-    for item in soup.find_all("item"):
-        title_el = item.find("title")
-        link_el = item.find("link")
-        pub_el = item.find("pubDate")
-        desc_el = item.find("description")
-        title = title_el.get_text(strip=True) if title_el else ""
-        link = link_el.get_text(strip=True) if link_el else ""
-        pub_raw = pub_el.get_text(strip=True) if pub_el else ""
-        desc = BeautifulSoup(desc_el.get_text(strip=True), "html.parser").get_text(strip=True)[:200] if desc_el else ""
-        if not title:
-            continue
-        pub_iso = parse_rss_datetime(pub_raw)
-        if pub_iso and not is_recent(pub_iso):
-            continue
-        results.append(make_item(title=title, url=link, source="Decrypt", published_at=pub_iso, description=desc))
-    return results
+def stat_tile_html(value, label: str, color: str, label_size: str = ".72rem", note: str = "") -> str:
+    note_html = (
+        f'<div style="font-size:.65rem;color:#f0883e;margin-top:3px;word-break:break-all">{html.escape(note)}</div>'
+        if note
+        else ""
+    )
+    return f"""
+    <div style="background:#161b22;border:1px solid #21262d;border-top:3px solid {color};
+                border-radius:10px;padding:14px 10px;text-align:center">
+      <div style="font-size:1.5rem;font-weight:700;color:{color}">{value}</div>
+      <div style="font-size:{label_size};color:#8b949e;margin-top:4px;word-break:break-all">{label}</div>
+      {note_html}
+    </div>"""
 
 
 # ── 세션 상태 초기화 (주식/코인 분리) ───────────
 def init_session():
+    # 기사 · 요약은 공유 데이터셋(datasets)에 한 벌만 두고 세션에는 버전 문자열과 화면 상태만 둔다
     for prefix in ("stock_", "coin_"):
-        if f"{prefix}news_data" not in st.session_state:
-            st.session_state[f"{prefix}news_data"] = []
-            st.session_state[f"{prefix}source_stats"] = {}
-            st.session_state[f"{prefix}summary_quick"] = ""
-            st.session_state[f"{prefix}summary_deep"] = ""
-            st.session_state[f"{prefix}provider"] = ""
+        st.session_state.setdefault(f"{prefix}version", "")
+        st.session_state.setdefault(f"{prefix}report_at", "")
 
 
 init_session()
@@ -744,120 +268,290 @@ with st.sidebar:
         if not _opts:
             _opts = ["(API 키 없음)"]
         ai_provider = st.selectbox("AI 제공자", _opts)
+        enrich_top = st.slider("📰 본문 보강 (상위 기사 수)", 0, 20, 0, help="주제 대표 기사의 본문을 가져와 요약에 반영")
     else:
         ai_provider = ""
+        enrich_top = 0
+    watch = ranking.parse_watchlist(
+        st.text_input("👀 관심 티커", value=", ".join(ranking.WATCHLIST), placeholder="NVDA, TSLA, BTC", help="언급된 기사를 목록 · 요약 입력에서 앞쪽으로")
+    )
     st.markdown("---")
     st.markdown("**수집 소스**")
 
-    if is_stock:
-        src_finnhub = st.checkbox("Finnhub API", value=bool(FINNHUB_API_KEY))
-        src_yahoo = st.checkbox("Yahoo Finance (RSS)", value=True)
-        src_cnbc = st.checkbox("CNBC (RSS)", value=True)
-        src_marketwatch = st.checkbox("MarketWatch (RSS)", value=True)
-        src_mni = st.checkbox("MNI Markets (스크래핑)", value=True)
-        src_mktnews = st.checkbox("MKT News (API)", value=True)
-        run_btn = st.button("🚀 주식 뉴스 수집 시작", type="primary", use_container_width=True)
-    else:
-        src_cryptopanic = st.checkbox("CryptoPanic API", value=bool(CRYPTOPANIC_API_KEY))
-        src_coindesk = st.checkbox("CoinDesk", value=True)
-        src_cryptonews_n = st.checkbox("cryptonews.net", value=True)
-        src_coincarp = st.checkbox("coincarp.com", value=True)
-        src_theblock = st.checkbox("The Block (RSS)", value=True)
-        src_cryptonews_c = st.checkbox("cryptonews.com", value=True)
-        src_decrypt = st.checkbox("Decrypt (RSS)", value=True)
-        run_btn = st.button("🚀 코인 뉴스 수집 시작", type="primary", use_container_width=True)
+    # 소스 목록은 newscore.SOURCES (전용 수집기 + feeds.json) 에서 생성 — 그룹이 있는 피드는 그룹별 선택 목록
+    mode_sources = [src for src in SOURCES if src.mode == ("stock" if is_stock else "coin")]
+    selected_sources = [
+        src.name
+        for src in mode_sources
+        if not src.group
+        and st.checkbox(src.label or src.name, value=FEED_DEFAULTS.get(src.name, bool(_secrets.get(src.api_key, True))))
+    ]
+    feed_groups = {}
+    for src in mode_sources:
+        if src.group:
+            feed_groups.setdefault(src.group, []).append(src)
+    for group, group_sources in feed_groups.items():
+        with st.expander(f"📡 {group} ({len(group_sources)})", expanded=False):
+            labels = {src.name: src.label or src.name for src in group_sources}
+            defaults = [src.name for src in group_sources if FEED_DEFAULTS.get(src.name, True)]
+            selected_sources += st.multiselect(
+                group, list(labels), default=defaults, format_func=labels.get, label_visibility="collapsed"
+            )
+    run_label = "🚀 주식 뉴스 수집 시작" if is_stock else "🚀 코인 뉴스 수집 시작"
+    run_btn = st.button(run_label, type="primary", use_container_width=True)
+    with st.expander("🗂️ 지난 수집 불러오기", expanded=False):
+        snapshot_days = st.selectbox("기간", [1, 3, 7, 14], index=2, format_func=lambda d: f"최근 {d}일")
+        load_snapshots = st.button("스냅샷 병합해서 보기", use_container_width=True)
+    auto_refresh = st.toggle("🔄 자동 갱신 (백그라운드)", value=False, help="소스별 갱신 주기를 학습해 백그라운드에서 수집")
+    history_view = st.toggle("🗄️ 지난 뉴스 기록 보기", value=False, help="저장된 기록에서 기간 · 소스 · 티커로 조회")
+    with st.expander("🔔 관심 목록 알림", expanded=False):
+        # 방금 저장한 목록은 다음 rerun 에서 구독 목록에 넣음 (위젯 값은 그리기 전에만 바꿀 수 있음)
+        if st.session_state.get("_alert_added"):
+            subscribed = st.session_state.get("alert_lists") or []
+            st.session_state["alert_lists"] = subscribed + [st.session_state.pop("_alert_added")]
+        watchlist_names = [wl.name for wl in alerts.book().watchlists()]
+        st.multiselect("받을 목록", watchlist_names, key="alert_lists")
+        alert_name = st.text_input("목록 이름", placeholder="반도체")
+        alert_terms = st.text_input("단어 (쉼표 구분)", value=", ".join(watch), placeholder="NVDA, AMD, rate cut")
+        alert_outbox = st.checkbox("outbox 파일에도 기록", value=False, help=f"{alerts.OUTBOX_FILE} 에 한 줄씩 추가")
+        if st.button("목록 저장", use_container_width=True):
+            try:
+                saved = alerts.book().save_watchlist(alert_name, alerts.parse_terms(alert_terms), alert_outbox)
+            except ValueError as e:
+                st.warning(str(e))
+            else:
+                if saved.name not in (st.session_state.get("alert_lists") or []):
+                    st.session_state["_alert_added"] = saved.name
+                st.rerun()
 
     st.markdown("---")
     st.caption(f"KST {NOW_KST.strftime('%Y-%m-%d %H:%M')}")
+perf_mark("sidebar")
 
 
 # ── 수집 실행 (모드별) ──────────────────────────
-if run_btn:
-    all_news = []
-    source_map = {}
+@st.cache_resource(show_spinner=False)
+def get_store() -> ItemStore:
+    return ItemStore()
+
+
+@st.cache_resource(show_spinner=False)
+def get_datasets() -> datasets.DatasetStore:
+    return datasets.DatasetStore()
+
+
+def publish(mode_key: str, items, source_stats=None, source_notes=None, **extra) -> datasets.Dataset:
+    """공유 데이터셋으로 등록하고 이 세션이 그 버전을 보게 한다."""
+    dataset = get_datasets().publish(mode_key, items, source_stats, source_notes, **extra)
+    st.session_state[f"{'stock_' if mode_key == 'stock' else 'coin_'}version"] = dataset.version
+    return dataset
 
-    if is_stock:
-        tasks = []
-        if src_finnhub and FINNHUB_API_KEY:
-            tasks.append(("Finnhub API", fetch_finnhub, [FINNHUB_API_KEY]))
-        if src_yahoo:
-            tasks.append(("Yahoo Finance", fetch_rss_feed, ["https://finance.yahoo.com/news/rssindex", "Yahoo Finance"]))
-        if src_cnbc:
-            tasks.append(("CNBC", fetch_rss_feed, ["https://search.cnbc.com/rs/search/combinedcms/view.xml?profile=120000000", "CNBC"]))
-        if src_marketwatch:
-            tasks.append(("MarketWatch", fetch_rss_feed, ["http://feeds.marketwatch.com/marketwatch/topstories/", "MarketWatch"]))
-        if src_mni:
-            tasks.append(("MNI Markets", fetch_mni_markets, []))
-        if src_mktnews:
-            tasks.append(("MKT News", fetch_mktnews, []))
 
+def get_ranker(mode_key: str) -> ranking.Ranker:
+    # 모드별 공용 주제 색인 (AI 요약 입력과 같은 인스턴스) → rerun · 세션마다 새로 들어온 기사만 묶음
+    return ranking.ranker(mode_key)
+
+
+@st.cache_resource(show_spinner=False)
+def get_summary_flights() -> singleflight.Group:
+    return singleflight.Group(ttl=SUMMARY_REUSE_SECONDS)
+
+
+mode_key = "stock" if is_stock else "coin"
+
+if run_btn:
+    if is_stock:
         prompt_quick, prompt_deep = PROMPT_STOCK_QUICK, PROMPT_STOCK_DEEP
         prefix = "stock_"
     else:
-        tasks = []
-        if src_cryptopanic and CRYPTOPANIC_API_KEY:
-            tasks.append(("CryptoPanic", fetch_cryptopanic, [CRYPTOPANIC_API_KEY]))
-        if src_coindesk:
-            tasks.append(("CoinDesk", fetch_coindesk, []))
-        if src_cryptonews_n:
-            tasks.append(("cryptonews.net", fetch_cryptonews_net, []))
-        if src_coincarp:
-            tasks.append(("coincarp.com", fetch_coincarp, []))
-        if src_theblock:
-            tasks.append(("The Block", fetch_theblock_rss, []))
-        if src_cryptonews_c:
-            tasks.append(("cryptonews.com", fetch_cryptonews_com, []))
-        if src_decrypt:
-            tasks.append(("Decrypt", fetch_decrypt, []))
         prompt_quick, prompt_deep = PROMPT_COIN_QUICK, PROMPT_COIN_DEEP
         prefix = "coin_"
+    tasks = build_tasks(selected_sources, _secrets)
+    task_names = [name for name, _, _ in tasks]
 
+    started = time.time()
     with st.status("뉴스 수집 중...", expanded=True) as status:
-        for name, fn, args in tasks:
-            st.write(f"📡 {name} 수집 중...")
-            try:
-                items = fn(*args)
-                all_news += items
-                source_map[name] = len(items)
-                st.write(f"  ✅ {name}: {len(items)}건")
-            except Exception as e:
-                source_map[name] = 0
-                st.write(f"  ⚠️ {name}: {e}")
-
-        all_news = dedup(all_news)
-        all_news.sort(key=lambda x: x.get("published_at", ""), reverse=True)
-        st.session_state[f"{prefix}news_data"] = all_news
-        st.session_state[f"{prefix}source_stats"] = source_map
-        st.session_state[f"{prefix}summary_quick"] = ""
-        st.session_state[f"{prefix}summary_deep"] = ""
-        st.session_state[f"{prefix}provider"] = ""
-
-        if use_ai and all_news:
-            if ai_provider == "Gemini 2.5 Pro" and GEMINI_API_KEY:
-                st.write("🤖 Gemini 2.5 Pro로 분석 생성 중...")
-                q, d = summarize_gemini(all_news, GEMINI_API_KEY, prompt_quick, prompt_deep)
-                st.session_state[f"{prefix}summary_quick"] = q
-                st.session_state[f"{prefix}summary_deep"] = d
-                st.session_state[f"{prefix}provider"] = "Gemini 2.5 Pro"
-            elif ai_provider == "GPT-4o-mini" and OPENAI_API_KEY:
-                st.write("🤖 GPT-4o-mini로 분석 생성 중...")
-                q, d = summarize_openai(all_news, OPENAI_API_KEY, prompt_quick, prompt_deep)
-                st.session_state[f"{prefix}summary_quick"] = q
-                st.session_state[f"{prefix}summary_deep"] = d
-                st.session_state[f"{prefix}provider"] = "GPT-4o-mini"
+        st.write(f"📡 {' · '.join(task_names)} 동시 수집 중...")
+        for name, items, err, cached in get_store().collect(tasks):
+            note = health.describe(name)
+            if err is not None:
+                st.write(f"  ⚠️ {name}: {err}")
+            elif cached:
+                st.write(f"  📦 {name}: {len(items)}건 (공유 저장소)")
+            elif note:
+                st.write(f"  ♻️ {name}: {len(items)}건 ({note})")
             else:
-                st.write("⚠️ AI API 키가 없어 요약을 건너뜁니다.")
+                st.write(f"  ✅ {name}: {len(items)}건")
 
+        # 모드 화면 = 공용 저장소 위의 필터 (다른 모드 소스의 관련 기사 포함)
+        all_news, source_map = get_store().view(mode_key, task_names)
+        enrich_targets = ranking.leads(all_news, enrich_top, watch, mode_key) if use_ai and enrich_top else []
+        enrich.prefetch(enrich_targets)  # 본문은 백그라운드로 — 아래 요약 직전까지 끝난 것만 사용
+        source_notes = {name: health.describe(name) for name in source_map}
+        dataset = publish(mode_key, all_news, source_map, source_notes)
+        collected = time.time()
+
+        summarize_fn, key_name = AI_PROVIDERS.get(ai_provider, (None, ""))
+        if use_ai and all_news and summarize_fn and _secrets.get(key_name):
+            st.write(f"🤖 {ai_provider}로 분석 생성 중...")
+
+            def run_summary() -> tuple:
+                bodies = enrich.bodies(enrich_targets, wait=ENRICH_WAIT_SECONDS) if enrich_targets else None
+                q, d = summarize_fn(
+                    all_news,
+                    _secrets[key_name],
+                    prompt_quick,
+                    prompt_deep,
+                    warn=st.warning,
+                    bodies=bodies,
+                    watch=watch,
+                    mode=mode_key,
+                )
+                return q, d, bodies
+
+            # 같은 모드 · 소스 · 제공자 · 기사 묶음의 요약이 다른 세션에서 진행 중이면 그 결과를 같이 받음
+            flight_key = (mode_key, tuple(task_names), ai_provider, enrich_top, watch, content_version(all_news))
+            (q, d, bodies), shared = get_summary_flights().do(flight_key, run_summary)
+            if bodies is not None:
+                st.write(f"📰 본문 {len(bodies)}/{len(enrich_targets)}건 반영")
+            if shared:
+                st.write("🔗 같은 조건의 요약을 다른 세션과 함께 사용")
+            dataset = publish(mode_key, all_news, source_map, source_notes, summary_quick=q, summary_deep=d, provider=ai_provider)
+        elif use_ai and all_news:
+            st.write("⚠️ AI API 키가 없어 요약을 건너뜁니다.")
+
+        if all_news:
+            snapshots.save(
+                {
+                    "mode": mode_key,
+                    "date": TODAY_STR,
+                    "generated_at": NOW_KST.strftime("%Y-%m-%d %H:%M"),
+                    "provider": dataset.provider,
+                    "summary_quick": dataset.summary_quick,
+                    "summary_deep": dataset.summary_deep,
+                    "source_stats": source_map,
+                    "source_notes": source_notes,
+                    "items": all_news,
+                    "timings": {"collect_s": round(collected - started, 2), "summary_s": round(time.time() - collected, 2)},
+                }
+            )
         status.update(label=f"✅ 수집 완료 — 총 {len(all_news)}건 (중복 제거 후)", state="complete")
+    perf_mark("collect")
+
+
+# ── 아직 직접 수집하지 않은 모드: 공용 저장소 → 사전 생성 리포트 순으로 즉시 표시 ──
+@st.cache_resource(show_spinner=False)
+def get_report_scheduler():
+    times = os.getenv("NEWS_REPORT_SCHEDULE", "")
+    if not times:
+        return None
+    provider = AI_ALIASES.get(os.getenv("NEWS_REPORT_AI", "none"), "")
+    return ReportScheduler(_secrets, provider, times).start()
+
+
+get_report_scheduler()
+prefix = "stock_" if is_stock else "coin_"
+# 모드를 바꿨거나 이 모드를 아직 안 본 세션: 이 모드 소스 중 공용 저장소에 신선한 것이 있으면 수집 없이 바로 표시
+# (다른 모드의 키워드 기사도 함께). 단 사전 생성 리포트가 그보다 새로우면 리포트를, AI 요약이 붙은 결과는 그대로 둠
+mode_changed = st.session_state.get("_shown_mode") != mode_key
+st.session_state["_shown_mode"] = mode_key
+store_view, store_at = None, 0.0
+if mode_changed or not st.session_state[f"{prefix}version"]:
+    current = get_datasets().get(st.session_state[f"{prefix}version"] or "")
+    if current is None or not (current.summary_quick or current.summary_deep):
+        fresh = get_store().snapshot(ttl=get_store().ttl)
+        own = [src.name for src in mode_sources if fresh.get(src.name)]
+        if own:
+            store_view, store_at = get_store().view(mode_key, own), get_store().collected_at(own)
+report = None
+if not run_btn and not load_snapshots and (
+    store_view or st.session_state[f"{prefix}report_at"] or not st.session_state[f"{prefix}version"]
+):
+    report = reports.load_latest(mode_key)
+    if report and not report["items"]:
+        report = None
+if run_btn:
+    st.session_state[f"{prefix}report_at"] = ""
+elif load_snapshots:
+    # 지난 실행 스냅샷을 합쳐 한 목록으로 (요약은 가장 최근 실행 것)
+    snap_paths = snapshots.list_paths(mode_key, snapshot_days)
+    merged_news, merged_stats, snap_headers = snapshots.merge(snap_paths)
+    if snap_headers:
+        latest = snap_headers[0]
+        snap_version = f"snapshots:{mode_key}:{snapshot_days}:{os.path.basename(snap_paths[0])}"
+        publish(
+            mode_key,
+            merged_news,
+            merged_stats,
+            summary_quick=latest.get("summary_quick") or "",
+            summary_deep=latest.get("summary_deep") or "",
+            provider=latest.get("provider") or "",
+            version=snap_version,
+        )
+        st.session_state[f"{prefix}report_at"] = ""
+        span = f"{snap_headers[-1]['generated_at']} ~ {latest['generated_at']}"
+        st.session_state[f"{prefix}snapshot_info"] = (snap_version, f"🗂️ 스냅샷 {len(snap_headers)}개 병합 ({span} KST)")
+    else:
+        st.sidebar.caption(f"최근 {snapshot_days}일 저장된 스냅샷이 없습니다.")
+elif store_view and store_view[0] and (report is None or store_at > reports.generated_ts(report)):
+    store_news, store_stats = store_view
+    publish(mode_key, store_news, store_stats, {name: health.describe(name) for name in store_stats})
+    st.session_state[f"{prefix}report_at"] = ""
+elif report and report["generated_at"] != st.session_state[f"{prefix}report_at"]:
+    publish(
+        mode_key,
+        report["items"],
+        report["source_stats"],
+        report.get("source_notes", {}),
+        summary_quick=report["summary_quick"],
+        summary_deep=report["summary_deep"],
+        provider=report["provider"],
+        version=f"report:{report['mode']}:{report['generated_at']}",
+    )
+    st.session_state[f"{prefix}report_at"] = report["generated_at"]
+
+# ── 자동 갱신: 백그라운드 스냅샷 반영 ────────────
+@st.cache_resource(show_spinner=False)
+def get_collector() -> BackgroundCollector:
+    return BackgroundCollector(SOURCES, _secrets, store=get_store()).start()
+
+
+@st.cache_resource(show_spinner=False)
+def get_backfiller() -> Backfiller:
+    # 더 깊은 API 이력은 백그라운드에서만 채움 — 화면 수집 경로는 기다리지 않음
+    return Backfiller(get_store(), _secrets, on_update=get_collector().refresh).start()
+
+
+if auto_refresh:
+    collector = get_collector()
+    backfiller = get_backfiller()
+    prefix = "stock_" if is_stock else "coin_"
+    snap_version, snap_items, snap_stats = collector.snapshot(mode_key)
+    # 기준 스냅샷은 처음 한 번(또는 '목록에 반영' 시)만 적재 — 이후 새 기사는 라이브 영역에만 추가
+    if snap_items and st.session_state.get(f"{prefix}auto_version") is None:
+        publish(mode_key, snap_items, snap_stats, {name: health.describe(name) for name in snap_stats})
+        st.session_state[f"{prefix}auto_version"] = snap_version
+    with st.sidebar.expander("⏱️ 소스별 갱신 주기", expanded=False):
+        st.caption(f"스냅샷 v{snap_version} · 누적 폴링 {collector.polls}회")
+        if backfiller.runs:
+            added = " · ".join(f"{name} +{cnt}" for name, cnt in backfiller.added.items())
+            st.caption(f"백필 {backfiller.runs}회 · {added or '새 기사 없음'}")
+        for name, info in collector.schedule_status().items():
+            st.caption(f"{name}: {info['interval']}s 주기 · {info['next_in']}s 후 · 새 기사 {info['new']}건")
 
 
 # ── 현재 모드 데이터 ─────────────────────────────
 prefix = "stock_" if is_stock else "coin_"
-news_data = st.session_state[f"{prefix}news_data"]
-source_stats = st.session_state[f"{prefix}source_stats"]
-summary_quick = st.session_state[f"{prefix}summary_quick"]
-summary_deep = st.session_state[f"{prefix}summary_deep"]
-provider = st.session_state[f"{prefix}provider"]
+dataset, dataset_evicted = get_datasets().resolve(mode_key, st.session_state[f"{prefix}version"])
+if dataset_evicted:
+    st.session_state[f"{prefix}version"] = dataset.version
+news_data = dataset.items
+source_stats = dataset.source_stats
+source_notes = dataset.source_notes
+summary_quick = dataset.summary_quick
+summary_deep = dataset.summary_deep
+provider = dataset.provider
+version = dataset.version
 
 # ── 헤더 (모드별) ───────────────────────────────
 if is_stock:
@@ -875,6 +569,97 @@ else:
     </div>
     """, unsafe_allow_html=True)
 
+# 첫 렌더 이후 수집·요약 경로의 import 와 클라이언트를 백그라운드에서 예열
+lazydeps.prewarm(GEMINI_API_KEY if use_ai else "", OPENAI_API_KEY if use_ai else "")
+perf_mark("header")
+
+
+# ── 관심 목록 알림: 수집 경로에서 이미 평가된 결과만 읽음 ──
+def render_alerts() -> None:
+    names = st.session_state.get("alert_lists") or []
+    if not names:
+        return
+    recent = alerts.book().since(0, names)[:ALERT_SHOW]
+    if not recent:
+        return
+    seen = st.session_state.get("alert_seen", 0)
+    fresh = [alert for alert in recent if alert.seq > seen]
+    for alert in reversed(fresh[:3]):
+        st.toast(f"🔔 {alert.watchlist}: {alert.item.get('title', '')[:80]}")
+    st.session_state["alert_seen"] = recent[0].seq
+    cards = [
+        f'<div class="news-meta">🔔 {html.escape(alert.watchlist)} · {html.escape(", ".join(alert.terms))}</div>'
+        + news_card_html(alert.item, "🔔")
+        for alert in recent
+    ]
+    with st.expander(f"🔔 관심 목록 알림 {len(recent)}건" + (f" (새 알림 {len(fresh)})" if fresh else ""), expanded=bool(fresh)):
+        st.markdown("\n".join(cards), unsafe_allow_html=True)
+
+
+if auto_refresh and _fragment:
+    # 자동 갱신 중에는 백그라운드 수집이 만든 알림도 주기적으로 확인
+    _fragment(run_every=LIVE_POLL_SECONDS)(render_alerts)()
+else:
+    render_alerts()
+perf_mark("alerts")
+
+
+# ── 기록 보기: 기간 · 소스 · 티커 조회 (건수 집계와 페이지는 모두 sqlite 인덱스로) ──
+def render_history() -> None:
+    kst = datetime.timezone(datetime.timedelta(hours=9))
+    today = NOW_KST.date()
+    col_range, col_src, col_ticker = st.columns([2, 2, 1])
+    with col_range:
+        picked = st.date_input("기간 (KST)", value=(today - datetime.timedelta(days=6), today), max_value=today)
+    with col_src:
+        picked_sources = st.multiselect("소스", history.sources(mode_key))
+    with col_ticker:
+        ticker = st.text_input("티커", placeholder="AAPL, BTC ...").strip()
+    dates = list(picked) if isinstance(picked, (tuple, list)) else [picked]  # 범위 선택 중에는 날짜 하나만 옴
+    first, last = dates[0], dates[-1]
+    start = datetime.datetime.combine(first, datetime.time(), kst).timestamp()
+    end = datetime.datetime.combine(last + datetime.timedelta(days=1), datetime.time(), kst).timestamp()
+    query = dict(mode=mode_key, start=start, end=end, sources=picked_sources, ticker=ticker or None)
+
+    total = history.count(**query)
+    st.markdown(f'<div class="sec-title">🗄️ 기록 ({total}건)</div>', unsafe_allow_html=True)
+    if not total:
+        st.info("조건에 맞는 기록이 없습니다.")
+        return
+    col_hour, col_by_src = st.columns([3, 1])
+    with col_hour:
+        hours = history.counts_by_hour(**query)
+        labels = [datetime.datetime.fromtimestamp(hour, kst).strftime("%m-%d %H시") for hour, _ in hours]
+        st.bar_chart({"시각": labels, "건수": [n for _, n in hours]}, x="시각", y="건수", height=220)
+    with col_by_src:
+        by_source = history.counts_by_source(**query)
+        st.dataframe({"소스": [s for s, _ in by_source], "건수": [n for _, n in by_source]}, hide_index=True, height=220)
+
+    # 쪽 커서 스택: 조건이 바뀌면 첫 쪽부터
+    state_key = f"{prefix}history_pages"
+    filters = repr(sorted(query.items()))
+    pages = st.session_state.get(state_key)
+    if not pages or pages["filters"] != filters:
+        pages = st.session_state[state_key] = {"filters": filters, "cursors": [None]}
+    items, next_cursor = history.page(**query, cursor=pages["cursors"][-1])
+    number = len(pages["cursors"])
+    offset = (number - 1) * history.PAGE_SIZE
+    col_prev, col_info, col_next = st.columns([1, 3, 1])
+    if col_prev.button("◀ 이전", disabled=number == 1, use_container_width=True):
+        pages["cursors"].pop()
+        st.rerun()
+    col_info.caption(f"{number}쪽 · {offset + 1}–{offset + len(items)}번째")
+    if col_next.button("다음 ▶", disabled=next_cursor is None, use_container_width=True):
+        pages["cursors"].append(next_cursor)
+        st.rerun()
+    st.markdown("\n".join(news_card_html(item, offset + i) for i, item in enumerate(items, 1)), unsafe_allow_html=True)
+
+
+if history_view:
+    render_history()
+    render_profile()
+    st.stop()
+
 
 # ── 결과 표시 ────────────────────────────────────
 if not news_data:
@@ -882,28 +667,32 @@ if not news_data:
         st.info("👈 사이드바에서 **주식 뉴스 수집 시작** 버튼을 눌러주세요.")
     else:
         st.info("👈 사이드바에서 **코인 뉴스 수집 시작** 버튼을 눌러주세요.")
+    render_profile()
     st.stop()
 
+if dataset_evicted:
+    st.caption("♻️ 보던 결과가 메모리 상한으로 정리되어 이 모드의 최신 결과를 표시합니다.")
+snapshot_info = st.session_state.get(f"{prefix}snapshot_info")
+if snapshot_info and snapshot_info[0] == version:
+    st.caption(snapshot_info[1])
+if st.session_state[f"{prefix}report_at"]:
+    st.caption(f"🗓️ {st.session_state[f'{prefix}report_at']} KST 사전 생성 리포트 · 사이드바 버튼으로 새로 수집할 수 있습니다.")
+
+
 # 소스별 통계
-st.markdown('<div class="sec-title">📊 소스별 수집 현황</div>', unsafe_allow_html=True)
-total_col, *src_cols = st.columns([1] + [1] * min(len(source_stats), 6))
-with total_col:
+def build_stat_tiles() -> list:
     accent = "#64ffda" if is_stock else "#f7931a"
-    st.markdown(f"""
-    <div style="background:#161b22;border:1px solid #21262d;border-top:3px solid {accent};
-                border-radius:10px;padding:14px 10px;text-align:center">
-      <div style="font-size:1.5rem;font-weight:700;color:{accent}">{len(news_data)}</div>
-      <div style="font-size:.75rem;color:#8b949e;margin-top:4px">총 뉴스</div>
-    </div>""", unsafe_allow_html=True)
-for col, (src, cnt) in zip(src_cols, list(source_stats.items())[:6]):
-    color = src_color(src)
+    tiles = [stat_tile_html(len(news_data), "총 뉴스", accent, ".75rem")]
+    for src, cnt in list(source_stats.items())[:6]:
+        tiles.append(stat_tile_html(cnt, src, src_color(src), note=source_notes.get(src, "")))
+    return tiles
+
+
+st.markdown('<div class="sec-title">📊 소스별 수집 현황</div>', unsafe_allow_html=True)
+stat_tiles = rendercache.cached(("stats", prefix, version), build_stat_tiles)
+for col, tile in zip(st.columns(len(stat_tiles)), stat_tiles):
     with col:
-        st.markdown(f"""
-        <div style="background:#161b22;border:1px solid #21262d;border-top:3px solid {color};
-                    border-radius:10px;padding:14px 10px;text-align:center">
-          <div style="font-size:1.5rem;font-weight:700;color:{color}">{cnt}</div>
-          <div style="font-size:.72rem;color:#8b949e;margin-top:4px;word-break:break-all">{src}</div>
-        </div>""", unsafe_allow_html=True)
+        st.markdown(tile, unsafe_allow_html=True)
 
 # AI 요약
 if summary_quick or summary_deep:
@@ -917,7 +706,7 @@ if summary_quick or summary_deep:
 
 # 뉴스 목록
 st.markdown(f'<div class="sec-title">📋 전체 뉴스 목록 ({len(news_data)}건)</div>', unsafe_allow_html=True)
-col_search, col_src = st.columns([3, 1])
+col_search, col_src, col_sort, col_group = st.columns([3, 1, 1, 1])
 with col_search:
     search_q = st.text_input(
         "🔍 검색",
@@ -925,27 +714,98 @@ with col_search:
         label_visibility="collapsed",
     )
 with col_src:
-    all_sources = sorted(set(item["source"] for item in news_data))
+    all_sources = rendercache.cached(
+        ("sources", prefix, version), lambda: sorted(set(item["source"] for item in news_data))
+    )
     filter_src = st.selectbox("소스 필터", ["전체"] + all_sources, label_visibility="collapsed")
+with col_sort:
+    sort_by = st.selectbox("정렬", ["⭐ 중요도순", "🕐 최신순"], label_visibility="collapsed")
+    by_rank = sort_by == "⭐ 중요도순"
+with col_group:
+    group_topics = st.toggle("🧩 주제별 묶기", value=False, help="비슷한 기사를 대표 기사 아래로 접어서 표시")
+
+
+def build_list_view() -> dict:
+    filtered = news_data
+    if search_q:
+        q = search_q.lower()
+        filtered = [n for n in filtered if q in n["title"].lower() or q in (n.get("description") or "").lower()]
+    if filter_src != "전체":
+        filtered = [n for n in filtered if n["source"] == filter_src]
+    if by_rank and not group_topics:
+        filtered = get_ranker(mode_key).rank(filtered, watch=watch)
+    if not group_topics:
+        return {"count": len(filtered), "html": "\n".join(news_card_html(item, i) for i, item in enumerate(filtered, 1))}
+    groups = get_ranker(mode_key).topics(filtered, watch=watch) if by_rank else topics.cluster(filtered)
+    cards = []
+    for i, topic in enumerate(groups, 1):
+        cards.append(news_card_html(topic["lead"], i))
+        if topic["size"] > 1:
+            related = "".join(news_card_html(item, "·") for item in topic["items"][1:])
+            summary = f"관련 기사 {topic['size'] - 1}건 · {html.escape(topic['label'])}"
+            cards.append(f'<details class="topic-group"><summary>{summary}</summary>{related}</details>')
+    return {"count": len(filtered), "topics": len(groups), "html": "\n".join(cards)}
+
+
+# 중요도순은 최신성 감쇠가 반영되도록 시간 단위를 키에 포함 (같은 데이터 버전이어도 주기적으로 다시 정렬)
+rank_bucket = int(time.time() // ranking.HALF_LIFE_BUCKET) if by_rank else 0
+list_view = rendercache.cached(
+    ("list", prefix, version, search_q, filter_src, group_topics, by_rank, watch, rank_bucket), build_list_view
+)
+st.caption(f"{list_view['count']}건 표시 중" + (f" · 주제 {list_view['topics']}개" if "topics" in list_view else ""))
+
+
+# ── 라이브: 스냅샷 버전만 주기적으로 확인해 새 기사만 목록 위에 추가 ──
+def build_live_view(mode_key: str, baseline: int) -> dict:
+    shown = rendercache.cached(
+        ("keys", prefix, version), lambda: frozenset(title_digest(item["title"]) for item in news_data)
+    )
+    fresh = [
+        item for item in get_collector().changes_since(mode_key, baseline) if title_digest(item["title"]) not in shown
+    ]
+    if search_q:
+        q = search_q.lower()
+        fresh = [n for n in fresh if q in n["title"].lower() or q in (n.get("description") or "").lower()]
+    if filter_src != "전체":
+        fresh = [n for n in fresh if n["source"] == filter_src]
+    return {"count": len(fresh), "html": "\n".join(news_card_html(item, "N") for item in fresh)}
+
+
+if auto_refresh and _fragment:
+
+    @_fragment(run_every=LIVE_POLL_SECONDS)
+    def live_updates() -> None:
+        baseline = st.session_state.get(f"{prefix}auto_version") or 0
+        current = get_collector().version(mode_key)
+        if current == baseline:
+            return
+        live_view = rendercache.cached(
+            ("live", prefix, version, baseline, current, search_q, filter_src),
+            lambda: build_live_view(mode_key, baseline),
+        )
+        if not live_view["count"]:
+            return
+        col_label, col_merge = st.columns([4, 1])
+        col_label.caption(f"🆕 새 뉴스 {live_view['count']}건")
+        if col_merge.button("↻ 목록에 반영", key=f"{prefix}live_merge"):
+            st.session_state[f"{prefix}auto_version"] = None
+            st.rerun()
+        st.markdown(live_view["html"], unsafe_allow_html=True)
+
+    live_updates()
 
-filtered = news_data
-if search_q:
-    q = search_q.lower()
-    filtered = [n for n in filtered if q in n["title"].lower() or q in (n.get("description") or "").lower()]
-if filter_src != "전체":
-    filtered = [n for n in filtered if n["source"] == filter_src]
 
-st.caption(f"{len(filtered)}건 표시 중")
-for i, item in enumerate(filtered, 1):
-    render_news_card(item, i)
+st.markdown(list_view["html"], unsafe_allow_html=True)
+perf_mark("cards")
 
 # 푸터
-sources_stock = "Finnhub · Yahoo Finance · CNBC · MarketWatch · MNI Markets · MKT News"
-sources_coin = "CryptoPanic · CoinDesk · cryptonews.net · coincarp · The Block · cryptonews.com · Decrypt"
-footer_src = sources_stock if is_stock else sources_coin
+footer_src = " · ".join(src.name for src in mode_sources[:12])
+if len(mode_sources) > 12:
+    footer_src += f" 외 {len(mode_sources) - 12}개"
 st.markdown(f"""
 <div style="text-align:center;padding:24px 16px;color:#6e7681;font-size:.8rem; border-top:1px solid #21262d;margin-top:32px">
   데이터 출처: {footer_src}
   &nbsp;|&nbsp; 생성: {NOW_KST.strftime('%Y-%m-%d %H:%M')} KST
 </div>
 """, unsafe_allow_html=True)
+render_profile()
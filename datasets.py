@@ -0,0 +1,112 @@
+"""
+공유 데이터셋 — 기사 목록 · 요약은 프로세스에 한 벌만, 세션은 버전 문자열만 보관
+- Dataset 은 만든 뒤 바꾸지 않음 (items 는 tuple, 기사 dict 는 읽기 전용으로 취급)
+- 버전 = 내용 해시 → 여러 세션이 같은 수집 결과 · 리포트 · 스냅샷을 보면 메모리에는 한 번만
+- 보관 상한: 버전 수 NEWS_MAX_VERSIONS(기본 24) · 대략 글자 수 NEWS_MAX_VERSION_CHARS(기본 64M), 오래 안 쓴 것부터 정리
+  모드별 최신 버전은 정리하지 않음 → 정리된 버전을 가리키던 세션은 그 모드의 최신 결과로 넘어감
+- 세션이 몇 개든 서버 메모리는 (상한 × 버전 크기) 이내로 일정
+"""
+
+import collections
+import hashlib
+import os
+import threading
+
+from rendercache import approx_size, content_version
+
+MAX_VERSIONS = int(os.getenv("NEWS_MAX_VERSIONS", "24") or 24)
+MAX_CHARS = int(os.getenv("NEWS_MAX_VERSION_CHARS", str(64_000_000)) or 64_000_000)
+
+Dataset = collections.namedtuple(
+    "Dataset", "version mode items source_stats source_notes summary_quick summary_deep provider"
+)
+EMPTY = Dataset("", "", (), {}, {}, "", "", "")
+
+
+def dataset_version(items, source_stats=None, source_notes=None, summary_quick="", summary_deep="", provider="") -> str:
+    """기사 · 소스 현황 해시, 요약이 있으면 요약 해시를 덧붙임 (같은 기사에 요약만 붙은 버전을 구분)."""
+    version = content_version(items, source_stats, source_notes)
+    if summary_quick or summary_deep:
+        h = hashlib.blake2b(f"{provider}\x1f{summary_quick}\x1f{summary_deep}".encode(), digest_size=6)
+        version += "-" + h.hexdigest()
+    return version
+
+
+class DatasetStore:
+    def __init__(self, max_versions: int = MAX_VERSIONS, max_chars: int = MAX_CHARS):
+        self.max_versions = max_versions
+        self.max_chars = max_chars
+        self._data = collections.OrderedDict()  # version → (Dataset, 크기), 오래 안 쓴 순
+        self._latest = {}  # mode → version
+        self._chars = 0
+        self._lock = threading.Lock()
+        self.evicted = 0
+
+    def publish(
+        self,
+        mode: str,
+        items,
+        source_stats=None,
+        source_notes=None,
+        summary_quick: str = "",
+        summary_deep: str = "",
+        provider: str = "",
+        version: str = None,
+    ) -> Dataset:
+        """데이터셋을 등록하고(같은 버전이 있으면 그것을) 돌려준다. version 을 주지 않으면 내용 해시."""
+        source_stats, source_notes = dict(source_stats or {}), dict(source_notes or {})
+        version = version or dataset_version(items, source_stats, source_notes, summary_quick, summary_deep, provider)
+        with self._lock:
+            entry = self._data.get(version)
+            if entry is not None:
+                self._data.move_to_end(version)
+                self._latest[mode] = version
+                return entry[0]
+        dataset = Dataset(
+            version, mode, tuple(items), source_stats, source_notes, summary_quick or "", summary_deep or "", provider or ""
+        )
+        size = approx_size(dataset)
+        with self._lock:
+            if version not in self._data:
+                self._data[version] = (dataset, size)
+                self._chars += size
+            self._data.move_to_end(version)
+            self._latest[mode] = version
+            self._evict()
+            return self._data[version][0]
+
+    def _evict(self) -> None:
+        pinned = set(self._latest.values())
+        for version in list(self._data):
+            if len(self._data) <= self.max_versions and self._chars <= self.max_chars:
+                break
+            if version in pinned:
+                continue
+            self._chars -= self._data.pop(version)[1]
+            self.evicted += 1
+
+    def get(self, version: str):
+        with self._lock:
+            entry = self._data.get(version)
+            if entry is None:
+                return None
+            self._data.move_to_end(version)
+            return entry[0]
+
+    def latest(self, mode: str):
+        with self._lock:
+            version = self._latest.get(mode)
+        return self.get(version) if version else None
+
+    def resolve(self, mode: str, version: str) -> tuple:
+        """(Dataset, 정리됨 여부). 버전이 없으면 EMPTY, 정리된 버전이면 그 모드의 최신 데이터셋."""
+        if not version:
+            return EMPTY, False
+        dataset = self.get(version)
+        if dataset is not None:
+            return dataset, False
+        return self.latest(mode) or EMPTY, True
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"versions": len(self._data), "chars": self._chars, "evicted": self.evicted}
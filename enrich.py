@@ -0,0 +1,164 @@
+"""
+기사 본문 보강 (선택)
+- 상위 N개 기사(주제 대표 기사)의 본문을 동시에 가져와 AI 요약 입력에 덧붙임
+- 전체 동시 요청 수와 호스트별 동시 요청 수를 모두 제한, 요청은 http_get(서킷 브레이커) 경유
+- 본문 추출은 파서 없이 정규식 한 번: <article> 안(없으면 문서 전체)의 <p> 문단 중 충분히 긴 것만
+- 본문은 URL 해시로 디스크에 캐시 (NEWS_BODY_CACHE, 기본 ./.cache/bodies), 개수 · 용량 초과 시 오래된 것부터 삭제
+- prefetch 는 바로 돌아오고, 요약 직전에 bodies(..., wait=초) 로 그때까지 끝난 것만 사용 → 수집 경로를 막지 않음
+"""
+
+import concurrent.futures
+import hashlib
+import os
+import re
+import threading
+import time
+import urllib.parse
+
+from htmltext import html_to_text
+
+BODY_DIR = os.getenv("NEWS_BODY_CACHE") or os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "bodies")
+MAX_FILES = 2000
+MAX_BYTES = 50 * 1024 * 1024
+BODY_CHARS = 4000  # 캐시에 저장하는 본문 길이
+PER_HOST = 2
+MIN_PARAGRAPH = 60
+
+_ARTICLE = re.compile(r"<article\b.*?</article>", re.I | re.S)
+_NOISE = re.compile(r"<(script|style|noscript|template|svg|figure|aside|nav|footer|header)\b.*?</\1\s*>", re.I | re.S)
+_PARAGRAPH = re.compile(r"<p\b[^>]*>(.*?)</p\s*>", re.I | re.S)
+
+_pool = concurrent.futures.ThreadPoolExecutor(max_workers=8, thread_name_prefix="news-enrich")
+_host_slots: dict = {}
+_host_lock = threading.Lock()
+_pending: dict = {}  # url → Future
+_pending_lock = threading.RLock()  # 이미 끝난 Future 의 콜백은 등록하는 스레드에서 바로 불림
+_evict_lock = threading.Lock()
+_writes = 0
+
+
+def extract_text(markup: str, limit: int = BODY_CHARS) -> str:
+    """기사 HTML → 본문 문단 텍스트 (문단 사이 줄바꿈)."""
+    if not markup:
+        return ""
+    scopes = _ARTICLE.findall(markup) or [markup]
+    paragraphs = []
+    size = 0
+    for scope in scopes:
+        for raw in _PARAGRAPH.findall(_NOISE.sub(" ", scope)):
+            text = html_to_text(raw)
+            if len(text) < MIN_PARAGRAPH:
+                continue
+            paragraphs.append(text)
+            size += len(text) + 1
+            if size >= limit:
+                return "\n".join(paragraphs)[:limit]
+    return "\n".join(paragraphs)[:limit]
+
+
+def _path(url: str) -> str:
+    return os.path.join(BODY_DIR, hashlib.sha1(url.encode()).hexdigest() + ".txt")
+
+
+def cached_body(url: str):
+    """디스크 캐시의 본문. 없으면 None (빈 문자열은 '가져왔지만 본문 없음')."""
+    path = _path(url)
+    try:
+        with open(path, encoding="utf-8") as f:
+            body = f.read()
+    except OSError:
+        return None
+    try:
+        os.utime(path)  # LRU: 읽은 것은 최근 사용으로
+    except OSError:
+        pass
+    return body
+
+
+def _save(url: str, body: str) -> None:
+    global _writes
+    os.makedirs(BODY_DIR, exist_ok=True)
+    path = _path(url)
+    tmp = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(body)
+    os.replace(tmp, path)
+    _writes += 1
+    if _writes % 50 == 0:
+        evict()
+
+
+def evict(max_files: int = MAX_FILES, max_bytes: int = MAX_BYTES) -> int:
+    """개수 · 용량 상한을 넘으면 가장 오래 안 쓴 본문부터 지운다. 지운 개수를 돌려준다."""
+    with _evict_lock:
+        try:
+            entries = [e for e in os.scandir(BODY_DIR) if e.name.endswith(".txt")]
+        except OSError:
+            return 0
+        stats = sorted(((e.stat().st_mtime, e.stat().st_size, e.path) for e in entries), reverse=True)
+        total, removed = 0, 0
+        for i, (_, size, path) in enumerate(stats):
+            total += size
+            if i >= max_files or total > max_bytes:
+                try:
+                    os.remove(path)
+                    removed += 1
+                except OSError:
+                    pass
+        return removed
+
+
+def _slot(host: str) -> threading.BoundedSemaphore:
+    with _host_lock:
+        return _host_slots.setdefault(host, threading.BoundedSemaphore(PER_HOST))
+
+
+def fetch_body(url: str, timeout: float = 10.0) -> str:
+    body = cached_body(url)
+    if body is not None:
+        return body
+    from newscore import HEADERS, http_get
+
+    with _slot(urllib.parse.urlsplit(url).netloc):
+        r = http_get(url, headers=HEADERS, timeout=timeout)
+    if r.status_code != 200 or "html" not in r.headers.get("Content-Type", "html"):
+        return ""
+    body = extract_text(r.text)
+    _save(url, body)
+    return body
+
+
+def prefetch(items: list) -> None:
+    """본문 가져오기를 백그라운드에 걸어두고 바로 돌아온다 (이미 받았거나 진행 중인 URL 은 건너뜀)."""
+    with _pending_lock:
+        for item in items:
+            url = item.get("url", "")
+            if not url.startswith("http") or url in _pending:
+                continue
+            if os.path.exists(_path(url)):
+                continue
+            fut = _pool.submit(fetch_body, url)
+            _pending[url] = fut
+            fut.add_done_callback(lambda _f, url=url: _forget(url))
+
+
+def _forget(url: str) -> None:
+    with _pending_lock:
+        _pending.pop(url, None)
+
+
+def bodies(items: list, wait: float = 0.0, chars: int = 1200) -> dict:
+    """url → 잘라낸 본문. wait 초까지는 진행 중인 prefetch 를 기다리고, 못 끝낸 것은 빼고 돌려준다."""
+    prefetch(items)
+    deadline = time.time() + wait
+    with _pending_lock:
+        futures = [_pending[item["url"]] for item in items if item.get("url") in _pending]
+    if futures and wait > 0:
+        concurrent.futures.wait(futures, timeout=max(0.0, deadline - time.time()))
+    result = {}
+    for item in items:
+        url = item.get("url", "")
+        body = cached_body(url) if url else None
+        if body:
+            result[url] = body[:chars]
+    return result
@@ -0,0 +1,128 @@
+"""
+RSS · Atom 피드 설정
+- 피드 목록은 코드가 아니라 설정 파일(JSON)에 둠: NEWS_FEEDS_FILE (기본 ./feeds.json)
+- 항목: name, mode(stock/coin), url 또는 urls(같은 피드의 대체 주소 — 동시에 경쟁), label, group,
+  timeout(초), ttl(이 시간 안에는 다시 가져오지 않음, 0 이면 저장소 기본값), enabled(사이드바 기본 선택)
+- group 이 빈 피드는 사이드바 체크박스로, 나머지는 그룹별 선택 목록으로 표시 → 피드가 수백 개여도 사이드바가 짧음
+- OPML 가져오기: 구독 목록의 xmlUrl 을 피드로 추가 (상위 outline 이름이 group, 같은 URL 은 건너뜀)
+"""
+
+import collections
+import json
+import logging
+import os
+import urllib.parse
+import xml.etree.ElementTree as ET
+
+FEEDS_FILE = os.getenv("NEWS_FEEDS_FILE") or os.path.join(os.path.dirname(os.path.abspath(__file__)), "feeds.json")
+DEFAULT_TIMEOUT = 15.0
+MODES = ("stock", "coin")
+
+log = logging.getLogger(__name__)
+
+Feed = collections.namedtuple("Feed", "name mode urls label group timeout ttl enabled")
+
+
+def _feed(entry: dict) -> Feed:
+    urls = entry.get("urls") or [entry.get("url", "")]
+    if not entry.get("name") or not all(urls):
+        raise ValueError(f"피드 항목에 name 과 url 이 필요합니다: {entry}")
+    if entry.get("mode") not in MODES:
+        raise ValueError(f"피드 mode 는 {' / '.join(MODES)} 중 하나여야 합니다: {entry['name']}")
+    return Feed(
+        name=entry["name"],
+        mode=entry["mode"],
+        urls=tuple(urls),
+        label=entry.get("label") or entry["name"],
+        group=entry.get("group", ""),
+        timeout=float(entry.get("timeout") or DEFAULT_TIMEOUT),
+        ttl=float(entry.get("ttl") or 0),
+        enabled=bool(entry.get("enabled", True)),
+    )
+
+
+def read_entries(path: str = None) -> list:
+    path = path or FEEDS_FILE
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f).get("feeds", [])
+    except FileNotFoundError:
+        return []
+
+
+def load(path: str = None, strict: bool = False) -> list:
+    """설정 파일의 피드 목록. 파일이 없으면 빈 목록, 이름이 겹치면 뒤 항목은 건너뜀.
+    import 시점에 불리므로 기본은 잘못된 항목 · 깨진 파일을 로그만 남기고 건너뜀 (strict=True 면 ValueError)."""
+    try:
+        entries = read_entries(path)
+    except (OSError, ValueError, AttributeError) as e:
+        if strict:
+            raise ValueError(f"피드 설정 파일을 읽을 수 없습니다: {path or FEEDS_FILE} ({e})") from e
+        log.warning("피드 설정 파일을 읽을 수 없어 RSS 피드 없이 시작합니다: %s (%s)", path or FEEDS_FILE, e)
+        return []
+    feeds, seen = [], set()
+    for entry in entries:
+        try:
+            feed = _feed(entry)
+        except (ValueError, TypeError, AttributeError) as e:
+            if strict:
+                raise ValueError(f"잘못된 피드 항목: {entry} ({e})") from e
+            log.warning("잘못된 피드 항목을 건너뜁니다: %s", e)
+            continue
+        if feed.name not in seen:
+            seen.add(feed.name)
+            feeds.append(feed)
+    return feeds
+
+
+def write_entries(entries: list, path: str = None) -> str:
+    path = path or FEEDS_FILE
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"feeds": entries}, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+    os.replace(tmp, path)
+    return path
+
+
+def parse_opml(text, mode: str, group: str = "OPML") -> list:
+    """OPML 문서 → 피드 항목 목록. 피드를 담은 상위 outline 의 이름을 group 으로 쓴다."""
+    root = ET.fromstring(text)
+    entries = []
+
+    def walk(node, parent_group: str) -> None:
+        for outline in node.findall("outline"):
+            name = (outline.get("title") or outline.get("text") or "").strip()
+            url = (outline.get("xmlUrl") or "").strip()
+            if url:
+                entry = {"name": name or url, "mode": mode, "url": url, "group": parent_group}
+                entries.append(entry)
+            else:
+                walk(outline, name or parent_group)
+
+    walk(root.find("body") if root.find("body") is not None else root, group)
+    return entries
+
+
+def import_opml(opml_path: str, mode: str, group: str = "", path: str = None) -> int:
+    """OPML 구독 목록을 설정 파일에 추가하고 새로 들어간 피드 수를 돌려준다. group 을 주면 모든 피드를 그 그룹으로."""
+    with open(opml_path, "rb") as f:
+        imported = parse_opml(f.read(), mode)
+    for entry in imported:
+        entry["group"] = group or entry["group"]
+    entries = read_entries(path)
+    urls = {url for entry in entries for url in entry.get("urls") or [entry.get("url")]}
+    names = {entry.get("name") for entry in entries}
+    added = 0
+    for entry in imported:
+        if entry["url"] in urls:
+            continue
+        if entry["name"] in names:
+            entry["name"] = f"{entry['name']} ({urllib.parse.urlsplit(entry['url']).netloc or entry['url']})"
+        _feed(entry)
+        urls.add(entry["url"])
+        names.add(entry["name"])
+        entries.append(entry)
+        added += 1
+    write_entries(entries, path)
+    return added
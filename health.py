@@ -0,0 +1,175 @@
+"""
+소스 헬스 추적 + 서킷 브레이커
+- 호스트별 브레이커: 연속 실패 N회면 open → 쿨다운 동안 요청 없이 즉시 실패
+  쿨다운이 지나면 half-open 으로 한 번만 시험 요청, 실패하면 쿨다운을 두 배로
+- 429/503 의 Retry-After 는 그 시간만큼 바로 open
+- 소스별 마지막 정상 결과를 보관해 실패 시 오래되지 않은 캐시로 대체 (stale)
+"""
+
+import datetime
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+
+
+class CircuitOpen(Exception):
+    def __init__(self, host: str, reason: str, retry_in: float):
+        super().__init__(f"{host} 차단 중 ({reason}, {retry_in:.0f}s 후 재시도)")
+        self.host = host
+        self.reason = reason
+        self.retry_in = retry_in
+
+
+def parse_retry_after(value) -> float:
+    if not value:
+        return 0.0
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        dt = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return 0.0
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=datetime.timezone.utc)
+    return max(0.0, dt.timestamp() - time.time())
+
+
+class Breaker:
+    def __init__(self, host: str, threshold: int = 3, cooldown: float = 60.0, max_cooldown: float = 900.0):
+        self.host = host
+        self.threshold = threshold
+        self.base_cooldown = cooldown
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.state = CLOSED
+        self.failures = 0
+        self.open_until = 0.0
+        self.reason = ""
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self, now: float) -> bool:
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and now >= self.open_until:
+                self.state = HALF_OPEN
+                self._probing = False
+            if self.state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def retry_in(self, now: float) -> float:
+        return max(0.0, self.open_until - now)
+
+    def success(self) -> None:
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self.cooldown = self.base_cooldown
+            self.reason = ""
+            self._probing = False
+
+    def failure(self, reason: str, now: float, retry_after: float = 0.0) -> None:
+        with self._lock:
+            self.failures += 1
+            self.reason = reason
+            if self.state == HALF_OPEN:
+                self.cooldown = min(self.cooldown * 2, self.max_cooldown)
+                self._open(now, self.cooldown)
+            elif retry_after:
+                self._open(now, min(retry_after, self.max_cooldown))
+            elif self.failures >= self.threshold:
+                self._open(now, self.cooldown)
+
+    def _open(self, now: float, duration: float) -> None:
+        self.state = OPEN
+        self.open_until = now + duration
+        self._probing = False
+
+
+_breakers: dict = {}
+_breakers_lock = threading.Lock()
+
+
+def breaker(host: str) -> Breaker:
+    br = _breakers.get(host)
+    if br is None:
+        with _breakers_lock:
+            br = _breakers.setdefault(host, Breaker(host))
+    return br
+
+
+def breaker_states() -> dict:
+    now = time.time()
+    return {
+        host: {"state": br.state, "reason": br.reason, "retry_in": round(br.retry_in(now))}
+        for host, br in list(_breakers.items())
+        if br.state != CLOSED or br.failures
+    }
+
+
+# ── 소스 단위: 실행 기록 + stale 캐시 ─────────────
+MAX_STALE = 6 * 3600
+
+_local = threading.local()
+_status: dict = {}
+_last_good: dict = {}
+_status_lock = threading.Lock()
+
+
+def note_error(reason: str) -> None:
+    """현재 스레드에서 실행 중인 소스에 오류를 기록 (HTTP 계층에서 호출)."""
+    errors = getattr(_local, "errors", None)
+    if errors is not None:
+        errors.append(reason)
+
+
+def run_source(name: str, fn, args) -> list:
+    """fn(*args) 실행. 결과가 비었고 오류가 있었으면 stale 캐시로 대체."""
+    _local.errors = []
+    started = time.time()
+    try:
+        items = fn(*args)
+    except Exception as e:
+        _local.errors.append(str(e) or type(e).__name__)
+        items = []
+    finally:
+        errors, _local.errors = _local.errors, None
+    elapsed = time.time() - started
+    with _status_lock:
+        if items:
+            _last_good[name] = (time.time(), items)
+            _status[name] = {"state": "ok", "reason": "", "elapsed": elapsed}
+            return items
+        if not errors:
+            _status[name] = {"state": "empty", "reason": "", "elapsed": elapsed}
+            return items
+        reason = errors[-1]
+        cached = _last_good.get(name)
+        if cached and time.time() - cached[0] <= MAX_STALE:
+            age = int((time.time() - cached[0]) / 60)
+            _status[name] = {"state": "stale", "reason": reason, "elapsed": elapsed, "age_min": age}
+            return cached[1]
+        _status[name] = {"state": "failed", "reason": reason, "elapsed": elapsed}
+        return items
+
+
+def source_status(name: str) -> dict:
+    with _status_lock:
+        return dict(_status.get(name) or {"state": "unknown", "reason": ""})
+
+
+def describe(name: str) -> str:
+    """통계 패널용 한 줄 설명. 정상이면 빈 문자열."""
+    status = source_status(name)
+    if status["state"] == "stale":
+        return f"캐시 {status['age_min']}분 전 · {status['reason']}"
+    if status["state"] == "failed":
+        return f"실패 · {status['reason']}"
+    return ""
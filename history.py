@@ -0,0 +1,256 @@
+"""
+뉴스 기록 저장소 (sqlite) — 기간 · 소스 · 티커로 지난 뉴스 조회
+- 수집된 기사는 제목 해시를 rowid 로 한 번만 저장 (처음 본 시각 first_seen 함께)
+- 정렬 키 ts = 발행 시각, 없으면 처음 본 시각 → (ts, id) 인덱스로 기간 조회와 페이지 넘김이 모두 인덱스 범위 탐색
+- 페이지는 OFFSET 대신 (ts, id) 커서로 넘겨 한 달 전 페이지도 첫 페이지와 같은 비용
+- 티커는 (ticker, ts, id) 커버링 인덱스 테이블에 따로 두어 티커 + 기간 조회가 본문 테이블을 훑지 않음
+- 시간대별 · 소스별 건수는 GROUP BY 로 sqlite 가 계산
+- 저장 위치: NEWS_HISTORY_DB (기본 ./.cache/history.sqlite), NEWS_HISTORY_DAYS(기본 90)일 지난 기사는 정리
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from newsbatch import title_digest
+from normalize import item_epoch
+
+DB_PATH = os.getenv("NEWS_HISTORY_DB") or os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), ".cache", "history.sqlite"
+)
+KEEP_DAYS = int(os.getenv("NEWS_HISTORY_DAYS", "90") or 90)
+KST_OFFSET = 9 * 3600
+PAGE_SIZE = 50
+
+_CASHTAG = re.compile(r"\$([A-Za-z]{1,6})\b")
+_EXCHANGE = re.compile(r"\b(?:NYSE|NASDAQ|Nasdaq|AMEX|NYSEARCA|TSX|OTC)\s*:\s*([A-Z][A-Z.]{0,5})\b")
+_PAREN = re.compile(r"\(([A-Z]{2,5})\)")
+_PAREN_SKIP = frozenset("CEO CFO AI IPO ETF ETFS US UK EU GDP CPI PPI SEC FED FOMC IMF ECB BOJ PMI".split())
+_COIN_NAMES = {
+    "bitcoin": "BTC",
+    "ethereum": "ETH",
+    "ether": "ETH",
+    "solana": "SOL",
+    "xrp": "XRP",
+    "ripple": "XRP",
+    "dogecoin": "DOGE",
+    "cardano": "ADA",
+    "tether": "USDT",
+    "bnb": "BNB",
+}
+_COIN_WORD = re.compile(r"\b(" + "|".join(_COIN_NAMES) + r")\b", re.I)
+
+_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS items (
+        id INTEGER PRIMARY KEY, ts REAL NOT NULL, timed INTEGER NOT NULL, first_seen REAL NOT NULL,
+        mode TEXT, feed TEXT, source TEXT, title TEXT, url TEXT, published_at TEXT, description TEXT)""",
+    "CREATE INDEX IF NOT EXISTS items_ts ON items (ts, id)",
+    "CREATE INDEX IF NOT EXISTS items_mode_ts ON items (mode, ts, id)",
+    "CREATE INDEX IF NOT EXISTS items_source_ts ON items (source, ts, id)",
+    "CREATE INDEX IF NOT EXISTS items_mode_source ON items (mode, source)",
+    # 소스별 건수용 커버링 인덱스 (기간 범위만 읽고 본문 행은 건드리지 않음)
+    "CREATE INDEX IF NOT EXISTS items_mode_ts_source ON items (mode, ts, source)",
+    "CREATE INDEX IF NOT EXISTS items_ts_source ON items (ts, source)",
+    "CREATE TABLE IF NOT EXISTS tickers (ticker TEXT, ts REAL, id INTEGER, PRIMARY KEY (ticker, ts, id)) WITHOUT ROWID",
+)
+
+_local = threading.local()
+_init_lock = threading.Lock()
+_initialized = set()
+_writes = 0
+_writes_lock = threading.Lock()
+
+
+def _conn() -> sqlite3.Connection:
+    conn = getattr(_local, "conn", None)
+    if conn is None or getattr(_local, "path", None) != DB_PATH:
+        os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
+        conn = sqlite3.connect(DB_PATH, timeout=10, isolation_level=None)
+        conn.execute("PRAGMA synchronous=NORMAL")  # WAL 에서는 커밋마다 fsync 하지 않아도 손상되지 않음
+        with _init_lock:
+            if DB_PATH not in _initialized:
+                conn.execute("PRAGMA journal_mode=WAL")
+                for statement in _SCHEMA:
+                    conn.execute(statement)
+                _initialized.add(DB_PATH)
+        _local.conn, _local.path = conn, DB_PATH
+    return conn
+
+
+def _item_id(title: str) -> int:
+    return int.from_bytes(title_digest(title), "little", signed=True)
+
+
+def extract_tickers(text: str) -> set:
+    """$TSLA · (NASDAQ: AAPL) · (BTC) 같은 표기와 주요 코인 이름에서 티커를 뽑는다."""
+    found = {m.upper() for m in _CASHTAG.findall(text)}
+    found.update(m.rstrip(".") for m in _EXCHANGE.findall(text))
+    found.update(m for m in _PAREN.findall(text) if m not in _PAREN_SKIP)
+    found.update(_COIN_NAMES[m.lower()] for m in _COIN_WORD.findall(text))
+    return found
+
+
+def record(items: list, feed: str = "", mode: str = "", now: float = None) -> int:
+    """새 기사만 저장하고 새로 들어간 건수를 돌려준다. 기록 실패는 수집 경로를 막지 않는다."""
+    global _writes
+    now = time.time() if now is None else now
+    rows, tags = [], []
+    for item in items:
+        title = item.get("title", "")
+        if not title:
+            continue
+        item_id = _item_id(title)
+        ts = item_epoch(item)
+        timed = ts == ts  # NaN 이 아니면 발행 시각 있음
+        ts = ts if timed else now
+        rows.append(
+            (
+                item_id,
+                ts,
+                int(timed),
+                now,
+                mode,
+                feed,
+                item.get("source", ""),
+                title,
+                item.get("url", ""),
+                item.get("published_at", ""),
+                item.get("description", ""),
+            )
+        )
+        tags += [(ticker, ts, item_id) for ticker in extract_tickers(f"{title} {item.get('description') or ''}")]
+    if not rows:
+        return 0
+    try:
+        conn = _conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            before = conn.total_changes
+            conn.executemany("INSERT OR IGNORE INTO items VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            added = conn.total_changes - before
+            conn.executemany("INSERT OR IGNORE INTO tickers VALUES (?, ?, ?)", tags)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    except sqlite3.Error:
+        return 0
+    with _writes_lock:
+        _writes += 1
+        due = _writes % 200 == 0
+    if due:
+        try:
+            prune()
+        except sqlite3.Error:
+            pass  # 다음 주기에 다시 시도
+    return added
+
+
+def prune(days: float = KEEP_DAYS) -> int:
+    cutoff = time.time() - days * 86400
+    conn = _conn()
+    conn.execute("DELETE FROM tickers WHERE ts < ?", (cutoff,))
+    return conn.execute("DELETE FROM items WHERE ts < ?", (cutoff,)).rowcount
+
+
+def first_seen(titles) -> dict:
+    """제목 해시 → 처음 본 epoch (기록에 있는 것만). 발행 시각이 없는 기사의 최신성 기준. 실패하면 빈 dict."""
+    ids = {_item_id(title): title_digest(title) for title in titles if title}
+    found = {}
+    try:
+        conn = _conn()
+        keys = list(ids)
+        for i in range(0, len(keys), 500):
+            chunk = keys[i : i + 500]
+            marks = ",".join("?" * len(chunk))
+            for item_id, seen in conn.execute(f"SELECT id, first_seen FROM items WHERE id IN ({marks})", chunk):
+                found[ids[item_id]] = seen
+    except sqlite3.Error:
+        return {}
+    return found
+
+
+def _keys(ticker) -> tuple:
+    """정렬 · 기간 조건에 쓸 (ts, id) 열. 티커 조회는 tickers 인덱스 쪽 열을 써야 정렬 없이 읽힌다."""
+    return ("t.ts", "t.id") if ticker else ("i.ts", "i.id")
+
+
+def _where(mode=None, start=None, end=None, sources=None, ticker=None) -> tuple:
+    """(FROM 절, WHERE 절, 인자). 티커가 있으면 tickers 인덱스를 먼저 타도록 조인한다."""
+    ts_col = _keys(ticker)[0]
+    source = "tickers t JOIN items i ON i.id = t.id" if ticker else "items i"
+    clauses, args = [], []
+    if ticker:
+        clauses.append("t.ticker = ?")
+        args.append(ticker.upper().lstrip("$"))
+    if mode:
+        clauses.append("i.mode = ?")
+        args.append(mode)
+    if start is not None:
+        clauses.append(f"{ts_col} >= ?")
+        args.append(start)
+    if end is not None:
+        clauses.append(f"{ts_col} < ?")
+        args.append(end)
+    if sources:
+        sources = list(sources)
+        clauses.append(f"i.source IN ({','.join('?' * len(sources))})")
+        args += sources
+    return source, (" WHERE " + " AND ".join(clauses)) if clauses else "", args
+
+
+def _row_item(row) -> dict:
+    item_id, ts, timed, first_seen, mode, feed, source, title, url, published_at, description = row
+    return {
+        "title": title,
+        "url": url,
+        "source": source,
+        "published_at": published_at,
+        "published_ts": ts if timed else None,
+        "description": description,
+        "first_seen": first_seen,
+        "_cursor": (ts, item_id),
+    }
+
+
+def page(mode=None, start=None, end=None, sources=None, ticker=None, cursor=None, limit: int = PAGE_SIZE) -> tuple:
+    """최신순 한 쪽 (기사 목록, 다음 쪽 커서 또는 None). cursor 는 앞 쪽이 돌려준 값."""
+    source, where, args = _where(mode, start, end, sources, ticker)
+    ts_col, id_col = _keys(ticker)
+    if cursor is not None:
+        where += (" AND " if where else " WHERE ") + f"({ts_col}, {id_col}) < (?, ?)"
+        args += list(cursor)
+    sql = f"SELECT i.* FROM {source}{where} ORDER BY {ts_col} DESC, {id_col} DESC LIMIT ?"
+    rows = _conn().execute(sql, args + [limit + 1]).fetchall()
+    items = [_row_item(row) for row in rows[:limit]]
+    return items, (items[-1]["_cursor"] if len(rows) > limit else None)
+
+
+def count(mode=None, start=None, end=None, sources=None, ticker=None) -> int:
+    source, where, args = _where(mode, start, end, sources, ticker)
+    return _conn().execute(f"SELECT COUNT(*) FROM {source}{where}", args).fetchone()[0]
+
+
+def counts_by_hour(mode=None, start=None, end=None, sources=None, ticker=None) -> list:
+    """[(KST 시각 버킷 시작 epoch, 건수)] 오래된 순."""
+    source, where, args = _where(mode, start, end, sources, ticker)
+    ts_col = _keys(ticker)[0]
+    sql = (
+        f"SELECT (CAST(({ts_col} + {KST_OFFSET}) / 3600 AS INTEGER) * 3600 - {KST_OFFSET}) AS hour, COUNT(*) "
+        f"FROM {source}{where} GROUP BY hour ORDER BY hour"
+    )
+    return _conn().execute(sql, args).fetchall()
+
+
+def counts_by_source(mode=None, start=None, end=None, sources=None, ticker=None) -> list:
+    """[(소스, 건수)] 많은 순."""
+    source, where, args = _where(mode, start, end, sources, ticker)
+    sql = f"SELECT i.source, COUNT(*) AS n FROM {source}{where} GROUP BY i.source ORDER BY n DESC"
+    return _conn().execute(sql, args).fetchall()
+
+
+def sources(mode=None) -> list:
+    where, args = ("WHERE mode = ?", [mode]) if mode else ("", [])
+    return [row[0] for row in _conn().execute(f"SELECT DISTINCT source FROM items {where} ORDER BY source", args)]
@@ -0,0 +1,140 @@
+"""
+HTML → 텍스트 (단일 패스)
+- RSS 설명·요약문 정리용: 태그 제거 + 엔티티 디코드 + 공백 정리를 한 번에
+- BeautifulSoup(html.parser).get_text() 와 같은 결과를 내도록 맞춤
+  (script/style/template 내용, 주석, 선언은 버리고, 알 수 없는 엔티티는 '&name' 으로)
+- 흔치 않은 형태(CDATA, 세미콜론 없는 엔티티, 닫히지 않은 태그 등)는 BeautifulSoup 으로 넘김
+
+벤치마크: python htmltext.py [RSS 파일 ...] (예: tests/fixtures/rss_markup.xml) — 같은 결과 검사는 tests/test_htmltext.py
+"""
+
+import re
+from html.entities import html5
+
+# 태그 / 주석 / DOCTYPE / 처리 지시문 (속성 값 안의 '>' 고려)
+_MARKUP = re.compile(
+    r"""<(?:/?[a-zA-Z](?:"[^"]*"|'[^']*'|[^'">])*|!--.*?--|![a-zA-Z][^>]*|\?[^>]*)>""",
+    re.S,
+)
+_REF = re.compile(r"&(?:([a-zA-Z][a-zA-Z0-9]*)|#([0-9]{1,7})|#[xX]([0-9a-fA-F]{1,6}));")
+_SPACE = re.compile(r"\s+")
+# 빠른 경로가 다루지 않는 것: 남은 태그 시작, 형식이 다른 엔티티, 내용이 특수한 요소, CDATA
+_UNSAFE_TEXT = re.compile(r"<[a-zA-Z/!?]|&(?!\s)")
+_SPECIAL = re.compile(r"<(?:script|style|template|textarea|title|xmp|plaintext|noscript|!\[CDATA\[)", re.I)
+
+_NAMED = {name[:-1]: char for name, char in html5.items() if name.endswith(";")}
+
+
+def _codepoint_ok(cp: int) -> bool:
+    # 제어 문자 · cp1252 구간 · 서로게이트 · 비문자는 BeautifulSoup 의 치환 규칙을 따르도록 느린 경로로
+    if cp in (9, 10, 13) or 32 <= cp <= 126:
+        return True
+    return 160 <= cp <= 0x10FFFF and not 0xD800 <= cp <= 0xDFFF and not 0xFDD0 <= cp <= 0xFDEF and cp & 0xFFFE != 0xFFFE
+
+
+def _decode(text: str):
+    """텍스트 조각의 엔티티 디코드. 빠른 경로로 처리할 수 없으면 None."""
+    out = []
+    pos = 0
+    for m in _REF.finditer(text):
+        if _UNSAFE_TEXT.search(text, pos, m.start()):
+            return None
+        out.append(text[pos : m.start()])
+        name, dec, hexa = m.groups()
+        if name is not None:
+            out.append(_NAMED.get(name, "&" + name))
+        else:
+            cp = int(dec) if dec is not None else int(hexa, 16)
+            if not _codepoint_ok(cp):
+                return None
+            out.append(chr(cp))
+        pos = m.end()
+    if _UNSAFE_TEXT.search(text, pos):
+        return None
+    out.append(text[pos:])
+    return "".join(out)
+
+
+def _slow(markup: str, sep: str) -> str:
+    import lazydeps
+
+    soup = lazydeps.soup(markup, "html.parser")
+    if sep:
+        return _SPACE.sub(" ", soup.get_text(separator=sep)).strip()
+    return soup.get_text(strip=True)
+
+
+def html_to_text(markup: str, sep: str = " ") -> str:
+    """sep=" ": get_text(separator=" ") 후 공백 정리와 같음.
+    sep="": get_text(strip=True) 와 같음 (텍스트 조각을 각각 strip 해서 붙임)."""
+    if not markup:
+        return ""
+    if "<" not in markup and "&" not in markup:
+        return _SPACE.sub(" ", markup).strip() if sep else markup.strip()
+    if _SPECIAL.search(markup):
+        return _slow(markup, sep)
+    nodes = []
+    pos = 0
+    for m in _MARKUP.finditer(markup):
+        if m.start() > pos:
+            nodes.append(markup[pos : m.start()])
+        pos = m.end()
+    if pos < len(markup):
+        nodes.append(markup[pos:])
+    texts = []
+    for node in nodes:
+        text = _decode(node)
+        if text is None:
+            return _slow(markup, sep)
+        texts.append(text)
+    if sep:
+        return _SPACE.sub(" ", sep.join(texts)).strip()
+    return "".join(t for t in (t.strip() for t in texts) if t)
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    import lazydeps
+
+    samples = [
+        "<p>Bitcoin <b>surges</b> past $70,000 &amp; ETH follows&nbsp;&#8212; traders cheer.</p>",
+        '<div class="x"><a href="https://example.com/?a=1&amp;b=2">Fed</a> holds rates<br/>steady</div>',
+        "Plain text summary without markup, as Finnhub and CryptoPanic return it.",
+        "<p>The post <a href='https://x.y/z'>Some title</a> appeared first on <i>Site</i>.</p>\n<img src='a.png'/>",
+        "&lt;b&gt;escaped&lt;/b&gt; markup &copy; 2024 &#x41;&#66; x < y",
+    ]
+    for path in sys.argv[1:]:
+        with open(path, "rb") as f:
+            feed = lazydeps.soup(f.read(), "xml")
+        for el in feed.find_all(["description", "summary"]):
+            samples.append(el.get_text(strip=True))
+
+    def old(text):
+        # 예전 경로: 수집기에서 한 번, make_item 에서 또 한 번 BeautifulSoup
+        desc = lazydeps.soup(text, "html.parser").get_text(strip=True)[:200]
+        cleaned = lazydeps.soup(desc, "html.parser").get_text(separator=" ")
+        return re.sub(r"\s+", " ", cleaned).strip()
+
+    def reference(text):
+        return re.sub(r"\s+", " ", lazydeps.soup(text, "html.parser").get_text(separator=" ")).strip()[:200].rstrip()
+
+    def new(text):
+        return html_to_text(text)[:200].rstrip()
+
+    mismatches = [s for s in samples if reference(s) != new(s)]
+    rounds = max(1, 20000 // len(samples))
+    timings = {}
+    for label, fn in (("BeautifulSoup x2", old), ("html_to_text", new)):
+        started = time.perf_counter()
+        for _ in range(rounds):
+            for s in samples:
+                fn(s)
+        timings[label] = (time.perf_counter() - started) / (rounds * len(samples)) * 1e6
+    for label, us in timings.items():
+        print(f"{label:18s} {us:8.1f} µs/item")
+    print(f"speedup {timings['BeautifulSoup x2'] / timings['html_to_text']:.1f}x, 샘플 {len(samples)}개, 불일치 {len(mismatches)}개")
+    for s in mismatches[:5]:
+        print("  ", repr(s[:120]))
+    sys.exit(1 if mismatches else 0)
@@ -0,0 +1,160 @@
+"""
+모드 공용 기사 저장소
+- 소스별 최근 수집 결과를 프로세스 하나에 한 벌만 보관 (세션 · 모드 · 백그라운드 수집기 공용)
+- 주식 / 코인 화면은 이 저장소 위의 필터: 자기 모드 소스 전체 + 다른 모드 소스 중 키워드가 맞는 기사
+  (예: Finnhub 일반 뉴스의 비트코인 ETF 기사는 코인 화면에도 나옴)
+- TTL 안의 결과가 있으면 다시 가져오지 않으므로 모드를 바꾸거나 여러 사용자가 눌러도 소스당 한 번만 수집
+- 들어온 기사는 history(sqlite)에도 기록 → 기간 · 소스 · 티커 조회용, 관심 목록 알림(alerts)도 여기서 평가
+- 다른 세션이 같은 소스를 수집하는 중이면 새로 요청하지 않고 그 결과를 같이 받음 (소스 단위 single-flight)
+"""
+
+import concurrent.futures
+import math
+import os
+import re
+import threading
+import time
+
+import alerts
+import health
+import history as history_db
+import singleflight
+from newsbatch import title_digest
+from newscore import COLLECT_WORKERS, SOURCES_BY_NAME, finalize, iter_collect
+from normalize import item_epoch
+
+STORE_TTL = float(os.getenv("NEWS_STORE_TTL", "120") or 120)
+HISTORY_CAP = 500  # 소스별 백필 기사 보관 상한
+
+# 다른 모드 소스의 기사를 이 모드 화면에 포함할지 판단하는 제목 키워드
+MODE_FILTERS = {
+    "coin": re.compile(
+        r"\b(bitcoin|btc|ethereum|ether|crypto\w*|stablecoins?|blockchain|solana|xrp|dogecoin|"
+        r"binance|coinbase|microstrategy|tokens?|defi|web3)\b",
+        re.I,
+    ),
+    "stock": re.compile(
+        r"\b(stocks?|shares|equit(y|ies)|s&p|nasdaq|dow|nyse|earnings|ipo|fed|treasur(y|ies)|"
+        r"coinbase|microstrategy|etfs?)\b",
+        re.I,
+    ),
+}
+
+
+def _sort_ts(item: dict) -> float:
+    ts = item_epoch(item)
+    return float("-inf") if math.isnan(ts) else ts
+
+
+def source_mode(name: str) -> str:
+    src = SOURCES_BY_NAME.get(name)
+    return src.mode if src else ""
+
+
+def mode_view(mode: str, items_by_source: dict, names=None) -> tuple:
+    """모드 화면용 (기사 목록, 소스별 건수). names 가 없으면 그 모드의 모든 소스."""
+    if names is None:
+        names = [name for name in items_by_source if source_mode(name) == mode]
+    names = list(names)
+    own = set(names)
+    pattern = MODE_FILTERS.get(mode)
+    merged = [item for name in names for item in items_by_source.get(name, ())]
+    if pattern is not None:
+        for name, items in items_by_source.items():
+            if name in own or source_mode(name) == mode:
+                continue
+            merged += [item for item in items if pattern.search(item.get("title", ""))]
+    # 최신 수집분과 백필 이력이 겹칠 수 있으므로 제목 기준 고유 건수
+    stats = {name: len({title_digest(item.get("title", "")) for item in items_by_source.get(name, ())}) for name in names}
+    return finalize(merged), stats
+
+
+class ItemStore:
+    def __init__(self, ttl: float = STORE_TTL):
+        self.ttl = ttl
+        self._entries = {}  # name → (fetched_at, items)
+        self._history = {}  # name → {제목 해시: item} (백필분, 최신 수집과 별도로 누적)
+        self._lock = threading.Lock()
+        self.flights = singleflight.Group()
+
+    def put(self, name: str, items: list, at: float = None) -> None:
+        with self._lock:
+            self._entries[name] = (time.time() if at is None else at, items)
+        history_db.record(items, name, source_mode(name))
+        alerts.evaluate(items, name)
+
+    def add_history(self, name: str, items: list) -> int:
+        """백필 결과를 소스 이력에 합치고 새로 들어간 건수를 돌려준다. 오래된 것부터 상한까지 정리."""
+        with self._lock:
+            history = self._history.setdefault(name, {})
+            before = len(history)
+            for item in items:
+                history.setdefault(title_digest(item.get("title", "")), item)
+            if len(history) > HISTORY_CAP:
+                keep = sorted(history.items(), key=lambda kv: _sort_ts(kv[1]), reverse=True)[:HISTORY_CAP]
+                self._history[name] = history = dict(keep)
+            added = max(0, len(history) - before)
+        history_db.record(items, name, source_mode(name))
+        alerts.evaluate(items, name)
+        return added
+
+    def snapshot(self, names=None, ttl: float = None) -> dict:
+        """name → items. ttl 이 주어지면 그보다 오래된 최신 수집분은 빼고, 백필 이력은 항상 포함."""
+        now = time.time()
+        with self._lock:
+            entries = dict(self._entries)
+            history = {name: list(items.values()) for name, items in self._history.items()}
+        result = {}
+        for name in set(entries) | set(history):
+            if names is not None and name not in names:
+                continue
+            at, items = entries.get(name, (0.0, []))
+            latest = items if ttl is None or now - at <= ttl else []
+            if latest or history.get(name):
+                result[name] = latest + history.get(name, [])
+        return result
+
+    def collected_at(self, names) -> float:
+        """names 중 가장 최근 수집 시각 (epoch). 수집한 적이 없으면 0."""
+        with self._lock:
+            return max((self._entries[name][0] for name in names if name in self._entries), default=0.0)
+
+    def source_ttl(self, name: str) -> float:
+        """피드 설정에 ttl 이 있으면 그 값, 없으면 저장소 기본값."""
+        src = SOURCES_BY_NAME.get(name)
+        return (src.ttl if src else 0.0) or self.ttl
+
+    def collect(self, tasks, max_workers: int = COLLECT_WORKERS):
+        """TTL 안에 수집된 소스는 저장본을, 다른 세션이 수집 중인 소스는 그 결과를, 나머지는 새로 수집해
+        (name, items, error, cached) 로 내보낸다."""
+        own, joined = [], {}
+        for task in tasks:
+            name = task[0]
+            entry = self._entries.get(name)
+            if entry and time.time() - entry[0] <= self.source_ttl(name):
+                yield name, entry[1], None, True
+                continue
+            fut, owner = self.flights.claim(name)
+            if owner:
+                own.append((task, fut))
+            else:
+                joined[fut] = name
+        claims = {task[0]: fut for task, fut in own}
+        try:
+            for name, items, err in iter_collect([task for task, _ in own], max_workers):
+                # stale 캐시로 대체된 결과는 새 수집으로 치지 않음
+                if err is None and health.source_status(name)["state"] in ("ok", "empty"):
+                    self.put(name, items)
+                self.flights.resolve(name, claims.pop(name), (items, err))
+                yield name, items, err, False
+        finally:
+            # 도중에 멈춰도(rerun 등) 기다리는 세션이 영원히 막히지 않도록
+            for name, fut in claims.items():
+                self.flights.resolve(name, fut, ([], RuntimeError("다른 세션의 수집이 중단됨")))
+        for fut in concurrent.futures.as_completed(joined):
+            items, err = fut.result()
+            yield joined[fut], items, err, True
+
+    def view(self, mode: str, names=None, ttl: float = None) -> tuple:
+        """저장소 위의 모드 필터. 다른 모드 소스도 ttl 안의 것이면 키워드로 섞는다."""
+        return mode_view(mode, self.snapshot(ttl=self.ttl if ttl is None else ttl), names)
@@ -0,0 +1,95 @@
+"""
+무거운 의존성 지연 로딩 + 백그라운드 예열
+- requests / bs4 / google-genai / openai 는 실제로 쓰는 경로에서 처음 import
+- HTTP 세션과 AI 클라이언트는 프로세스 단위로 한 번만 만들어 재사용
+- prewarm() 은 첫 렌더 이후 백그라운드 스레드에서 import · 파서 · 클라이언트를 미리 준비
+"""
+
+import importlib
+import threading
+
+_session_lock = threading.Lock()
+_client_lock = threading.Lock()
+_prewarm_lock = threading.Lock()
+_session = None
+_clients: dict = {}
+_prewarm_started = False
+
+
+def http():
+    """프로세스 공용 requests.Session (커넥션 풀 재사용)."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                requests = importlib.import_module("requests")
+                session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(pool_connections=32, pool_maxsize=32)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _session = session
+    return _session
+
+
+def soup(markup, parser: str = "html.parser"):
+    return importlib.import_module("bs4").BeautifulSoup(markup, parser)
+
+
+def genai_types():
+    return importlib.import_module("google.genai.types")
+
+
+def genai_client(api_key: str):
+    """ImportError 는 호출자에게 그대로 전달 (패키지 없음 안내용)."""
+    key = ("gemini", api_key)
+    client = _clients.get(key)
+    if client is None:
+        with _client_lock:
+            client = _clients.get(key)
+            if client is None:
+                genai = importlib.import_module("google.genai")
+                client = _clients[key] = genai.Client(api_key=api_key)
+    return client
+
+
+def openai_client(api_key: str):
+    key = ("openai", api_key)
+    client = _clients.get(key)
+    if client is None:
+        with _client_lock:
+            client = _clients.get(key)
+            if client is None:
+                openai = importlib.import_module("openai")
+                client = _clients[key] = openai.OpenAI(api_key=api_key)
+    return client
+
+
+def _prewarm(gemini_key: str, openai_key: str) -> None:
+    try:
+        http()
+        soup("<p></p>")
+        soup("<rss></rss>", "xml")
+    except Exception:
+        pass
+    if gemini_key:
+        try:
+            genai_client(gemini_key)
+            genai_types()
+        except Exception:
+            pass
+    if openai_key:
+        try:
+            openai_client(openai_key)
+        except Exception:
+            pass
+
+
+def prewarm(gemini_key: str = "", openai_key: str = "") -> bool:
+    """프로세스당 한 번만 예열 스레드를 띄운다. 새로 띄웠으면 True."""
+    global _prewarm_started
+    with _prewarm_lock:
+        if _prewarm_started:
+            return False
+        _prewarm_started = True
+    threading.Thread(target=_prewarm, args=(gemini_key, openai_key), name="news-prewarm", daemon=True).start()
+    return True
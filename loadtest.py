@@ -0,0 +1,182 @@
+"""
+수집 경로 부하 시험 — 모의 서버(mockserver)를 띄우고 대시보드 사용자 N명이 동시에 수집하는 상황을 재현
+- 사용자 1명의 수집 1회 = 앱의 '수집 시작' 경로와 같음: ItemStore.collect(모드의 전체 소스) → ItemStore.view(모드)
+  ItemStore 는 앱 프로세스처럼 모든 사용자가 공유 → TTL 캐시 · 소스 단위 single-flight · 서킷 브레이커가 그대로 동작
+- 결과: 종단 간 수집 시간 p50 / p95 / p99 / 최대, 모드별 평균 기사 수, 외부(모의 서버) 요청 수 — 호스트 · 상태 코드별
+- ratelimit · history · 본문 · 스냅샷 · 알림 파일은 임시 디렉터리에 만들어 실제 .cache 를 건드리지 않음
+- --base 로 이미 떠 있는 모의 서버를 쓸 수 있음 (그때 장애 옵션은 그 서버를 띄울 때 지정)
+
+    python -m loadtest --users 50 --rounds 3 --latency 0.3 --jitter 0.2 --error-rate 0.05 --throttle-rate 0.02
+    python -m loadtest --users 20 --store-ttl 0 --drip-rate 0.1 --drip-seconds 8   # 저장소 캐시 없이 느린 응답 섞기
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+
+import mockserver
+
+MOCK_API_KEYS = {"FINNHUB_API_KEY": "mock", "CRYPTOPANIC_API_KEY": "mock"}
+_ISOLATED = {
+    "NEWS_RATE_DB": "ratelimit.sqlite",
+    "NEWS_HISTORY_DB": "history.sqlite",
+    "NEWS_BODY_CACHE": "bodies",
+    "NEWS_SNAPSHOT_DIR": "snapshots",
+    "NEWS_REPORT_DIR": "reports",
+    "NEWS_WATCHLISTS_FILE": "watchlists.json",
+    "NEWS_ALERT_OUTBOX": "alerts.jsonl",
+}
+
+
+def percentile(values: list, p: float) -> float:
+    """nearest-rank 백분위수. 값이 없으면 0."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * p // 100))
+    return ordered[int(rank) - 1]
+
+
+def _server_stats(base: str) -> dict:
+    with urllib.request.urlopen(base + "/_stats", timeout=5) as r:
+        return json.loads(r.read())
+
+
+def _reset_server(base: str) -> None:
+    urllib.request.urlopen(base + "/_reset", timeout=5).close()
+
+
+def run(args) -> dict:
+    server = None
+    base = args.base.rstrip("/")
+    if not base:
+        server = mockserver.server_from_args(args, args.port).start()
+        base = server.base
+    # 수집 모듈은 import 시점에 환경 변수를 읽으므로 그 전에 설정
+    os.environ["NEWS_MOCK_BASE"] = base
+    tmp = tempfile.mkdtemp(prefix="news-load-")
+    for name, rel in _ISOLATED.items():
+        os.environ[name] = os.path.join(tmp, rel)
+
+    import health
+    import newscore
+    from itemstore import STORE_TTL, ItemStore
+
+    modes = ("stock", "coin") if args.mode == "both" else (args.mode,)
+    names = {mode: [src.name for src in newscore.SOURCES if src.mode == mode] for mode in modes}
+    store = ItemStore(ttl=STORE_TTL if args.store_ttl is None else args.store_ttl)
+    _reset_server(base)
+    samples, lock = [], threading.Lock()
+
+    def user(index: int) -> None:
+        rng = random.Random(index)
+        time.sleep(rng.uniform(0, args.ramp))
+        for round_no in range(args.rounds):
+            mode = modes[(index + round_no) % len(modes)]
+            started = time.perf_counter()
+            failed = 0
+            for _, items, err, _ in store.collect(newscore.build_tasks(names[mode], MOCK_API_KEYS)):
+                failed += err is not None or not items
+            # TTL 0(캐시 없음)으로 돌려도 방금 이 수집에서 들어온 결과는 보이도록
+            news, _ = store.view(mode, names[mode], ttl=max(store.ttl, time.perf_counter() - started + 1))
+            elapsed = time.perf_counter() - started
+            with lock:
+                samples.append((mode, elapsed, len(news), failed))
+            if args.think:
+                time.sleep(rng.uniform(0, args.think))
+
+    wall = time.perf_counter()
+    threads = [threading.Thread(target=user, args=(i,), name=f"user-{i}") for i in range(args.users)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - wall
+
+    outbound = server.stats() if server else _server_stats(base)
+    if server:
+        server.stop()
+    times = [elapsed for _, elapsed, _, _ in samples]
+    return {
+        "users": args.users,
+        "rounds": args.rounds,
+        "collections": len(samples),
+        "wall_s": round(wall, 2),
+        "latency_s": {
+            "p50": round(percentile(times, 50), 3),
+            "p95": round(percentile(times, 95), 3),
+            "p99": round(percentile(times, 99), 3),
+            "max": round(max(times, default=0.0), 3),
+        },
+        "items": {
+            mode: round(sum(n for m, _, n, _ in samples if m == mode) / max(1, sum(1 for m, *_ in samples if m == mode)), 1)
+            for mode in modes
+        },
+        "failed_sources": sum(failed for *_, failed in samples),
+        "outbound": outbound,
+        "outbound_per_collection": round(outbound["total"] / max(1, len(samples)), 2),
+        "flights": {"started": store.flights.started, "joined": store.flights.joined},
+        "open_circuits": {
+            host: state for host, state in health.breaker_states().items() if state.get("state") != "closed"
+        },
+    }
+
+
+def print_report(result: dict) -> None:
+    lat = result["latency_s"]
+    print(
+        f"수집 {result['collections']}회 (사용자 {result['users']} × {result['rounds']}) · 벽시계 {result['wall_s']}s"
+    )
+    print(f"종단 간 수집 시간(s): p50 {lat['p50']} · p95 {lat['p95']} · p99 {lat['p99']} · 최대 {lat['max']}")
+    print(
+        "평균 기사 수: "
+        + " · ".join(f"{mode} {n}" for mode, n in result["items"].items())
+        + f" · 비었거나 실패한 소스 {result['failed_sources']}건"
+    )
+    flights = result["flights"]
+    print(
+        f"외부 요청 {result['outbound']['total']}회 (수집당 {result['outbound_per_collection']}) · "
+        f"소스 수집 {flights['started']}회 · 진행 중 수집에 합류 {flights['joined']}회"
+    )
+    for host, statuses in result["outbound"]["hosts"].items():
+        print(f"  {host:<28} " + " ".join(f"{status}:{n}" for status, n in statuses.items()))
+    for host, state in result["open_circuits"].items():
+        print(f"  서킷 {state.get('state')}: {host} ({state.get('reason', '')})")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="loadtest", description="모의 서버를 상대로 한 수집 경로 부하 시험")
+    parser.add_argument("--users", type=int, default=20, help="동시 사용자 수")
+    parser.add_argument("--rounds", type=int, default=3, help="사용자당 수집 횟수")
+    parser.add_argument("--mode", choices=["stock", "coin", "both"], default="both")
+    parser.add_argument("--ramp", type=float, default=2.0, help="사용자 시작을 흩뿌리는 시간(초)")
+    parser.add_argument("--think", type=float, default=1.0, help="수집 사이 최대 대기(초)")
+    parser.add_argument("--store-ttl", type=float, default=None, help="공용 저장소 TTL(초), 0 이면 캐시 없이 매번 수집")
+    parser.add_argument("--base", default="", help="이미 떠 있는 모의 서버 주소 (없으면 직접 띄움)")
+    parser.add_argument("--port", type=int, default=0, help="직접 띄울 모의 서버 포트 (0 = 빈 포트)")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON 으로 출력")
+    mockserver.add_fault_arguments(parser)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    result = run(args)
+    if result["collections"] == 0:
+        print("수집이 한 번도 끝나지 않았습니다.", file=sys.stderr)
+        return 1
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+    else:
+        print_report(result)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,457 @@
+"""
+로컬 모의 뉴스 서버 — 타임아웃 · 동시성 · 캐시를 부하 속에서 확인하기 위한 대역
+- 앱 · CLI 를 NEWS_MOCK_BASE=http://127.0.0.1:8765 로 띄우면 모든 외부 요청이 https://host/path → /host/path 로 이 서버에 옴
+- 전체 소스(Finnhub · CryptoPanic · MKT News JSON, MNI · CoinDesk · cryptonews · coincarp HTML, feeds.json 의 RSS)의
+  응답 형식을 흉내 낸 픽스처를 만들어 줌. 제목 · 시각은 --rotate 초마다 바뀌고 소스끼리 같은 이야기가 겹침 (주제 묶기 확인용)
+- RSS 는 ETag 를 붙이고 If-None-Match 가 맞으면 304 → 조건부 요청 경로도 시험됨
+- --fixtures DIR 에 녹화한 응답(record 명령)이 있으면 그것을 우선 사용 (DIR/호스트/경로)
+- 장애 주입(요청마다 확률): 지연(--latency ± --jitter), 500(--error-rate), 429 + Retry-After(--throttle-rate),
+  본문을 조금씩 흘려보내는 느린 응답(--drip-rate, --drip-seconds), 연결 끊기(--down-rate)
+  호스트별로 덮어쓰기: --fault finnhub.io=throttle:1 --fault www.coindesk.com=latency:20
+- GET /_stats 는 호스트 · 상태 코드별 요청 수(JSON), GET /_reset 은 카운터 초기화
+
+    python -m mockserver --port 8765 --latency 0.3 --error-rate 0.05 --throttle-rate 0.02
+    python -m mockserver record ./fixtures        # 실제 소스 응답을 녹화 (API 키는 환경 변수)
+"""
+
+import argparse
+import collections
+import email.utils
+import hashlib
+import http.server
+import json
+import os
+import random
+import sys
+import threading
+import time
+import urllib.parse
+
+DEFAULT_PORT = 8765
+ITEMS_PER_PAGE = 30
+
+Faults = collections.namedtuple(
+    "Faults",
+    "latency jitter error throttle drip drip_seconds down retry_after",
+    defaults=(0.0, 0.0, 0.0, 0.0, 0.0, 5.0, 0.0, 30),
+)
+FAULT_KINDS = {
+    "latency": "latency",
+    "jitter": "jitter",
+    "error": "error",
+    "throttle": "throttle",
+    "drip": "drip",
+    "drip-seconds": "drip_seconds",
+    "down": "down",
+}
+
+_SUBJECTS = (
+    "Nvidia|Apple|Tesla|Microsoft|Amazon|The Fed|Treasury yields|Oil prices|S&P 500 futures|Nasdaq|Bitcoin|Ethereum|"
+    "Solana|XRP|Coinbase|BlackRock's bitcoin ETF|Stablecoin issuers|Binance|MicroStrategy|Dogecoin"
+).split("|")
+_EVENTS = (
+    "jumps after earnings beat|slides as investors weigh guidance|hits record high|faces fresh SEC scrutiny|"
+    "draws heavy ETF inflows|extends rally on rate-cut bets|falls amid tariff worries|rebounds after selloff|"
+    "braces for jobs report|steadies ahead of inflation data"
+).split("|")
+_OUTLETS = ("Reuters", "CNBC", "Bloomberg", "MarketWatch", "Barron's", "Yahoo")
+_COIN_OUTLETS = ("decrypt.co", "theblock.co", "cointelegraph.com", "beincrypto.com", "u.today")
+
+
+# ── 픽스처 ────────────────────────────────────────
+def _stories(host: str, path: str, bucket: int, n: int = ITEMS_PER_PAGE) -> list:
+    """(제목, 슬러그, epoch) n건. 주기(bucket)마다 공용 이야기 풀이 바뀌고, 소스마다 그 풀에서 일부를 골라 겹치게 한다."""
+    shared = random.Random(bucket)
+    pool = [f"{shared.choice(_SUBJECTS)} {shared.choice(_EVENTS)}" for _ in range(n * 2)]
+    rng = random.Random(f"{host}{path}{bucket}")
+    now = time.time()
+    stories = []
+    for i, title in enumerate(rng.sample(pool, n)):
+        title = f"{title} ({rng.choice(_OUTLETS)} #{bucket % 1000}-{i})"
+        slug = "n" + hashlib.md5(title.encode()).hexdigest()[:11]  # 글자로 시작 (cryptonews.com 기사 주소 형식)
+        stories.append((title, slug, now - rng.random() * 6 * 3600))
+    return sorted(stories, key=lambda s: -s[2])
+
+
+def _iso(ts: float) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(ts))
+
+
+def _html(body: str) -> tuple:
+    page = f"<!doctype html><html><head><title>mock</title></head><body>{body}</body></html>"
+    return page.encode(), "text/html; charset=utf-8"
+
+
+def _finnhub(stories, rng) -> tuple:
+    data = [
+        {
+            "id": int(slug[1:9], 16),
+            "datetime": int(ts),
+            "headline": title,
+            "source": rng.choice(_OUTLETS),
+            "summary": f"{title}. Analysts said the move reflected positioning into the close.",
+            "url": f"https://www.reuters.com/markets/{slug}/",
+        }
+        for title, slug, ts in stories
+    ]
+    return json.dumps(data).encode(), "application/json"
+
+
+def _mktnews(stories, rng) -> tuple:
+    data = [
+        {"id": slug, "time": _iso(ts), "data": {"title": title, "content": f"{title} — flash"}}
+        for title, slug, ts in stories
+    ]
+    return json.dumps(data).encode(), "application/json"
+
+
+def _cryptopanic(stories, rng) -> tuple:
+    results = [
+        {
+            "id": int(slug[1:7], 16),
+            "slug": slug,
+            "title": title,
+            "published_at": _iso(ts),
+            "original_url": f"https://{rng.choice(_COIN_OUTLETS)}/news/{slug}",
+            "description": f"{title}.",
+        }
+        for title, slug, ts in stories
+    ]
+    return json.dumps({"count": len(results), "next": None, "results": results}).encode(), "application/json"
+
+
+def _mni(stories, rng) -> tuple:
+    links = "".join(f'<li><a href="/articles/{slug}">{title}</a></li>' for title, slug, _ in stories)
+    return _html(f"<ul>{links}</ul>")
+
+
+def _coindesk(stories, rng) -> tuple:
+    section = ("markets", "business", "tech", "policy")
+    return _html(
+        "".join(
+            f'<div class="card"><time datetime="{_iso(ts)}"></time>'
+            f'<a href="/{rng.choice(section)}/{slug}">{title}</a></div>'
+            for title, slug, ts in stories
+        )
+    )
+
+
+def _cryptonews_net(stories, rng) -> tuple:
+    return _html(
+        "".join(
+            f'<div class="news-item"><a href="/news/{slug}/"><h3 class="news-item__title">{title}</h3></a>'
+            f'<time datetime="{_iso(ts)}"></time>'
+            f'<span class="news-item__source">{rng.choice(_COIN_OUTLETS)}</span></div>'
+            for title, slug, ts in stories
+        )
+    )
+
+
+def _coincarp(stories, rng) -> tuple:
+    now = time.time()
+    return _html(
+        "".join(
+            f'<a href="https://{rng.choice(_COIN_OUTLETS)}/{slug}">{max(1, int((now - ts) // 60))} mins ago{title}</a>'
+            for title, slug, ts in stories
+        )
+    )
+
+
+def _cryptonews_com(stories, rng) -> tuple:
+    return _html(
+        "".join(
+            f'<div><time datetime="{_iso(ts)}"></time><a href="/news/{slug}/">{title}</a></div>'
+            for title, slug, ts in stories
+        )
+    )
+
+
+def _rss(stories, rng, host="") -> tuple:
+    items = "".join(
+        f"<item><title><![CDATA[{title}]]></title><link>https://{host}/story/{slug}</link>"
+        f"<pubDate>{email.utils.formatdate(ts, usegmt=True)}</pubDate>"
+        f"<description>&lt;p&gt;{title}.&lt;/p&gt;</description></item>"
+        for title, slug, ts in stories
+    )
+    channel = f"<channel><title>{host}</title>{items}</channel>"
+    body = f'<?xml version="1.0" encoding="UTF-8"?><rss version="2.0">{channel}</rss>'
+    return body.encode(), "application/rss+xml; charset=utf-8"
+
+
+def _article(stories, rng) -> tuple:
+    title = stories[0][0]
+    paragraphs = "".join(
+        f"<p>{t}. Traders and analysts weighed the implications for the week ahead.</p>" for t, _, _ in stories[:6]
+    )
+    return _html(f"<article><h1>{title}</h1>{paragraphs}</article>")
+
+
+FIXTURES = {
+    "finnhub.io": _finnhub,
+    "static.mktnews.net": _mktnews,
+    "cryptopanic.com": _cryptopanic,
+    "www.mnimarkets.com": _mni,
+    "www.coindesk.com": _coindesk,
+    "cryptonews.net": _cryptonews_net,
+    "www.coincarp.com": _coincarp,
+    "cryptonews.com": _cryptonews_com,
+}
+_FEED_HINTS = ("rss", "feed", "xml", "atom")
+
+
+def _recorded_path(root: str, host: str, path: str) -> str:
+    return os.path.join(root, host, path.strip("/").replace("/", "__") or "index")
+
+
+def _sniff_type(body: bytes) -> str:
+    head = body[:200].lstrip()
+    if head[:1] in (b"{", b"["):
+        return "application/json"
+    if head.startswith(b"<?xml") or b"<rss" in head or b"<feed" in head:
+        return "application/xml"
+    return "text/html; charset=utf-8"
+
+
+def render(host: str, path: str, rotate: float = 60.0, fixtures_dir: str = "") -> tuple:
+    """(본문, Content-Type). 녹화본이 있으면 그것, 없으면 호스트별 형식으로 생성 (모르는 호스트는 RSS 또는 기사 본문)."""
+    if fixtures_dir:
+        recorded = _recorded_path(fixtures_dir, host, path)
+        if os.path.isfile(recorded):
+            with open(recorded, "rb") as f:
+                body = f.read()
+            return body, _sniff_type(body)
+    bucket = int(time.time() // rotate) if rotate > 0 else 0
+    stories = _stories(host, path, bucket)
+    rng = random.Random(f"{host}{path}{bucket}:meta")
+    if host in FIXTURES:
+        return FIXTURES[host](stories, rng)
+    if any(hint in (host + path).lower() for hint in _FEED_HINTS):
+        return _rss(stories, rng, host)
+    return _article(stories, rng)
+
+
+# ── 서버 ─────────────────────────────────────────
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # requests 세션의 keep-alive 를 그대로 쓰도록
+
+    def log_message(self, fmt, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        mock = self.server.mock
+        parts = urllib.parse.urlsplit(self.path)
+        if parts.path == "/_stats":
+            return self._send(200, json.dumps(mock.stats()).encode(), "application/json", count=False)
+        if parts.path == "/_reset":
+            mock.reset()
+            return self._send(200, b"{}", "application/json", count=False)
+        host, _, path = parts.path.lstrip("/").partition("/")
+        self.host = host
+        faults = mock.faults_for(host)
+        rng = random.Random()
+        delay = faults.latency + (rng.uniform(-faults.jitter, faults.jitter) if faults.jitter else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+        if rng.random() < faults.down:
+            mock.count(host, "down")
+            self.close_connection = True
+            return
+        if rng.random() < faults.error:
+            return self._send(500, b"mock error", "text/plain")
+        if rng.random() < faults.throttle:
+            return self._send(429, b"rate limited", "text/plain", {"Retry-After": str(faults.retry_after)})
+        body, ctype = render(host, "/" + path, mock.rotate, mock.fixtures_dir)
+        etag = '"' + hashlib.md5(body).hexdigest()[:16] + '"'
+        if self.headers.get("If-None-Match") == etag:
+            return self._send(304, b"", ctype, {"ETag": etag})
+        drip = faults.drip_seconds if rng.random() < faults.drip else 0.0
+        self._send(200, body, ctype, {"ETag": etag}, drip=drip)
+
+    def _send(self, status: int, body: bytes, ctype: str, headers=None, drip: float = 0.0, count: bool = True) -> None:
+        if count:
+            self.server.mock.count(getattr(self, "host", ""), "drip" if drip else status)
+        self.send_response(status)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        try:
+            if not drip or not body:
+                self.wfile.write(body)
+                return
+            # 느린 응답: 헤더는 바로, 본문은 drip 초에 걸쳐 조금씩 (읽기 타임아웃 · 전체 소요 시간 확인용)
+            chunks = max(1, min(50, len(body) // 64))
+            size = -(-len(body) // chunks)
+            for i in range(0, len(body), size):
+                self.wfile.write(body[i : i + size])
+                self.wfile.flush()
+                time.sleep(drip / chunks)
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+
+
+class MockServer:
+    def __init__(
+        self,
+        port: int = DEFAULT_PORT,
+        faults: Faults = Faults(),
+        host_faults=None,
+        rotate: float = 60.0,
+        fixtures_dir: str = "",
+    ):
+        self.faults = faults
+        self.host_faults = dict(host_faults or {})
+        self.rotate = rotate
+        self.fixtures_dir = fixtures_dir
+        self._counts = collections.Counter()
+        self._lock = threading.Lock()
+        self.httpd = http.server.ThreadingHTTPServer(("127.0.0.1", port), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.mock = self
+        self._thread = None
+
+    @property
+    def base(self) -> str:
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def faults_for(self, host: str) -> Faults:
+        return self.host_faults.get(host, self.faults)
+
+    def count(self, host: str, status) -> None:
+        with self._lock:
+            self._counts[(host, str(status))] += 1
+
+    def stats(self) -> dict:
+        """{"total": n, "hosts": {호스트: {상태: n}}}. 상태에는 down · drip 도 포함."""
+        with self._lock:
+            counts = dict(self._counts)
+        hosts = {}
+        for (host, status), n in sorted(counts.items()):
+            hosts.setdefault(host, {})[status] = n
+        return {"total": sum(counts.values()), "hosts": hosts}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts.clear()
+
+    def start(self) -> "MockServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="mock-news-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def parse_fault(spec: str, base: Faults) -> tuple:
+    """'finnhub.io=throttle:1,latency:2' → (호스트, Faults)."""
+    host, _, rules = spec.partition("=")
+    faults = base
+    for rule in rules.split(","):
+        kind, _, value = rule.partition(":")
+        if kind not in FAULT_KINDS:
+            raise ValueError(f"알 수 없는 장애 종류: {kind} (가능: {', '.join(FAULT_KINDS)})")
+        faults = faults._replace(**{FAULT_KINDS[kind]: float(value or 1)})
+    return host.strip(), faults
+
+
+def add_fault_arguments(parser: argparse.ArgumentParser) -> None:
+    """모의 서버 옵션 (loadtest 도 같은 옵션을 씀)."""
+    parser.add_argument("--latency", type=float, default=0.0, help="응답 전 지연(초)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="지연 ± 흔들림(초)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="HTTP 500 확률")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="HTTP 429 확률")
+    parser.add_argument("--drip-rate", type=float, default=0.0, help="본문을 천천히 흘려보낼 확률")
+    parser.add_argument("--drip-seconds", type=float, default=5.0, help="느린 응답 본문 전송 시간(초)")
+    parser.add_argument("--down-rate", type=float, default=0.0, help="응답 없이 연결을 끊을 확률")
+    parser.add_argument("--fault", action="append", default=[], metavar="HOST=KIND:VALUE,...", help="호스트별 장애 설정")
+    parser.add_argument("--rotate", type=float, default=60.0, help="픽스처 기사가 바뀌는 주기(초), 0 이면 고정")
+    parser.add_argument("--fixtures", default="", help="녹화한 응답 디렉터리 (record 명령으로 생성)")
+
+
+def server_from_args(args, port: int = DEFAULT_PORT) -> MockServer:
+    faults = Faults(
+        latency=args.latency,
+        jitter=args.jitter,
+        error=args.error_rate,
+        throttle=args.throttle_rate,
+        drip=args.drip_rate,
+        drip_seconds=args.drip_seconds,
+        down=args.down_rate,
+    )
+    host_faults = dict(parse_fault(spec, faults) for spec in args.fault)
+    return MockServer(port, faults, host_faults, args.rotate, args.fixtures)
+
+
+# ── 녹화 ─────────────────────────────────────────
+RECORD_URLS = (
+    "https://finnhub.io/api/v1/news?category=general&token={FINNHUB_API_KEY}",
+    "https://static.mktnews.net/json/flash/en.json",
+    "https://www.mnimarkets.com/articles",
+    "https://cryptopanic.com/api/developer/v2/posts/?public=true&kind=news&regions=en&auth_token={CRYPTOPANIC_API_KEY}",
+    "https://www.coindesk.com/latest-crypto-news",
+    "https://cryptonews.net/news/bitcoin/",
+    "https://cryptonews.net/news/ethereum/",
+    "https://cryptonews.net/",
+    "https://www.coincarp.com/news/bitcoin/",
+    "https://www.coincarp.com/news/ethereum/",
+    "https://www.coincarp.com/news/",
+    "https://cryptonews.com/news/",
+    "https://cryptonews.com/news/bitcoin-news/",
+    "https://cryptonews.com/news/ethereum-news/",
+)
+
+
+def record(root: str) -> int:
+    """실제 소스 응답을 root/호스트/경로 로 저장하고 저장한 건수를 돌려준다 (feeds.json 피드 포함)."""
+    import feeds
+    import lazydeps
+    from newscore import HEADERS
+
+    keys = {name: os.getenv(name, "") for name in ("FINNHUB_API_KEY", "CRYPTOPANIC_API_KEY")}
+    urls = [url.format(**keys) for url in RECORD_URLS if all(keys[k] for k in keys if "{" + k + "}" in url)]
+    urls += [url for feed in feeds.load() for url in feed.urls]
+    saved = 0
+    for url in urls:
+        parts = urllib.parse.urlsplit(url)
+        try:
+            r = lazydeps.http().get(url, headers=HEADERS, timeout=20)
+        except Exception as e:
+            print(f"실패: {parts.netloc}{parts.path} ({type(e).__name__})", file=sys.stderr)
+            continue
+        if r.status_code != 200:
+            print(f"실패: {parts.netloc}{parts.path} (HTTP {r.status_code})", file=sys.stderr)
+            continue
+        path = _recorded_path(root, parts.netloc, parts.path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(r.content)
+        saved += 1
+    return saved
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["record"]:
+        if len(argv) < 2:
+            print("녹화할 디렉터리를 지정하세요.", file=sys.stderr)
+            return 2
+        print(f"{record(argv[1])}개 응답 저장 → {argv[1]}", file=sys.stderr)
+        return 0
+    parser = argparse.ArgumentParser(prog="mockserver", description="부하 · 장애 주입 시험용 모의 뉴스 서버")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    add_fault_arguments(parser)
+    args = parser.parse_args(argv)
+    server = server_from_args(args, args.port)
+    print(f"모의 서버 {server.base} — 앱은 NEWS_MOCK_BASE={server.base} 로 실행", file=sys.stderr)
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
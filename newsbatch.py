@@ -0,0 +1,107 @@
+"""
+뉴스 수집 결과의 컬럼형(columnar) 배치
+- published_at → epoch 초(float64, 없거나 파싱 불가면 NaN)
+- source → 정수 id (배치별 소스 어휘), 제목 → 64bit 해시 키
+- 최신성 필터 · 안정 정렬 · 해시 기반 중복 제거를 NumPy 벡터 연산으로 처리
+"""
+
+import datetime
+import hashlib
+import re
+
+import numpy as np
+
+from normalize import item_epoch
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]")
+
+
+def dedup_key(title: str) -> str:
+    return _NON_ALNUM.sub("", (title or "").lower())[:60]
+
+
+def title_digest(title: str) -> bytes:
+    return hashlib.blake2b(dedup_key(title).encode(), digest_size=8).digest()
+
+
+def recent_cutoff(date_str: str) -> float:
+    """is_recent 와 같은 기준: published_at 날짜(UTC)가 date_str 이상이면 최신."""
+    dt = datetime.datetime.strptime(date_str, "%Y-%m-%d").replace(tzinfo=datetime.timezone.utc)
+    return dt.timestamp()
+
+
+class NewsBatch:
+    __slots__ = ("items", "ts", "source_ids", "keys", "sources")
+
+    def __init__(self, items, ts, source_ids, keys, sources):
+        self.items = items  # object ndarray (dict)
+        self.ts = ts  # float64, NaN = 시각 없음
+        self.source_ids = source_ids  # int32 → sources[id]
+        self.keys = keys  # uint64 제목 해시
+        self.sources = sources  # list[str]
+
+    @classmethod
+    def from_items(cls, news_list) -> "NewsBatch":
+        news_list = list(news_list)
+        n = len(news_list)
+        items = np.empty(n, dtype=object)
+        items[:] = news_list
+        ts = np.fromiter((item_epoch(item) for item in news_list), dtype=np.float64, count=n)
+        vocab: dict = {}
+        source_ids = np.fromiter(
+            (vocab.setdefault(item.get("source", ""), len(vocab)) for item in news_list),
+            dtype=np.int32,
+            count=n,
+        )
+        keys = np.frombuffer(b"".join(title_digest(item.get("title", "")) for item in news_list), dtype="<u8")
+        return cls(items, ts, source_ids, keys.astype(np.uint64), list(vocab))
+
+    @classmethod
+    def concat(cls, batches) -> "NewsBatch":
+        batches = [b for b in batches if len(b)]
+        if not batches:
+            return cls.from_items([])
+        vocab: dict = {}
+        remapped = []
+        for b in batches:
+            lookup = np.array([vocab.setdefault(s, len(vocab)) for s in b.sources], dtype=np.int32)
+            remapped.append(lookup[b.source_ids])
+        return cls(
+            np.concatenate([b.items for b in batches]),
+            np.concatenate([b.ts for b in batches]),
+            np.concatenate(remapped),
+            np.concatenate([b.keys for b in batches]),
+            list(vocab),
+        )
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def take(self, idx) -> "NewsBatch":
+        return NewsBatch(self.items[idx], self.ts[idx], self.source_ids[idx], self.keys[idx], self.sources)
+
+    def recent_mask(self, cutoff: float):
+        return np.isnan(self.ts) | (self.ts >= cutoff)
+
+    def filter_recent(self, cutoff: float) -> "NewsBatch":
+        return self.take(self.recent_mask(cutoff))
+
+    def dedup(self) -> "NewsBatch":
+        """제목 해시 기준 중복 제거 — 먼저 들어온 항목을 남기고 원래 순서 유지."""
+        if not len(self):
+            return self
+        _, first = np.unique(self.keys, return_index=True)
+        first.sort()
+        return self.take(first)
+
+    def sort_desc(self) -> "NewsBatch":
+        """최신순 안정 정렬. 시각이 없는 항목은 입력 순서대로 맨 뒤."""
+        order = np.argsort(-self.ts, kind="stable")
+        return self.take(order)
+
+    def source_counts(self) -> dict:
+        counts = np.bincount(self.source_ids, minlength=len(self.sources))
+        return {src: int(c) for src, c in zip(self.sources, counts) if c}
+
+    def to_items(self) -> list:
+        return self.items.tolist()
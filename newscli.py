@@ -0,0 +1,179 @@
+"""
+헤드리스 수집 · 요약 CLI (Streamlit 없이 실행)
+- cron 등으로 미리 리포트를 만들어 둘 때 사용
+
+    python -m newscli collect --mode stock --ai gemini --out report.json
+    python -m newscli collect --mode coin --ai none --out report.md
+    python -m newscli collect --mode stock --ai gemini --save      # 앱이 열 때 바로 쓰는 저장소에 기록
+    python -m newscli schedule --at 21:00,06:30 --ai gemini       # KST 지정 시각마다 두 모드 사전 생성
+    python -m newscli feeds list                                  # feeds.json 피드 목록
+    python -m newscli feeds import subscriptions.opml --mode stock # OPML 구독 목록을 feeds.json 에 추가
+    python -m newscli watch add 반도체 "NVDA, AMD, rate cut" --outbox  # 관심 목록 알림 (outbox 파일에도 기록)
+"""
+
+import argparse
+import json
+import os
+import sys
+
+import alerts
+import feeds
+import reports
+from newscore import AI_ALIASES, SOURCES, collect_report, report_to_markdown
+
+API_KEY_NAMES = ("FINNHUB_API_KEY", "CRYPTOPANIC_API_KEY", "OPENAI_API_KEY", "GEMINI_API_KEY")
+
+
+def api_keys_from_env() -> dict:
+    try:
+        from dotenv import load_dotenv
+
+        load_dotenv()
+    except ImportError:
+        pass
+    return {key: os.getenv(key, "") for key in API_KEY_NAMES}
+
+
+def write_report(report: dict, out: str) -> None:
+    if out.endswith(".md"):
+        text = report_to_markdown(report)
+    else:
+        text = json.dumps(report, ensure_ascii=False, indent=2)
+    if out == "-":
+        sys.stdout.write(text + "\n")
+        return
+    if os.path.exists(out) and not os.path.isfile(out):
+        # /dev/stdout 같은 특수 파일은 그대로 쓴다
+        with open(out, "w", encoding="utf-8") as f:
+            f.write(text)
+        return
+    tmp = out + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, out)
+
+
+def cmd_collect(args) -> int:
+    names = [n.strip() for n in args.sources.split(",")] if args.sources else None
+    valid = {src.name for src in SOURCES if src.mode == args.mode}
+    unknown = [n for n in names or [] if n not in valid]
+    if unknown:
+        print(f"알 수 없는 소스: {', '.join(unknown)} (가능: {', '.join(sorted(valid))})", file=sys.stderr)
+        return 2
+
+    def warn(msg):
+        print(f"경고: {msg}", file=sys.stderr)
+
+    report = collect_report(
+        args.mode, api_keys_from_env(), AI_ALIASES[args.ai], names, warn=warn, enrich_top=args.enrich
+    )
+    write_report(report, args.out)
+    if args.save:
+        reports.save_report(report)
+    print(
+        f"{args.mode}: {len(report['items'])}건, 수집 {report['timings']['collect_s']}s, "
+        f"요약 {report['timings']['summary_s']}s → {args.out}",
+        file=sys.stderr,
+    )
+    return 0
+
+
+def cmd_schedule(args) -> int:
+    def warn(msg):
+        print(f"경고: {msg}", file=sys.stderr)
+
+    api_keys = api_keys_from_env()
+    provider = AI_ALIASES[args.ai]
+    if args.now:
+        for path in reports.generate(api_keys, provider, warn=warn, enrich_top=args.enrich):
+            print(f"생성: {path}", file=sys.stderr)
+    scheduler = reports.ReportScheduler(api_keys, provider, args.at, warn=warn, enrich_top=args.enrich)
+    print(f"사전 생성 시각(KST): {args.at} → {reports.REPORT_DIR}", file=sys.stderr)
+    try:
+        scheduler.run_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def cmd_feeds(args) -> int:
+    if args.action == "import":
+        if not args.opml:
+            print("가져올 OPML 파일을 지정하세요.", file=sys.stderr)
+            return 2
+        added = feeds.import_opml(args.opml, args.mode, args.group)
+        print(f"{added}개 피드 추가 → {feeds.FEEDS_FILE}", file=sys.stderr)
+        return 0
+    try:
+        loaded = feeds.load(strict=True)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+    for feed in loaded:
+        extra = f" · ttl {feed.ttl:g}s" if feed.ttl else ""
+        print(f"{feed.mode}\t{feed.group or '-'}\t{feed.name}\t{' | '.join(feed.urls)}\t{feed.timeout:g}s{extra}")
+    return 0
+
+
+def cmd_watch(args) -> int:
+    book = alerts.book()
+    if args.action == "add":
+        try:
+            wl = book.save_watchlist(args.name or "", alerts.parse_terms(args.terms or ""), args.outbox)
+        except ValueError as e:
+            print(e, file=sys.stderr)
+            return 2
+        print(f"저장: {wl.name} ({', '.join(wl.terms)}) → {book.path}", file=sys.stderr)
+        return 0
+    if args.action == "rm":
+        if not book.remove_watchlist(args.name or ""):
+            print(f"없는 목록: {args.name}", file=sys.stderr)
+            return 2
+        return 0
+    for wl in book.watchlists():
+        print(f"{wl.name}\t{', '.join(wl.terms)}" + ("\toutbox" if wl.outbox else ""))
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="newscli", description="주식·코인 뉴스 헤드리스 수집기")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("collect", help="뉴스를 수집하고 (선택) AI 요약까지 만들어 저장")
+    p.add_argument("--mode", choices=["stock", "coin"], default="stock")
+    p.add_argument("--ai", choices=list(AI_ALIASES), default="none")
+    p.add_argument("--sources", default="", help="쉼표로 구분한 소스 이름 (기본: 모드의 전체 소스)")
+    p.add_argument("--out", default="-", help="출력 파일 (.json 또는 .md, '-' 는 stdout JSON)")
+    p.add_argument("--save", action="store_true", help="앱이 여는 사전 생성 리포트 저장소에도 기록")
+    p.add_argument("--enrich", type=int, default=0, metavar="N", help="요약 전에 상위 N개 주제 대표 기사 본문을 가져옴")
+    p.set_defaults(func=cmd_collect)
+
+    p = sub.add_parser("schedule", help="KST 지정 시각마다 주식·코인 리포트를 사전 생성 (포그라운드 실행)")
+    p.add_argument("--at", default=reports.DEFAULT_TIMES, help="KST HH:MM 목록 (쉼표 구분)")
+    p.add_argument("--ai", choices=list(AI_ALIASES), default="none")
+    p.add_argument("--now", action="store_true", help="시작하자마자 한 번 생성")
+    p.add_argument("--enrich", type=int, default=0, metavar="N", help="요약 전에 상위 N개 주제 대표 기사 본문을 가져옴")
+    p.set_defaults(func=cmd_schedule)
+
+    p = sub.add_parser("feeds", help="RSS 피드 설정(feeds.json) 보기 · OPML 가져오기")
+    p.add_argument("action", choices=["list", "import"])
+    p.add_argument("opml", nargs="?", help="import 할 OPML 파일")
+    p.add_argument("--mode", choices=["stock", "coin"], default="stock")
+    p.add_argument("--group", default="", help="피드를 묶을 사이드바 그룹 (기본: OPML 의 상위 outline 이름)")
+    p.set_defaults(func=cmd_feeds)
+
+    p = sub.add_parser("watch", help="관심 목록 알림 보기 · 추가 · 삭제")
+    p.add_argument("action", choices=["list", "add", "rm"])
+    p.add_argument("name", nargs="?", help="목록 이름")
+    p.add_argument("terms", nargs="?", help="티커 · 코인 · 키워드 (쉼표 구분)")
+    p.add_argument("--outbox", action="store_true", help=f"알림을 {alerts.OUTBOX_FILE} 에도 기록")
+    p.set_defaults(func=cmd_watch)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,910 @@
+"""
+주식·코인 뉴스 수집 코어 (Streamlit 비의존)
+- 공통 유틸 · 스크래퍼 · 프롬프트 · AI 요약
+- 앱 스크립트는 rerun 마다 다시 실행되지만 이 모듈은 프로세스당 한 번만 로드됨
+- requests / bs4 / AI SDK 는 lazydeps 를 통해 실제 수집·요약 시점에 로드
+"""
+
+import collections
+import concurrent.futures
+import datetime
+import html
+import os
+import re
+import time
+import urllib.parse
+
+import alerts
+import enrich
+import feeds
+import health
+import history
+import lazydeps
+import normalize
+import parsepool
+import ranking
+import ratelimit
+from htmltext import html_to_text
+from newsbatch import NewsBatch, recent_cutoff
+from normalize import AGO_PREFIX, clean_text, epoch_to_iso, item_kst, relative_age, rss_time, url_domain
+from topics import build_topic_text
+
+HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+    ),
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+
+# ── HTTP (호스트별 서킷 브레이커 경유) ────────────
+# 부하 · 장애 주입 시험: 모든 외부 요청을 모의 서버(mockserver)로 돌림. 예) NEWS_MOCK_BASE=http://127.0.0.1:8765
+MOCK_BASE = os.getenv("NEWS_MOCK_BASE", "").rstrip("/")
+
+
+def request_url(url: str) -> str:
+    """MOCK_BASE 가 있으면 https://host/path?q → {MOCK_BASE}/host/path?q. 서킷 브레이커는 원래 호스트 기준 그대로."""
+    if not MOCK_BASE:
+        return url
+    parts = urllib.parse.urlsplit(url)
+    return f"{MOCK_BASE}/{parts.netloc}{parts.path or '/'}" + (f"?{parts.query}" if parts.query else "")
+
+
+def http_get(url: str, **kwargs):
+    """차단(open) 중인 호스트는 요청 없이 CircuitOpen 으로 즉시 실패."""
+    host = urllib.parse.urlsplit(url).netloc
+    br = health.breaker(host)
+    if not br.allow(time.time()):
+        err = health.CircuitOpen(host, br.reason, br.retry_in(time.time()))
+        health.note_error(f"차단 중 ({br.reason})")
+        raise err
+    try:
+        r = lazydeps.http().get(request_url(url), **kwargs)
+    except Exception as e:
+        br.failure(type(e).__name__, time.time())
+        health.note_error(type(e).__name__)
+        raise
+    if r.status_code in (403, 429) or r.status_code >= 500:
+        reason = f"HTTP {r.status_code}"
+        br.failure(reason, time.time(), health.parse_retry_after(r.headers.get("Retry-After")))
+        health.note_error(reason)
+    else:
+        br.success()
+        if r.status_code >= 400:
+            health.note_error(f"HTTP {r.status_code}")
+    return r
+
+
+HEDGE_DELAY = 2.0  # 앞 요청이 이 시간 안에 답하지 않으면 다음 주소도 함께 요청
+_hedge_pool = concurrent.futures.ThreadPoolExecutor(max_workers=8, thread_name_prefix="news-hedge")
+_hedge_winners: dict = {}  # 키 → 마지막으로 이긴 URL
+
+
+def _close(fut) -> None:
+    try:
+        fut.result().close()
+    except Exception:
+        pass
+
+
+def hedged_get(urls: list, key: str = "", ok=None, hedge_delay: float = HEDGE_DELAY, **kwargs):
+    """같은 내용을 주는 여러 주소 중 먼저 좋은 응답(기본: 200)을 준 것을 돌려준다.
+    지난번에 이긴 주소부터 요청하고, 실패하거나 hedge_delay 안에 답이 없으면 다음 주소를 추가로 띄운다.
+    진 요청은 기다리지 않고 끝나는 대로 닫는다. 모두 실패하면 마지막 응답, 응답이 하나도 없으면 마지막 예외."""
+    if len(urls) == 1:
+        return http_get(urls[0], **kwargs)
+    key = key or urls[0]
+    ok = ok or (lambda r: r.status_code == 200)
+    queue = sorted(urls, key=lambda url: url != _hedge_winners.get(key))
+    kwargs.setdefault("stream", True)  # 본문은 이긴 응답만 읽음
+    pending = {}
+    winner, last_resp, last_err = None, None, None
+
+    def launch() -> None:
+        url = queue.pop(0)
+        pending[_hedge_pool.submit(http_get, url, **kwargs)] = url
+
+    launch()
+    while pending and winner is None:
+        done, _ = concurrent.futures.wait(
+            pending, timeout=hedge_delay if queue else None, return_when=concurrent.futures.FIRST_COMPLETED
+        )
+        for fut in done:
+            url = pending.pop(fut)
+            try:
+                r = fut.result()
+            except Exception as e:
+                last_err = e
+                continue
+            if winner is not None:
+                r.close()
+                continue
+            if ok(r):
+                winner = url
+                _hedge_winners[key] = url
+            if last_resp is not None:
+                last_resp.close()
+            last_resp = r
+        if winner is None and queue:
+            launch()  # 시간 초과 또는 실패 → 다음 주소
+    for fut in pending:
+        fut.add_done_callback(_close)
+    if winner is None:
+        # 요청은 풀 스레드에서 돌았으므로 소스 오류 기록은 여기서 한 번
+        if last_resp is not None:
+            health.note_error(f"HTTP {last_resp.status_code}")
+        elif last_err is not None:
+            health.note_error(str(last_err) or type(last_err).__name__)
+            raise last_err
+    return last_resp
+
+
+# ── 날짜 ─────────────────────────────────────────
+def utc_now() -> datetime.datetime:
+    return datetime.datetime.utcnow()
+
+
+def kst_now() -> datetime.datetime:
+    return utc_now() + datetime.timedelta(hours=9)
+
+
+def today_str() -> str:
+    return kst_now().strftime("%Y-%m-%d")
+
+
+def yesterday_str() -> str:
+    return (kst_now() - datetime.timedelta(days=1)).strftime("%Y-%m-%d")
+
+
+# ── 공통 유틸 ────────────────────────────────────
+def make_item(title, url="", source="", published_at="", description="", published_ts=None, desc_limit=None):
+    """기사 dict. description 의 HTML 은 여기서 한 번만 텍스트로 바꾸고, desc_limit 를 주면 정리된 글자 수로 자른다."""
+    desc = html_to_text(description)[:desc_limit].rstrip() if description else ""
+    return {
+        "title": clean_text(title),
+        "url": url,
+        "source": source,
+        "published_at": published_at,
+        "published_ts": published_ts if published_ts is not None else normalize.published_ts(published_at),
+        "description": desc,
+    }
+
+
+def is_recent(pub: str) -> bool:
+    if not pub:
+        return True
+    return pub[:10] >= yesterday_str()
+
+
+def dedup(news_list: list) -> list:
+    return NewsBatch.from_items(news_list).dedup().to_items()
+
+
+# ── AI 요약 (프롬프트 인자로 주식/코인 구분) ──────
+def summarize_gemini(
+    news_list: list, api_key: str, prompt_quick: str, prompt_deep: str, warn=print, bodies=None, watch=None, mode=""
+) -> tuple:
+    try:
+        client = lazydeps.genai_client(api_key)
+        types = lazydeps.genai_types()
+    except ImportError:
+        warn("google-genai 패키지가 없습니다.")
+        return "", ""
+
+    content = build_topic_text(news_list, 60, bodies=bodies, groups=ranking.rank_topics(news_list, watch, mode))
+    date = today_str()
+
+    def _extract(resp):
+        if resp.text is not None:
+            return resp.text
+        try:
+            return resp.candidates[0].content.parts[0].text or ""
+        except Exception:
+            return ""
+
+    quick, deep = "", ""
+    try:
+        resp = client.models.generate_content(
+            model="gemini-2.5-pro",
+            contents=prompt_quick.format(date=date, content=content),
+            config=types.GenerateContentConfig(temperature=0.4, max_output_tokens=8000),
+        )
+        quick = _extract(resp)
+    except Exception as e:
+        warn(f"Gemini Quick Summary 오류: {e}")
+    try:
+        resp = client.models.generate_content(
+            model="gemini-2.5-pro",
+            contents=prompt_deep.format(date=date, content=content),
+            config=types.GenerateContentConfig(temperature=0.35, max_output_tokens=16000),
+        )
+        deep = _extract(resp)
+    except Exception as e:
+        warn(f"Gemini Deep Dive 오류: {e}")
+    return quick, deep
+
+
+def summarize_openai(
+    news_list: list, api_key: str, prompt_quick: str, prompt_deep: str, warn=print, bodies=None, watch=None, mode=""
+) -> tuple:
+    try:
+        client = lazydeps.openai_client(api_key)
+    except ImportError:
+        warn("openai 패키지가 없습니다.")
+        return "", ""
+
+    content = build_topic_text(news_list, 60, bodies=bodies, groups=ranking.rank_topics(news_list, watch, mode))
+    date = today_str()
+    quick, deep = "", ""
+    try:
+        resp = client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[{"role": "user", "content": prompt_quick.format(date=date, content=content)}],
+            max_tokens=1200,
+            temperature=0.4,
+        )
+        quick = resp.choices[0].message.content or ""
+    except Exception as e:
+        warn(f"GPT Quick Summary 오류: {e}")
+    try:
+        resp = client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[{"role": "user", "content": prompt_deep.format(date=date, content=content)}],
+            max_tokens=2500,
+            temperature=0.35,
+        )
+        deep = resp.choices[0].message.content or ""
+    except Exception as e:
+        warn(f"GPT Deep Dive 오류: {e}")
+    return quick, deep
+
+
+# ── 주식 전용: 스크래퍼 + 프롬프트 ───────────────
+PROMPT_STOCK_QUICK = """다음은 {date} (KST) 미국 주식 및 금융 시장 뉴스입니다.
+
+{content}
+
+위 뉴스만을 바탕으로 한국어 Quick Summary를 작성해주세요.
+1. **오늘의 증시 핵심 테마** (거시경제, S&P500 흐름 등 3~5가지, 각 1~2문장)
+2. **주요 기업/섹터별 이슈** (특징주 중심, 각 1문장)
+3. **한줄 시장 요약** (전체를 한 문장으로)
+가독성 좋고 간결하게 작성해주세요."""
+
+PROMPT_STOCK_DEEP = """다음은 {date} (KST) 미국 증시 주요 뉴스입니다.
+
+{content}
+
+위 뉴스만을 바탕으로 한국어 Deep Dive 심층 분석을 작성해주세요.
+1. **거시 경제 및 연준(Fed) 동향 분석** (금리, 인플레이션 등)
+2. **주요 기업 실적 및 펀더멘털 분석** (언급된 기업 위주 상세히)
+3. **섹터별 자금 흐름 및 특징** (기술주, 금융주 등)
+4. **리스크 요인 및 시장의 우려**
+5. **단기 시장 전망 및 월가 시각**
+각 섹션을 전문적인 금융 리포트 톤으로 충분히 상세하게 작성해주세요."""
+
+
+def fetch_finnhub(api_key: str, category: str = "general", min_id: int = 0, limit: int = 30) -> list:
+    """min_id 를 주면 그보다 새 기사(id > min_id)만 받는다 (증분 백필)."""
+    return fetch_finnhub_page(api_key, category, min_id, limit)[0]
+
+
+def fetch_finnhub_page(api_key: str, category: str = "general", min_id: int = 0, limit: int = 0) -> tuple:
+    """(기사 목록, 응답 안의 최대 id). limit 0 이면 응답 전체."""
+    if not api_key:
+        return [], min_id
+    url = "https://finnhub.io/api/v1/news"
+    params = {"category": category}
+    if min_id:
+        params["minId"] = min_id
+    data = ratelimit.get_json(
+        "finnhub",
+        api_key,
+        lambda: http_get(url, params={**params, "token": api_key}, headers=HEADERS, timeout=15),
+        url,
+        sorted(params.items()),
+    )
+    if not isinstance(data, list):
+        return [], min_id
+    max_id = max([min_id] + [item.get("id") or 0 for item in data if isinstance(item, dict)])
+    results = []
+    for item in data[:limit] if limit else data:
+        try:
+            ts = float(item.get("datetime", 0))
+            pub = epoch_to_iso(ts)
+            if not is_recent(pub):
+                continue
+            results.append(
+                make_item(
+                    title=item.get("headline", ""),
+                    url=item.get("url", ""),
+                    source=item.get("source", "Finnhub"),
+                    published_at=pub,
+                    published_ts=ts,
+                    description=item.get("summary", ""),
+                )
+            )
+        except Exception:
+            continue
+    return results, max_id
+
+
+def fetch_mktnews(limit: int = 50) -> list:
+    results = []
+    try:
+        t = int(time.time() * 1000)
+        r = http_get(
+            f"https://static.mktnews.net/json/flash/en.json?t={t}",
+            headers=HEADERS,
+            timeout=15,
+        )
+        if r.status_code != 200:
+            return []
+        data = r.json()
+        for item in data[:limit] if limit else data:
+            try:
+                content = (item.get("data") or {}).get("content", "").strip()
+                title_field = (item.get("data") or {}).get("title", "").strip()
+                title = title_field if title_field else content[:120]
+                if not title:
+                    continue
+                pub = item.get("time", "")
+                if pub and not is_recent(pub):
+                    continue
+                item_id = item.get("id", "")
+                url = f"https://mktnews.com/flashDetail.html?id={item_id}" if item_id else ""
+                desc = content if title_field and content != title else ""
+                results.append(
+                    make_item(title=title, url=url, source="MKT News", published_at=pub, description=desc)
+                )
+            except Exception:
+                continue
+    except Exception:
+        pass
+    return results
+
+
+def parse_mni_markets(markup) -> list:
+    results = []
+    soup = lazydeps.soup(markup, "html.parser")
+    seen_urls = set()
+    for a in soup.find_all("a", href=True):
+        href = a["href"]
+        if "/articles/" not in href:
+            continue
+        url = href if href.startswith("http") else "https://www.mnimarkets.com" + href
+        if url in seen_urls:
+            continue
+        seen_urls.add(url)
+        title = a.get_text(strip=True)
+        if not title or len(title) < 10:
+            parent = a.find_parent()
+            if parent:
+                title = parent.get_text(separator=" ", strip=True)[:200]
+        if not title or len(title) < 10:
+            continue
+        results.append(make_item(title=title[:200], url=url, source="MNI Markets", published_at="", description=""))
+        if len(results) >= 30:
+            break
+    return results
+
+
+def fetch_mni_markets() -> list:
+    try:
+        r = hedged_get(["https://www.mnimarkets.com/articles", "https://www.mnimarkets.com/"], headers=HEADERS, timeout=15)
+        return parsepool.parse(parse_mni_markets, r.content)
+    except Exception:
+        return []
+
+
+# ── RSS · Atom 피드 (feeds.json 설정) ───────────
+_XML_ITEM = re.compile(rb"<(?:[\w.-]+:)?(item|entry)\b[^>]*>(.*?)</(?:[\w.-]+:)?\1\s*>", re.S)
+_XML_DECL_ENCODING = re.compile(rb"^\s*<\?xml[^>]*encoding=[\"']([\w.-]+)", re.I)
+_XML_CDATA = re.compile(r"<!\[CDATA\[(.*?)\]\]>", re.S)
+_XML_TAG = re.compile(r"<[^>]+>")
+_XML_FIELDS = {
+    name: re.compile(rf"<(?:[\w.-]+:)?{name}\b([^>]*?)(?:/>|>(.*?)</(?:[\w.-]+:)?{name}\s*>)", re.S)
+    for name in ("title", "link", "pubDate", "published", "updated", "description", "summary")
+}
+_XML_HREF = re.compile(r"""\bhref=["']([^"']*)["']""")
+
+
+def _xml_text(raw: str) -> str:
+    """요소 내용 → get_text(strip=True) 와 같은 텍스트 (CDATA 는 그대로, 나머지는 태그 제거 후 엔티티 해제)."""
+    parts, pos = [], 0
+    for m in _XML_CDATA.finditer(raw):
+        parts.append(html.unescape(_XML_TAG.sub("", raw[pos : m.start()])))
+        parts.append(m.group(1))
+        pos = m.end()
+    parts.append(html.unescape(_XML_TAG.sub("", raw[pos:])))
+    return "".join(parts).strip()
+
+
+def _xml_field(block: str, *names) -> tuple:
+    """(텍스트, 속성 문자열). 이름 순서대로 처음 찾은 요소."""
+    for name in names:
+        m = _XML_FIELDS[name].search(block)
+        if m:
+            return _xml_text(m.group(2) or ""), m.group(1)
+    return "", ""
+
+
+def _rss_item(source_name, title, link, pub_raw, desc_raw):
+    if not title:
+        return None
+    pub_iso, pub_ts = rss_time(pub_raw)
+    if pub_iso and not is_recent(pub_iso):
+        return None
+    return make_item(
+        title=title, url=link, source=source_name, published_at=pub_iso, published_ts=pub_ts, description=desc_raw, desc_limit=200
+    )
+
+
+def _parse_rss_slow(markup, source_name: str) -> list:
+    results = []
+    soup = lazydeps.soup(markup, "xml")
+    for item in soup.find_all("item") or soup.find_all("entry"):
+        title_el = item.find("title")
+        link_el = item.find("link")
+        pub_el = item.find("pubDate") or item.find("published") or item.find("updated")
+        desc_el = item.find("description") or item.find("summary")
+        link = link_el.get_text(strip=True) or link_el.get("href", "") if link_el else ""
+        parsed = _rss_item(
+            source_name,
+            title_el.get_text(strip=True) if title_el else "",
+            link,
+            pub_el.get_text(strip=True) if pub_el else "",
+            desc_el.get_text(strip=True) if desc_el else "",
+        )
+        if parsed:
+            results.append(parsed)
+    return results
+
+
+def parse_rss(markup: bytes, source_name: str) -> list:
+    """RSS/Atom 원본 → 기사 목록. 정규식 한 번으로 item/entry 를 훑고,
+    UTF-8 이 아니거나 item 을 못 찾는 문서는 BeautifulSoup(xml) 로 처리 (수백 개 피드에서 파싱 비용을 줄임)."""
+    if isinstance(markup, str):
+        markup = markup.encode("utf-8")
+    declared = _XML_DECL_ENCODING.match(markup)
+    blocks = _XML_ITEM.findall(markup)
+    if not blocks or (declared and declared.group(1).lower() not in (b"utf-8", b"utf8", b"us-ascii")):
+        return _parse_rss_slow(markup, source_name)
+    if any(kind == b"item" for kind, _ in blocks):
+        blocks = [block for kind, block in blocks if kind == b"item"]
+    else:
+        blocks = [block for _, block in blocks]
+    results = []
+    for raw in blocks:
+        block = raw.decode("utf-8", "replace")
+        link, attrs = _xml_field(block, "link")
+        if not link:
+            href = _XML_HREF.search(attrs)
+            link = html.unescape(href.group(1)) if href else ""
+        parsed = _rss_item(
+            source_name,
+            _xml_field(block, "title")[0],
+            link,
+            _xml_field(block, "pubDate", "published", "updated")[0],
+            _xml_field(block, "description", "summary")[0],
+        )
+        if parsed:
+            results.append(parsed)
+    return results
+
+
+def _has_feed_items(r) -> bool:
+    return r.status_code == 200 and (b"<item" in r.content or b"<entry" in r.content)
+
+
+_feed_validators: dict = {}  # 피드 이름 → (ETag, Last-Modified, 마지막 결과)
+
+
+def fetch_feed(urls, source_name: str, timeout: float = 15.0) -> list:
+    """RSS/Atom 피드. 주소가 여러 개면 hedged_get 으로 경쟁시키고,
+    지난 응답의 ETag / Last-Modified 로 조건부 요청해 바뀌지 않은 피드는 본문을 받지 않는다."""
+    urls = [urls] if isinstance(urls, str) else list(urls)
+    etag, modified, previous = _feed_validators.get(source_name, ("", "", None))
+    headers = dict(HEADERS)
+    if previous:
+        if etag:
+            headers["If-None-Match"] = etag
+        if modified:
+            headers["If-Modified-Since"] = modified
+    try:
+        r = hedged_get(
+            urls, key=source_name, ok=lambda r: r.status_code == 304 or _has_feed_items(r), headers=headers, timeout=timeout
+        )
+        if r.status_code == 304 and previous:
+            return [item for item in previous if not item["published_at"] or is_recent(item["published_at"])]
+        if r.status_code != 200:
+            return []
+        results = parsepool.parse(parse_rss, r.content, source_name)
+    except Exception:
+        return []
+    _feed_validators[source_name] = (r.headers.get("ETag", ""), r.headers.get("Last-Modified", ""), results)
+    return results
+
+
+# ── 코인 전용: 유틸 + 스크래퍼 + 프롬프트 ────────
+PROMPT_COIN_QUICK = """다음은 {date} (KST) 기준 코인 뉴스입니다.
+
+{content}
+
+위 뉴스만 바탕으로 한국어 Quick Summary를 작성해주세요.
+1. **오늘의 핵심 이슈** (3~5개, 각 1~2문장)
+2. **코인/프로젝트별 주요 이슈** (언급된 코인 중심, 각 1문장)
+3. **시장 한줄 요약** (전체를 한 문장으로)
+간결하고 명확하게 작성해주세요."""
+
+PROMPT_COIN_DEEP = """다음은 {date} (KST) 기준 코인 뉴스입니다.
+
+{content}
+
+위 뉴스만 바탕으로 한국어 Deep Dive 분석을 작성해주세요.
+1. **거시 경제 및 규제 환경 분석**
+2. **주요 코인별/섹터별 테마 분석** (각 코인 2~4문장)
+3. **기관 투자자 동향** (ETF, 기업 보유, 기관 포지션)
+4. **리스크 요인 및 주의 포인트**
+5. **단기 시장 전망 및 투자 시사점**
+각 섹션을 충분히 구체적으로 작성해주세요."""
+
+
+def find_time_in_parents(element):
+    current = element
+    for _ in range(6):
+        if not current:
+            break
+        current = getattr(current, "parent", None)
+        if not current:
+            break
+        time_tag = current.find("time")
+        if time_tag:
+            return time_tag.get("datetime", "")
+    return ""
+
+
+def fetch_cryptopanic(api_key: str, pages: int = 1) -> list:
+    """page 번호를 올려 가며 최대 pages 쪽까지. 응답에 next 가 없거나 어제 이전 기사만 남은 쪽에서 멈춘다."""
+    if not api_key:
+        return []
+    url = "https://cryptopanic.com/api/developer/v2/posts/"
+    results = []
+    for page in range(1, pages + 1):
+        # next 링크에는 토큰이 들어 있으므로 캐시 키 · 요청 모두 page 번호로 만든다
+        params = {"public": "true", "kind": "news", "regions": "en"}
+        if page > 1:
+            params["page"] = page
+        data = ratelimit.get_json(
+            "cryptopanic",
+            api_key,
+            lambda params=params: http_get(url, params={"auth_token": api_key, **params}, headers=HEADERS, timeout=15),
+            url,
+            sorted(params.items()),
+        )
+        if not isinstance(data, dict):
+            break
+        recent = 0
+        for item in data.get("results", []):
+            pub = item.get("published_at", "")
+            if not is_recent(pub):
+                continue
+            recent += 1
+            link = item.get("original_url") or item.get("url") or ""
+            if not link and item.get("id") and item.get("slug"):
+                link = f"https://cryptopanic.com/news/{item['id']}/{item['slug']}"
+            results.append(
+                make_item(
+                    title=item.get("title", ""),
+                    url=link,
+                    source="CryptoPanic",
+                    published_at=pub,
+                    description=item.get("description", "") or "",
+                )
+            )
+        if not data.get("next") or not recent:
+            break
+    return results
+
+
+def parse_coindesk(markup) -> list:
+    soup = lazydeps.soup(markup, "html.parser")
+    results = []
+    seen = set()
+    for selector in ["a[href*='/markets/']", "a[href*='/business/']", "a[href*='/tech/']", "a[href*='/policy/']"]:
+        for link in soup.select(selector):
+            href = link.get("href", "")
+            title = link.get_text(strip=True)
+            if not title or len(title) < 15 or href in seen:
+                continue
+            seen.add(href)
+            full_url = f"https://www.coindesk.com{href}" if href.startswith("/") else href
+            pub = find_time_in_parents(link)
+            if pub and not is_recent(pub):
+                continue
+            results.append(make_item(title=title, url=full_url, source="CoinDesk", published_at=pub))
+    return results
+
+
+def fetch_coindesk() -> list:
+    try:
+        response = http_get("https://www.coindesk.com/latest-crypto-news", headers=HEADERS, timeout=15)
+        response.raise_for_status()
+        return parsepool.parse(parse_coindesk, response.content)
+    except Exception:
+        return []
+
+
+def _merge_pages(pages) -> list:
+    """페이지별 파싱 결과를 URL 기준으로 합친다 (먼저 나온 페이지 우선)."""
+    results, seen = [], set()
+    for items in pages:
+        for item in items:
+            if item["url"] in seen:
+                continue
+            seen.add(item["url"])
+            results.append(item)
+    return results
+
+
+def parse_cryptonews_net(markup) -> list:
+    soup = lazydeps.soup(markup, "html.parser")
+    results = []
+    seen = set()
+    for item in soup.select(".news-item"):
+        link = item.find("a", href=True)
+        if not link:
+            continue
+        href = link["href"]
+        full_url = f"https://cryptonews.net{href}" if href.startswith("/") else href
+        if full_url in seen:
+            continue
+        seen.add(full_url)
+        title_el = item.select_one(".news-item__title, h2, h3, h4, .title")
+        title = title_el.get_text(strip=True) if title_el else item.get_text(separator=" ", strip=True)[:120]
+        time_el = item.find("time")
+        pub = time_el.get("datetime", "") if time_el else ""
+        if pub and not is_recent(pub):
+            continue
+        source_el = item.select_one(".news-item__source, .source")
+        source = source_el.get_text(strip=True) if source_el else "cryptonews.net"
+        results.append(make_item(title=title, url=full_url, source=source or "cryptonews.net", published_at=pub))
+    return results
+
+
+def fetch_cryptonews_net() -> list:
+    pages = []
+    for url in [
+        "https://cryptonews.net/news/bitcoin/",
+        "https://cryptonews.net/news/ethereum/",
+        "https://cryptonews.net/",
+    ]:
+        try:
+            response = http_get(url, headers=HEADERS, timeout=15)
+            response.raise_for_status()
+            pages.append(parsepool.parse(parse_cryptonews_net, response.content))
+        except Exception:
+            continue
+    return _merge_pages(pages)
+
+
+def parse_coincarp(markup) -> list:
+    soup = lazydeps.soup(markup, "html.parser")
+    results = []
+    seen = set()
+    now = time.time()
+    for link in soup.find_all("a", href=True):
+        href = link.get("href", "")
+        if not href.startswith("http") or "coincarp.com" in href:
+            continue
+        raw = link.get_text(strip=True)
+        title = AGO_PREFIX.sub("", raw).strip()
+        if not title or len(title) < 15 or href in seen:
+            continue
+        seen.add(href)
+        age = relative_age(raw)
+        ts = now - age if age else None
+        pub = epoch_to_iso(ts) if ts is not None else ""
+        source = url_domain(href) or "coincarp"
+        results.append(make_item(title=title, url=href, source=source, published_at=pub, published_ts=ts))
+    return results
+
+
+def fetch_coincarp() -> list:
+    pages = []
+    for url in [
+        "https://www.coincarp.com/news/bitcoin/",
+        "https://www.coincarp.com/news/ethereum/",
+        "https://www.coincarp.com/news/",
+    ]:
+        try:
+            response = http_get(url, headers=HEADERS, timeout=15)
+            response.raise_for_status()
+            pages.append(parsepool.parse(parse_coincarp, response.content))
+        except Exception:
+            continue
+    return _merge_pages(pages)
+
+
+_CRYPTONEWS_ARTICLE = re.compile(r"cryptonews\.com/news/[a-z]")
+
+
+def parse_cryptonews_com(markup) -> list:
+    soup = lazydeps.soup(markup, "html.parser")
+    results = []
+    seen = set()
+    for link in soup.find_all("a", href=True):
+        href = link.get("href", "")
+        full_url = f"https://cryptonews.com{href}" if href.startswith("/") else href
+        if not _CRYPTONEWS_ARTICLE.search(full_url):
+            continue
+        title = link.get_text(strip=True)
+        if not title or len(title) < 15 or full_url in seen:
+            continue
+        seen.add(full_url)
+        pub = find_time_in_parents(link)
+        if pub and not is_recent(pub):
+            continue
+        results.append(make_item(title=title, url=full_url, source="cryptonews.com", published_at=pub))
+    return results
+
+
+def fetch_cryptonews_com() -> list:
+    pages = []
+    for url in [
+        "https://cryptonews.com/news/",
+        "https://cryptonews.com/news/bitcoin-news/",
+        "https://cryptonews.com/news/ethereum-news/",
+    ]:
+        try:
+            response = http_get(url, headers=HEADERS, timeout=15)
+            response.raise_for_status()
+            pages.append(parsepool.parse(parse_cryptonews_com, response.content))
+        except Exception:
+            continue
+    return _merge_pages(pages)
+
+
+# ── 소스 레지스트리 + 수집 실행 ──────────────────
+# label · group 은 사이드바 표시용, ttl 은 이 시간 안에는 다시 가져오지 않음 (0 = 저장소 기본값)
+Source = collections.namedtuple("Source", "name mode fn args api_key label group ttl", defaults=("", "", 0.0))
+
+# 전용 수집기가 필요한 소스 (API · 스크래핑). 일반 RSS/Atom 피드는 feeds.json 에서 읽는다
+BUILTIN_SOURCES = [
+    Source("Finnhub API", "stock", fetch_finnhub, (), "FINNHUB_API_KEY", "Finnhub API"),
+    Source("MNI Markets", "stock", fetch_mni_markets, (), "", "MNI Markets (스크래핑)"),
+    Source("MKT News", "stock", fetch_mktnews, (), "", "MKT News (API)"),
+    Source("CryptoPanic", "coin", fetch_cryptopanic, (), "CRYPTOPANIC_API_KEY", "CryptoPanic API"),
+    Source("CoinDesk", "coin", fetch_coindesk, (), "", "CoinDesk"),
+    Source("cryptonews.net", "coin", fetch_cryptonews_net, (), "", "cryptonews.net"),
+    Source("coincarp.com", "coin", fetch_coincarp, (), "", "coincarp.com"),
+    Source("cryptonews.com", "coin", fetch_cryptonews_com, (), "", "cryptonews.com"),
+]
+
+
+def feed_sources(feed_list) -> list:
+    return [
+        Source(feed.name, feed.mode, fetch_feed, (feed.urls, feed.name, feed.timeout), "", feed.label, feed.group, feed.ttl)
+        for feed in feed_list
+    ]
+
+
+_BUILTIN_NAMES = {src.name for src in BUILTIN_SOURCES}
+FEEDS = [feed for feed in feeds.load() if feed.name not in _BUILTIN_NAMES]
+SOURCES = BUILTIN_SOURCES + feed_sources(FEEDS)
+SOURCES_BY_NAME = {src.name: src for src in SOURCES}
+
+
+def source_task(src: Source, api_keys: dict):
+    """Source → (name, fn, args). 필요한 API 키가 없으면 None."""
+    if not src.api_key:
+        return src.name, src.fn, src.args
+    key = api_keys.get(src.api_key, "")
+    return (src.name, src.fn, (key, *src.args)) if key else None
+
+
+def build_tasks(names, api_keys: dict) -> list:
+    tasks = (source_task(SOURCES_BY_NAME[name], api_keys) for name in names)
+    return [task for task in tasks if task]
+
+
+COLLECT_WORKERS = int(os.getenv("NEWS_COLLECT_WORKERS", "32") or 32)  # 수백 개 피드도 한 주기에 돌도록 (I/O 대기 위주)
+
+
+def iter_collect(tasks, max_workers: int = COLLECT_WORKERS):
+    """소스들을 동시에 수집하고 끝나는 순서대로 (name, items, error) 를 내보낸다.
+    실패한 소스는 health 의 stale 캐시로 대체될 수 있으며, 상태는 health.source_status 로 확인."""
+    if not tasks:
+        return
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(max_workers, len(tasks))) as pool:
+        futures = {pool.submit(health.run_source, name, fn, args): name for name, fn, args in tasks}
+        for fut in concurrent.futures.as_completed(futures):
+            name = futures[fut]
+            try:
+                yield name, fut.result(), None
+            except Exception as e:
+                yield name, [], e
+
+
+def finalize(news_list: list) -> list:
+    """중복 제거 → 최신성 필터 → 최신순 정렬."""
+    batch = NewsBatch.from_items(news_list).dedup().filter_recent(recent_cutoff(yesterday_str())).sort_desc()
+    return batch.to_items()
+
+
+# ── 리포트 (앱 · CLI 공용) ──────────────────────
+MODE_PROMPTS = {
+    "stock": (PROMPT_STOCK_QUICK, PROMPT_STOCK_DEEP),
+    "coin": (PROMPT_COIN_QUICK, PROMPT_COIN_DEEP),
+}
+
+# 제공자 라벨 → (요약 함수, 필요한 API 키 이름)
+AI_PROVIDERS = {
+    "Gemini 2.5 Pro": (summarize_gemini, "GEMINI_API_KEY"),
+    "GPT-4o-mini": (summarize_openai, "OPENAI_API_KEY"),
+}
+AI_ALIASES = {"gemini": "Gemini 2.5 Pro", "openai": "GPT-4o-mini", "none": ""}
+ENRICH_WAIT = 20.0  # 리포트 생성(CLI · 스케줄러) 때 본문을 기다리는 최대 시간
+
+
+def summarize(news_list: list, provider: str, api_keys: dict, mode: str, warn=print, bodies=None) -> tuple:
+    """(quick, deep, provider). 제공자나 키가 없으면 ("", "", ""). bodies 는 url → 본문 발췌."""
+    fn, key_name = AI_PROVIDERS.get(provider, (None, ""))
+    api_key = api_keys.get(key_name, "")
+    if not fn or not api_key or not news_list:
+        return "", "", ""
+    prompt_quick, prompt_deep = MODE_PROMPTS[mode]
+    quick, deep = fn(news_list, api_key, prompt_quick, prompt_deep, warn=warn, bodies=bodies, mode=mode)
+    return quick, deep, provider
+
+
+def collect_report(
+    mode: str, api_keys: dict, provider: str = "", source_names=None, warn=print, enrich_top: int = 0
+) -> dict:
+    """enrich_top > 0 이면 요약 전에 주제 대표 기사 상위 N건의 본문을 가져와 프롬프트에 넣는다."""
+    names = source_names or [src.name for src in SOURCES if src.mode == mode]
+    tasks = build_tasks(names, api_keys)
+    started = time.time()
+    all_news = []
+    source_stats = {name: 0 for name, _, _ in tasks}
+    for name, items, err in iter_collect(tasks):
+        if err is None:
+            all_news += items
+            source_stats[name] = len(items)
+            history.record(items, name, mode)
+            alerts.evaluate(items, name)
+    all_news = finalize(all_news)
+    collected = time.time()
+    bodies = None
+    if provider and enrich_top and all_news:
+        bodies = enrich.bodies(ranking.leads(all_news, enrich_top, mode=mode), wait=ENRICH_WAIT)
+    quick, deep, used = summarize(all_news, provider, api_keys, mode, warn=warn, bodies=bodies)
+    return {
+        "mode": mode,
+        "date": today_str(),
+        "generated_at": kst_now().strftime("%Y-%m-%d %H:%M"),
+        "provider": used,
+        "summary_quick": quick,
+        "summary_deep": deep,
+        "source_stats": source_stats,
+        "source_notes": {name: health.describe(name) for name in source_stats},
+        "items": all_news,
+        "timings": {"collect_s": round(collected - started, 2), "summary_s": round(time.time() - collected, 2)},
+    }
+
+
+def report_to_markdown(report: dict) -> str:
+    title = "미국 주식 마켓 리포트" if report["mode"] == "stock" else "코인 뉴스 종합 리포트"
+    lines = [f"# {title} — {report['date']} (KST)", "", f"생성: {report['generated_at']} KST", ""]
+    if report.get("summary_quick") or report.get("summary_deep"):
+        lines += [f"## ⚡ Quick Summary ({report['provider']})", "", report.get("summary_quick") or "_요약 없음_", ""]
+        lines += ["## 🔬 Deep Dive", "", report.get("summary_deep") or "_분석 없음_", ""]
+    lines += ["## 📊 소스별 수집 현황", "", "| 소스 | 건수 | 비고 |", "|---|---:|---|"]
+    for name, cnt in report["source_stats"].items():
+        lines.append(f"| {name} | {cnt} | {report.get('source_notes', {}).get(name, '')} |")
+    lines += ["", f"## 📋 전체 뉴스 목록 ({len(report['items'])}건)", ""]
+    for item in report["items"]:
+        title_md = f"[{item['title']}]({item['url']})" if item.get("url") else item["title"]
+        kst = item_kst(item)
+        lines.append(f"- {title_md} — {item['source']}" + (f" · KST {kst}" if kst else ""))
+    return "\n".join(lines) + "\n"
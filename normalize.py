@@ -0,0 +1,101 @@
+"""
+기사 정규화 유틸
+- 항목마다 쓰는 정규식은 모듈 로드 시 한 번만 컴파일
+- 게시 시각은 수집할 때 한 번만 파싱해 item["published_ts"] (epoch 초, 없으면 None) 로 저장
+  → 정렬 · 최신성 필터 · 화면 표시는 문자열을 다시 파싱하지 않음
+- KST 표시 문자열은 분 단위로 메모이즈
+"""
+
+import datetime
+import functools
+import math
+import re
+from email.utils import parsedate_to_datetime
+
+SPACE = re.compile(r"\s+")
+AGO_PREFIX = re.compile(r"^\d+\s*(min|mins|hour|hours|sec|secs|day|days)\s*(Ago|ago)\s*")
+RELATIVE_AGE = re.compile(r"(\d+)\s*(min|mins|hour|hours)")
+URL_DOMAIN = re.compile(r"https?://(?:www\.)?([^/]+)")
+
+ISO_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+KST_OFFSET = 9 * 3600
+
+
+def clean_text(text: str) -> str:
+    return SPACE.sub(" ", text or "").strip()
+
+
+def url_domain(url: str) -> str:
+    match = URL_DOMAIN.search(url or "")
+    return match.group(1) if match else ""
+
+
+def relative_age(text: str) -> float:
+    """'5 mins ago' / '2 hours' → 초. 없으면 0."""
+    match = RELATIVE_AGE.search(text or "")
+    if not match:
+        return 0.0
+    return int(match.group(1)) * (60 if "min" in match.group(2) else 3600)
+
+
+def iso_to_epoch(iso_str: str) -> float:
+    """ISO 8601 → epoch 초. 시간대가 없으면 UTC 로 간주, 파싱 불가면 NaN."""
+    if not iso_str:
+        return float("nan")
+    try:
+        dt = datetime.datetime.fromisoformat(iso_str.replace("Z", "+00:00"))
+    except ValueError:
+        return float("nan")
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=datetime.timezone.utc)
+    return dt.timestamp()
+
+
+def epoch_to_iso(ts: float) -> str:
+    return datetime.datetime.fromtimestamp(ts, datetime.timezone.utc).strftime(ISO_FORMAT)
+
+
+def rss_time(raw: str) -> tuple:
+    """RSS pubDate(RFC 2822) / Atom published(ISO 8601) → (UTC ISO 문자열, epoch 또는 None).
+    둘 다 아니면 원문 앞 19자를 그대로 둔다."""
+    try:
+        dt = parsedate_to_datetime(raw)
+    except Exception:
+        ts = iso_to_epoch(raw)
+        if math.isnan(ts):
+            return (raw or "")[:19], None
+        return epoch_to_iso(ts), ts
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=datetime.timezone.utc)
+    ts = dt.timestamp()
+    return epoch_to_iso(ts), ts
+
+
+def published_ts(published_at: str):
+    ts = iso_to_epoch(published_at)
+    return None if math.isnan(ts) else ts
+
+
+def item_epoch(item: dict) -> float:
+    """정렬 · 필터용 epoch. 시각이 없으면 NaN. published_ts 가 없는 예전 항목은 문자열에서 파싱."""
+    if "published_ts" in item:
+        ts = item["published_ts"]
+        return float("nan") if ts is None else ts
+    return iso_to_epoch(item.get("published_at", ""))
+
+
+@functools.lru_cache(maxsize=8192)
+def _kst_minute(minute: int) -> str:
+    return datetime.datetime.fromtimestamp(minute * 60 + KST_OFFSET, datetime.timezone.utc).strftime("%m/%d %H:%M")
+
+
+def kst_label(ts: float) -> str:
+    return _kst_minute(int(ts // 60))
+
+
+def item_kst(item: dict) -> str:
+    """카드 · 리포트용 'MM/DD HH:MM' (KST). 파싱 불가한 시각은 원문 앞 16자."""
+    ts = item_epoch(item)
+    if not math.isnan(ts):
+        return kst_label(ts)
+    return (item.get("published_at") or "")[:16]
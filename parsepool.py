@@ -0,0 +1,60 @@
+"""
+HTML 파싱 프로세스 풀 (선택)
+- 스크래핑 페이지의 BeautifulSoup 파싱은 GIL 에 묶인 CPU 작업이라 Streamlit 서버 프로세스 밖으로 뺄 수 있게 함
+- 입력은 원본 바이트, 출력은 make_item 레코드 목록 (둘 다 pickle 가능)
+- NEWS_PARSE_WORKERS=N (기본 0 = 현재 프로세스에서 바로 파싱)
+- 대기 작업 수는 세마포어로 제한 (bounded queue) — 가득 차면 제출하는 수집 스레드가 기다림
+"""
+
+import concurrent.futures
+import multiprocessing
+import os
+import threading
+from concurrent.futures.process import BrokenProcessPool
+
+_lock = threading.Lock()
+_pool = None
+_slots = None
+_configured = False
+
+
+def configure(workers: int, max_pending: int = 0) -> None:
+    global _pool, _slots, _configured
+    with _lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+        if workers > 0:
+            # Streamlit 서버는 멀티스레드라 fork 대신 spawn
+            ctx = multiprocessing.get_context("spawn")
+            _pool = concurrent.futures.ProcessPoolExecutor(max_workers=workers, mp_context=ctx)
+            _slots = threading.BoundedSemaphore(max_pending or workers * 2)
+        _configured = True
+
+
+def _ensure() -> None:
+    if not _configured:
+        try:
+            workers = int(os.getenv("NEWS_PARSE_WORKERS", "0") or 0)
+        except ValueError:
+            workers = 0
+        configure(workers)
+
+
+def enabled() -> bool:
+    _ensure()
+    return _pool is not None
+
+
+def parse(fn, markup, *args) -> list:
+    """fn(markup, *args) 를 풀에서 실행 (풀이 없으면 현재 스레드에서). fn 은 모듈 최상위 함수여야 함."""
+    _ensure()
+    pool, slots = _pool, _slots
+    if pool is None:
+        return fn(markup, *args)
+    with slots:
+        try:
+            return pool.submit(fn, markup, *args).result()
+        except BrokenProcessPool:
+            configure(0)
+            return fn(markup, *args)
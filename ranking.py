@@ -0,0 +1,199 @@
+"""
+뉴스 중요도 순위 (발행 시각 정렬 대신)
+- 점수 = 최신성 × 교차 보도 × 소스 가중치 × 관심 티커
+  · 최신성: 반감기 NEWS_RANK_HALF_LIFE_HOURS(기본 6시간) 지수 감쇠. 시각이 없는 기사(MNI · 스크래핑)는 기록(history)의
+    처음 수집 시각 기준에 UNTIMED_WEIGHT 를 곱함 (처음 본 시각은 실제 발행보다 늦으므로 맨 위로 올라오지 않게)
+  · 교차 보도: 같은 주제를 다룬 서로 다른 소스 수 (topics.TopicIndex 의 주제)
+  · 소스 가중치: SOURCE_WEIGHTS (NEWS_SOURCE_WEIGHTS="reuters=1.3,cnbc=1.1" 로 덮어쓰기), 없으면 1
+  · 관심 티커: NEWS_WATCHLIST 또는 앱 입력값과 겹치는 티커 · 단어 수만큼 가산
+- Ranker 는 주제 색인과 처음 본 시각을 유지해 새 기사만 add 하면 됨 → 목록 · AI 입력 정렬에 추가 지연이 거의 없음
+- 화면 목록은 HALF_LIFE_BUCKET(반감기의 1/12) 단위로만 다시 정렬 → 데이터가 그대로여도 시간이 지나면 순위가 바뀜
+"""
+
+import math
+import os
+import re
+import threading
+import time
+
+import history
+from newsbatch import title_digest
+from normalize import item_epoch
+from topics import THRESHOLD, TopicIndex
+
+HALF_LIFE_HOURS = float(os.getenv("NEWS_RANK_HALF_LIFE_HOURS", "6") or 6)
+HALF_LIFE_BUCKET = HALF_LIFE_HOURS * 3600 / 12  # 순위를 캐시하는 시간 단위(초) — 그 사이 최신성 점수는 6% 정도만 바뀜
+CORROBORATION = 0.6  # 소스가 2배 늘 때마다 더해지는 배수
+WATCH_BOOST = 0.5  # 관심 티커 1개당 (최대 WATCH_MAX 개)
+WATCH_MAX = 2
+UNTIMED_WEIGHT = 0.7  # 발행 시각이 없는 기사의 최신성 할인
+MAX_DOCS = 20000  # 주제 색인이 이보다 커지면 현재 기사로 다시 만듦
+
+SOURCE_WEIGHTS = {
+    "reuters": 1.3,
+    "bloomberg": 1.3,
+    "wsj": 1.2,
+    "cnbc": 1.15,
+    "marketwatch": 1.1,
+    "mni markets": 1.15,
+    "coindesk": 1.15,
+    "the block": 1.1,
+    "decrypt": 1.05,
+    "yahoo": 1.0,
+    "mkt news": 0.9,
+    "cryptopanic": 0.9,
+    "cryptonews.net": 0.85,
+    "coincarp.com": 0.85,
+}
+
+_WORD = re.compile(r"[a-z0-9][a-z0-9.&-]*[a-z0-9]|[a-z0-9]")
+
+
+def _env_weights(spec: str) -> dict:
+    weights = {}
+    for part in spec.split(","):
+        name, _, value = part.partition("=")
+        try:
+            weights[name.strip().lower()] = float(value)
+        except ValueError:
+            continue
+    return weights
+
+
+SOURCE_WEIGHTS.update(_env_weights(os.getenv("NEWS_SOURCE_WEIGHTS", "")))
+
+
+def parse_watchlist(text: str) -> tuple:
+    """'NVDA, $TSLA bitcoin' → ('NVDA', 'TSLA', 'BITCOIN'). 쉼표 · 공백 구분, 대문자로 통일."""
+    return tuple(dict.fromkeys(tok.lstrip("$").upper() for tok in re.split(r"[\s,]+", text or "") if tok.lstrip("$")))
+
+
+WATCHLIST = parse_watchlist(os.getenv("NEWS_WATCHLIST", ""))
+
+
+def source_weight(source: str) -> float:
+    return SOURCE_WEIGHTS.get((source or "").lower(), 1.0)
+
+
+def mentions(item: dict) -> set:
+    """기사에 나오는 티커와 단어 (대문자). 관심 목록과의 교집합으로 가산 여부를 정한다."""
+    text = f"{item.get('title', '')} {item.get('description') or ''}"
+    return history.extract_tickers(text) | {word.upper() for word in _WORD.findall(text.lower())}
+
+
+class Ranker:
+    def __init__(self, half_life_hours: float = HALF_LIFE_HOURS, threshold: float = THRESHOLD, max_docs: int = MAX_DOCS):
+        self.half_life = half_life_hours * 3600
+        self.threshold = threshold
+        self.max_docs = max_docs
+        self.index = TopicIndex(threshold)
+        self.first_seen = {}  # 제목 해시 → 처음 본 epoch (발행 시각이 없는 기사용)
+        self._lock = threading.Lock()
+
+    def add(self, items, now: float = None) -> int:
+        """새 기사만 주제 색인에 반영하고 추가된 건수를 돌려준다."""
+        now = time.time() if now is None else now
+        with self._lock:
+            return self._add(items, now)
+
+    def _add(self, items, now: float) -> int:
+        if self.index.docs > self.max_docs:
+            # 오래된 기사까지 쌓인 색인은 버리고 지금 기사로 다시 만듦 (처음 본 시각은 유지)
+            keys = {title_digest(item.get("title", "")) for item in items}
+            self.index = TopicIndex(self.threshold)
+            self.first_seen = {key: ts for key, ts in self.first_seen.items() if key in keys}
+        untimed = {}
+        for item in items:
+            key = title_digest(item.get("title", ""))
+            if key not in self.first_seen and math.isnan(item_epoch(item)):
+                untimed[key] = item
+        if untimed:
+            # 프로세스를 다시 띄워도 처음 수집 시각이 유지되도록 기록에서 가져옴 (기록에 없으면 지금)
+            recorded = history.first_seen([item.get("title", "") for item in untimed.values()])
+            for key, item in untimed.items():
+                self.first_seen[key] = item.get("first_seen") or recorded.get(key) or now
+        return self.index.add(items)
+
+    def _scorer(self, now: float, watch):
+        watch = {w.upper() for w in watch or ()}
+        corroboration = {}  # 주제 id → 배수
+
+        def score(item: dict) -> float:
+            key = title_digest(item.get("title", ""))
+            ts = item_epoch(item)
+            weight = source_weight(item.get("source", ""))
+            if ts != ts:
+                ts = self.first_seen.get(key, now)
+                weight *= UNTIMED_WEIGHT
+            value = 0.5 ** (max(now - ts, 0.0) / self.half_life) * weight
+            topic = self.index.topic_of.get(key)
+            if topic is not None:
+                if topic.id not in corroboration:
+                    n = len({member.get("source", "") for member, _ in topic.members})
+                    corroboration[topic.id] = 1 + CORROBORATION * math.log2(n)
+                value *= corroboration[topic.id]
+            if watch:
+                value *= 1 + WATCH_BOOST * min(len(watch & mentions(item)), WATCH_MAX)
+            return value
+
+        return score
+
+    def rank(self, items: list, now: float = None, watch=None) -> list:
+        """점수 높은 순 (같은 점수는 입력 순서 유지)."""
+        now = time.time() if now is None else now
+        with self._lock:
+            self._add(items, now)
+            score = self._scorer(now, WATCHLIST if watch is None else watch)
+            return sorted(items, key=score, reverse=True)
+
+    def topics(self, items: list, now: float = None, watch=None) -> list:
+        """items 를 주제별로 묶어 중요한 주제 순으로. 형식은 TopicIndex.summaries 와 같고 score 가 붙는다.
+        대표 기사는 주제 안에서 점수가 가장 높은 기사."""
+        now = time.time() if now is None else now
+        with self._lock:
+            self._add(items, now)
+            score = self._scorer(now, WATCHLIST if watch is None else watch)
+            groups = {}
+            for item in items:
+                topic = self.index.topic_of.get(title_digest(item.get("title", "")))
+                if topic is not None:
+                    groups.setdefault(topic.id, (topic, []))[1].append((score(item), item))
+            result = []
+            for topic, scored in groups.values():
+                scored.sort(key=lambda s: -s[0])
+                members = [item for _, item in scored]
+                result.append(
+                    {
+                        "id": topic.id,
+                        "label": self.index.label(topic),
+                        "size": len(members),
+                        "sources": sorted({item.get("source", "") for item in members}),
+                        "lead": members[0],
+                        "items": members,
+                        "latest": topic.latest,
+                        "score": scored[0][0],
+                    }
+                )
+        result.sort(key=lambda t: -t["score"])
+        return result
+
+
+_rankers = {}
+_rankers_lock = threading.Lock()
+
+
+def ranker(mode: str = "") -> Ranker:
+    """모드별 프로세스 공용 Ranker (화면 · AI 요약 · CLI 리포트가 같은 주제 색인을 이어 씀)."""
+    with _rankers_lock:
+        if mode not in _rankers:
+            _rankers[mode] = Ranker()
+        return _rankers[mode]
+
+
+def rank_topics(news_list: list, watch=None, mode: str = "") -> list:
+    return ranker(mode).topics(news_list, watch=watch)
+
+
+def leads(news_list: list, n: int, watch=None, mode: str = "") -> list:
+    """중요한 주제 순 대표 기사 n건 (본문 보강 대상)."""
+    return [topic["lead"] for topic in rank_topics(news_list, watch, mode)[:n]]
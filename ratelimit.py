@@ -0,0 +1,131 @@
+"""
+유료 · 한도 API(Finnhub, CryptoPanic) 요청 예산 + 응답 캐시
+- API 키별 토큰 버킷을 로컬 sqlite 에 두어 세션 · 프로세스(앱, CLI, 스케줄러)가 같은 예산을 나눠 씀
+- 응답 캐시 TTL 은 요금제 한도에 맞춤: 한도 주기 / 허용 호출 수 (예: 월 3000회 → 864초)
+  → TTL 안의 요청은 API 를 부르지 않으므로 사용자가 늘어도 호출 수는 그대로
+- 예산이 바닥났거나 429 를 받으면 빈 목록 대신 마지막 캐시 응답을 돌려줌
+- 저장 위치: NEWS_RATE_DB (기본 ./.cache/ratelimit.sqlite), API 키는 해시로만 저장
+"""
+
+import collections
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import health
+
+DB_PATH = os.getenv("NEWS_RATE_DB") or os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "ratelimit.sqlite")
+MAX_STALE = 24 * 3600
+
+# rate: 초당 보충 토큰, burst: 버킷 크기, ttl: 응답 캐시 유지 시간(초)
+Budget = collections.namedtuple("Budget", "rate burst ttl")
+
+
+def _quota_budget(calls: float, period: float, burst: float) -> Budget:
+    interval = period / max(calls, 1.0)
+    return Budget(1.0 / interval, burst, interval)
+
+
+BUDGETS = {
+    # 무료 요금제 분당 60회 → 여유를 두고 분당 50회, 같은 응답은 60초 재사용
+    "finnhub": Budget(float(os.getenv("NEWS_FINNHUB_PER_MIN", "50")) / 60, 10.0, 60.0),
+    # 월 호출 한도를 균등 분배
+    "cryptopanic": _quota_budget(float(os.getenv("NEWS_CRYPTOPANIC_PER_MONTH", "3000")), 30 * 86400, 3.0),
+}
+
+_local = threading.local()
+_init_lock = threading.Lock()
+_initialized = set()
+
+
+def _conn() -> sqlite3.Connection:
+    conn = getattr(_local, "conn", None)
+    if conn is None or getattr(_local, "path", None) != DB_PATH:
+        os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
+        conn = sqlite3.connect(DB_PATH, timeout=10, isolation_level=None)
+        with _init_lock:
+            if DB_PATH not in _initialized:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("CREATE TABLE IF NOT EXISTS buckets (key TEXT PRIMARY KEY, tokens REAL, updated REAL)")
+                conn.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, fetched REAL, body TEXT)")
+                _initialized.add(DB_PATH)
+        _local.conn, _local.path = conn, DB_PATH
+    return conn
+
+
+def _digest(*parts) -> str:
+    return hashlib.sha256("\x1f".join(str(p) for p in parts).encode()).hexdigest()[:24]
+
+
+def take(bucket: str, budget: Budget, now: float = None) -> bool:
+    """토큰 하나를 쓸 수 있으면 차감하고 True. 여러 프로세스가 동시에 불러도 한 트랜잭션으로 처리."""
+    now = time.time() if now is None else now
+    conn = _conn()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        row = conn.execute("SELECT tokens, updated FROM buckets WHERE key = ?", (bucket,)).fetchone()
+        tokens = budget.burst if row is None else min(budget.burst, row[0] + (now - row[1]) * budget.rate)
+        ok = tokens >= 1.0
+        if ok:
+            tokens -= 1.0
+        conn.execute("INSERT OR REPLACE INTO buckets (key, tokens, updated) VALUES (?, ?, ?)", (bucket, tokens, now))
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return ok
+
+
+def drain(bucket: str, retry_after: float, budget: Budget, now: float = None) -> None:
+    """429 를 받으면 Retry-After 동안 토큰이 차지 않도록 음수로 내려둔다."""
+    now = time.time() if now is None else now
+    tokens = -retry_after * budget.rate if retry_after else 0.0
+    _conn().execute("INSERT OR REPLACE INTO buckets (key, tokens, updated) VALUES (?, ?, ?)", (bucket, tokens, now))
+
+
+def _cached(key: str):
+    row = _conn().execute("SELECT fetched, body FROM responses WHERE key = ?", (key,)).fetchone()
+    if row is None:
+        return None, float("inf")
+    return json.loads(row[1]), time.time() - row[0]
+
+
+def _store(key: str, data) -> None:
+    _conn().execute(
+        "INSERT OR REPLACE INTO responses (key, fetched, body) VALUES (?, ?, ?)",
+        (key, time.time(), json.dumps(data, ensure_ascii=False)),
+    )
+
+
+def get_json(api: str, api_key: str, request, *cache_parts):
+    """request() 로 받은 JSON 을 예산 · 캐시를 거쳐 돌려준다. 아무것도 없으면 None.
+    cache_parts 에는 API 키를 뺀 요청 식별값(URL, 파라미터)을 넘긴다."""
+    budget = BUDGETS[api]
+    bucket = _digest(api, api_key)
+    key = _digest(api, api_key, *cache_parts)
+    data, age = _cached(key)
+    if data is not None and age <= budget.ttl:
+        return data
+    stale = data if age <= MAX_STALE else None
+    if not take(bucket, budget):
+        health.note_error("요청 예산 소진")
+        return stale
+    try:
+        r = request()
+    except Exception:
+        return stale
+    if r.status_code == 429:
+        drain(bucket, health.parse_retry_after(r.headers.get("Retry-After")), budget)
+        return stale
+    if r.status_code != 200:
+        return stale
+    try:
+        data = r.json()
+    except ValueError:
+        return stale
+    _store(key, data)
+    return data
+
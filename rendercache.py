@@ -0,0 +1,78 @@
+"""
+버전 기반 렌더 캐시
+- 수집 결과마다 내용 해시(version)를 한 번 계산해 두고
+- (모드, version, 검색어, 소스 필터) 단위로 만든 HTML · 목록을 프로세스 전역 LRU 에 보관
+- 위젯 조작 · 탭 전환 · 페이지 재접속 시 같은 키면 다시 만들지 않음
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+def content_version(news_list: list, source_stats=None, source_notes=None) -> str:
+    h = hashlib.blake2b(digest_size=12)
+    h.update(repr(sorted((source_stats or {}).items())).encode())
+    h.update(repr(sorted((source_notes or {}).items())).encode())
+    for item in news_list:
+        for field in ("title", "url", "source", "published_at", "description"):
+            h.update((item.get(field) or "").encode())
+            h.update(b"\x1f")
+        h.update(b"\x1e")
+    return h.hexdigest()
+
+
+def approx_size(value) -> int:
+    if isinstance(value, str):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(approx_size(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(approx_size(v) for v in value)
+    return 64
+
+
+class RenderCache:
+    def __init__(self, max_entries: int = 256, max_chars: int = 32_000_000):
+        self.max_entries = max_entries
+        self.max_chars = max_chars
+        self._data: OrderedDict = OrderedDict()
+        self._chars = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, key, build):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+        value = build()
+        size = approx_size(value)
+        with self._lock:
+            self.misses += 1
+            if key in self._data:
+                self._chars -= self._data.pop(key)[1]
+            self._data[key] = (value, size)
+            self._chars += size
+            while self._data and (len(self._data) > self.max_entries or self._chars > self.max_chars):
+                _, (_, old_size) = self._data.popitem(last=False)
+                self._chars -= old_size
+        return value
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._data), "chars": self._chars, "hits": self.hits, "misses": self.misses}
+
+
+_cache = RenderCache()
+
+
+def cached(key, build):
+    return _cache.get_or_build(key, build)
+
+
+def stats() -> dict:
+    return _cache.stats()
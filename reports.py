@@ -0,0 +1,130 @@
+"""
+사전 생성 리포트 저장소 + 스케줄러
+- 정해진 KST 시각(예: 미국 프리마켓 21:00, 마감 후 06:30)에 주식·코인 리포트를 미리 생성
+- 결과는 생성 시각과 함께 디스크에 저장하고, 페이지를 열면 즉시 불러와 표시
+- 저장 위치: NEWS_REPORT_DIR (기본 ./.cache/reports), 저장할 때마다 실행 스냅샷(snapshots)도 남김
+"""
+
+import datetime
+import json
+import os
+import threading
+
+import snapshots
+from newscore import collect_report, kst_now
+
+REPORT_DIR = os.getenv("NEWS_REPORT_DIR") or os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "reports")
+DEFAULT_TIMES = "21:00,06:30"
+MAX_AGE_HOURS = 24
+
+_cache: dict = {}
+_cache_lock = threading.Lock()
+
+
+def _path(mode: str) -> str:
+    return os.path.join(REPORT_DIR, f"{mode}-latest.json")
+
+
+def save_report(report: dict) -> str:
+    os.makedirs(REPORT_DIR, exist_ok=True)
+    path = _path(report["mode"])
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False)
+    os.replace(tmp, path)
+    snapshots.save(report)
+    return path
+
+
+def load_latest(mode: str, max_age_hours: float = MAX_AGE_HOURS):
+    """가장 최근 사전 생성 리포트. 없거나 max_age_hours 보다 오래됐으면 None.
+    파일 mtime 이 같으면 프로세스 메모리에 둔 사본을 그대로 돌려준다."""
+    path = _path(mode)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    age_hours = (datetime.datetime.now().timestamp() - mtime) / 3600
+    if age_hours > max_age_hours:
+        return None
+    with _cache_lock:
+        cached = _cache.get(mode)
+        if cached and cached[0] == mtime:
+            return cached[1]
+    try:
+        with open(path, encoding="utf-8") as f:
+            report = json.load(f)
+    except (OSError, ValueError):
+        return None
+    with _cache_lock:
+        _cache[mode] = (mtime, report)
+    return report
+
+
+def generated_ts(report: dict) -> float:
+    """리포트 generated_at(KST, 분 단위) → epoch. 형식이 다르면 0."""
+    try:
+        kst = datetime.datetime.strptime(report.get("generated_at", ""), "%Y-%m-%d %H:%M")
+    except ValueError:
+        return 0.0
+    return (kst - datetime.timedelta(hours=9)).replace(tzinfo=datetime.timezone.utc).timestamp()
+
+
+def parse_times(spec: str) -> list:
+    times = []
+    for part in (spec or DEFAULT_TIMES).split(","):
+        hour, minute = part.strip().split(":")
+        times.append((int(hour), int(minute)))
+    return times
+
+
+def next_run(times: list, now: datetime.datetime) -> datetime.datetime:
+    candidates = []
+    for hour, minute in times:
+        at = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if at <= now:
+            at += datetime.timedelta(days=1)
+        candidates.append(at)
+    return min(candidates)
+
+
+def generate(api_keys: dict, provider: str = "", modes=("stock", "coin"), warn=print, enrich_top: int = 0) -> list:
+    paths = []
+    for mode in modes:
+        paths.append(save_report(collect_report(mode, api_keys, provider, warn=warn, enrich_top=enrich_top)))
+    return paths
+
+
+class ReportScheduler:
+    """KST 기준 지정 시각마다 generate() 실행. run_forever 는 CLI, start 는 앱 내 스레드용."""
+
+    def __init__(
+        self, api_keys: dict, provider: str = "", times_spec: str = DEFAULT_TIMES, warn=print, enrich_top: int = 0
+    ):
+        self.api_keys = api_keys
+        self.provider = provider
+        self.enrich_top = enrich_top
+        self.times = parse_times(times_spec)
+        self.warn = warn
+        self.next_at = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def run_forever(self) -> None:
+        while not self._stop.is_set():
+            self.next_at = next_run(self.times, kst_now())
+            if self._stop.wait((self.next_at - kst_now()).total_seconds()):
+                break
+            try:
+                generate(self.api_keys, self.provider, warn=self.warn, enrich_top=self.enrich_top)
+            except Exception as e:
+                self.warn(f"리포트 생성 실패: {e}")
+
+    def start(self) -> "ReportScheduler":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.run_forever, name="news-reports", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
@@ -0,0 +1,218 @@
+"""
+소스별 적응형 수집 스케줄러 (자동 갱신 모드)
+- 기사 타임스탬프로 소스별 발행 간격을 학습해 폴링 주기를 조정
+- 타임스탬프가 없는 소스(MNI 등)는 새 기사 유무로 주기를 늘리거나 줄임
+- 지터로 동시 요청을 분산하고, 실패 시 지수 백오프
+- BackgroundCollector 가 프로세스당 하나의 스레드로 모든 소스를 돌며 모드별 스냅샷을 갱신
+"""
+
+import collections
+import math
+import random
+import statistics
+import threading
+import time
+
+import health
+from newsbatch import title_digest
+from itemstore import mode_view
+from newscore import iter_collect, source_task
+from normalize import item_epoch
+
+
+class SourceSchedule:
+    def __init__(
+        self,
+        name: str,
+        min_interval: float = 30.0,
+        max_interval: float = 3600.0,
+        initial: float = 120.0,
+        target_new: float = 2.0,
+        jitter: float = 0.15,
+    ):
+        self.name = name
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = initial
+        self.target_new = target_new  # 한 번 폴링할 때 기대하는 새 기사 수
+        self.jitter = jitter
+        self.gap = None  # 발행 간격 EWMA (초)
+        self.failures = 0
+        self.next_due = 0.0
+        self.last_polled = 0.0
+        self.last_new = 0
+        self._seen: set = set()
+
+    def _clamp(self, value: float) -> float:
+        return max(self.min_interval, min(self.max_interval, value))
+
+    def _learn_gap(self, items: list) -> None:
+        stamps = []
+        for item in items:
+            ts = item_epoch(item)
+            if not math.isnan(ts):
+                stamps.append(ts)
+        stamps = sorted(stamps, reverse=True)[:20]
+        if len(stamps) < 2:
+            return
+        gaps = [a - b for a, b in zip(stamps, stamps[1:]) if a > b]
+        if not gaps:
+            return
+        gap = statistics.median(gaps)
+        self.gap = gap if self.gap is None else 0.7 * self.gap + 0.3 * gap
+
+    def observe(self, items: list, now: float) -> int:
+        """성공한 폴링 결과를 반영하고 새 기사 수를 돌려준다."""
+        keys = {title_digest(item.get("title", "")) for item in items}
+        new = len(keys - self._seen) if self._seen else len(keys)
+        first_poll = not self._seen
+        self._seen = keys
+        self.failures = 0
+        self._learn_gap(items)
+        if self.gap is not None:
+            interval = self.gap * self.target_new
+            if not first_poll and not new:
+                interval = max(interval, self.interval * 1.5)
+        elif first_poll:
+            interval = self.interval
+        else:
+            interval = self.interval * (0.5 if new > self.target_new else 1.0 if new else 1.5)
+        self.interval = self._clamp(interval)
+        self.last_new = new
+        self._schedule(now, self.interval)
+        return new
+
+    def fail(self, now: float) -> None:
+        self.failures += 1
+        self._schedule(now, self._clamp(self.interval * (2 ** min(self.failures, 6))))
+
+    def _schedule(self, now: float, delay: float) -> None:
+        self.last_polled = now
+        self.next_due = now + delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def due(self, now: float) -> bool:
+        return now >= self.next_due
+
+    def status(self, now: float) -> dict:
+        return {
+            "interval": round(self.interval),
+            "next_in": max(0, round(self.next_due - now)),
+            "new": self.last_new,
+            "failures": self.failures,
+        }
+
+
+class BackgroundCollector:
+    """모든 소스를 각자의 주기로 돌며 모드별 최신 스냅샷(version, items, source_stats)을 유지."""
+
+    def __init__(self, sources: list, api_keys: dict, tick: float = 5.0, max_workers: int = 16, store=None):
+        self.sources = [src for src in sources if source_task(src, api_keys)]
+        self.api_keys = api_keys
+        self._by_name = {src.name: src for src in self.sources}
+        self.tick = tick
+        self.max_workers = max_workers
+        self.store = store  # ItemStore 를 주면 폴링 결과를 화면 수집과 공유
+        # 피드 설정의 ttl 보다 자주 폴링하지 않음
+        self.schedules = {
+            src.name: SourceSchedule(
+                src.name,
+                min_interval=max(30.0, src.ttl),
+                max_interval=max(3600.0, src.ttl),
+                initial=max(120.0, src.ttl),
+            )
+            for src in self.sources
+        }
+        self.polls = 0
+        self._items = {src.name: [] for src in self.sources}
+        self._snapshots = {"stock": (0, [], {}), "coin": (0, [], {})}
+        # 모드별 (version, item) 추가 로그 — 라이브 화면은 이 로그로 새 기사만 받아간다
+        self._changes = {"stock": collections.deque(maxlen=1000), "coin": collections.deque(maxlen=1000)}
+        self._keys = {"stock": set(), "coin": set()}
+        self._lock = threading.Lock()
+        self._rebuild_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> "BackgroundCollector":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="news-collector", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def snapshot(self, mode: str) -> tuple:
+        with self._lock:
+            return self._snapshots[mode]
+
+    def version(self, mode: str) -> int:
+        return self._snapshots[mode][0]
+
+    def changes_since(self, mode: str, version: int) -> list:
+        """version 이후 새로 들어온 기사 (최신 추가분 먼저, 제목 기준 중복 제거)."""
+        with self._lock:
+            log = [item for ver, item in self._changes[mode] if ver > version]
+        seen, result = set(), []
+        for item in reversed(log):
+            key = title_digest(item.get("title", ""))
+            if key not in seen:
+                seen.add(key)
+                result.append(item)
+        return result
+
+    def schedule_status(self) -> dict:
+        now = time.time()
+        return {name: sch.status(now) for name, sch in self.schedules.items()}
+
+    def poll_once(self) -> None:
+        now = time.time()
+        due = [name for name, sch in self.schedules.items() if sch.due(now)]
+        if not due:
+            return
+        changed = False
+        tasks = [source_task(self._by_name[name], self.api_keys) for name in due]
+        for name, items, err in iter_collect(tasks, self.max_workers):
+            self.polls += 1
+            schedule = self.schedules[name]
+            # 스크래퍼는 오류를 삼키고 [] 를 돌려주므로 빈 결과 · stale 대체도 실패로 보고 백오프
+            if err is not None or not items or health.source_status(name)["state"] in ("stale", "failed"):
+                schedule.fail(time.time())
+                continue
+            if self.store is not None:
+                self.store.put(name, items)
+            if schedule.observe(items, time.time()) or len(items) != len(self._items[name]):
+                self._items[name] = items
+                changed = True
+        # 다른 모드 소스의 기사도 키워드로 섞이므로 바뀐 게 있으면 두 모드 모두 다시 만든다
+        if changed:
+            self.refresh()
+
+    def refresh(self) -> None:
+        """두 모드 스냅샷을 다시 만든다 (백필이 저장소 이력을 채웠을 때도 호출)."""
+        with self._rebuild_lock:
+            for mode in self._snapshots:
+                self._rebuild(mode)
+
+    def _rebuild(self, mode: str) -> None:
+        names = [src.name for src in self.sources if src.mode == mode]
+        items_by_source = dict(self._items)
+        if self.store is not None:
+            # 저장소에는 백필 이력까지 들어 있음
+            items_by_source.update(self.store.snapshot())
+        merged, stats = mode_view(mode, items_by_source, names)
+        keys = {title_digest(item.get("title", "")) for item in merged}
+        added = [item for item in merged if title_digest(item.get("title", "")) not in self._keys[mode]]
+        with self._lock:
+            version = self._snapshots[mode][0] + 1
+            self._snapshots[mode] = (version, merged, stats)
+            self._changes[mode].extend((version, item) for item in reversed(added))
+            self._keys[mode] = keys
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.poll_once()
+            except Exception:
+                pass
+            self._stop.wait(self.tick)
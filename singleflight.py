@@ -0,0 +1,89 @@
+"""
+같은 요청 합치기 (single-flight)
+- 같은 키의 작업이 이미 돌고 있으면 새로 시작하지 않고 그 결과를 같이 기다림
+- ttl 을 주면 끝난 결과도 그 시간 동안 재사용 (장 시작 직후 몇 초 간격으로 누르는 경우)
+- 예외도 그대로 공유: 합류한 쪽도 같은 예외를 받음 (실행한 쪽 스크립트 중단 같은 흐름 제어 예외는 제외)
+"""
+
+import concurrent.futures
+import threading
+import time
+
+
+class Group:
+    def __init__(self, ttl: float = 0.0, max_results: int = 64):
+        self.ttl = ttl
+        self.max_results = max_results
+        self.started = 0
+        self.joined = 0
+        self._calls = {}  # key → Future (진행 중)
+        self._results = {}  # key → (끝난 시각, Future)
+        self._lock = threading.Lock()
+
+    def _reuse(self, key, now: float):
+        done = self._results.get(key)
+        if done is None:
+            return None
+        if now - done[0] > self.ttl or done[1].exception() is not None:
+            del self._results[key]
+            return None
+        return done[1]
+
+    def claim(self, key) -> tuple:
+        """(Future, owner). owner 면 이 호출이 작업을 맡은 쪽이고 끝나면 resolve 로 결과를 채워야 한다
+        (여러 작업을 한 풀에서 돌리고 끝나는 순서대로 채우는 쪽용)."""
+        with self._lock:
+            fut = self._calls.get(key) or (self._reuse(key, time.time()) if self.ttl else None)
+            if fut is not None:
+                self.joined += 1
+                return fut, False
+            fut = self._calls[key] = concurrent.futures.Future()
+            self.started += 1
+            return fut, True
+
+    def resolve(self, key, fut, result=None, error: BaseException = None) -> None:
+        if error is None:
+            fut.set_result(result)
+        elif isinstance(error, Exception):
+            fut.set_exception(error)
+        else:
+            # 중단 · rerun 같은 흐름 제어 예외: 기다리던 쪽을 깨우고(각자 다시 실행) 결과는 남기지 않음
+            self._finish(key, fut, keep=False)
+            fut.set_exception(error)
+            return
+        self._finish(key, fut, keep=bool(self.ttl))
+
+    def future(self, key, fn, *args, **kwargs) -> tuple:
+        """(Future, shared). shared=False 이면 이 호출이 fn 을 실행한 쪽 (fn 은 호출 스레드에서 바로 실행)."""
+        fut, owner = self.claim(key)
+        if not owner:
+            return fut, True
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            self.resolve(key, fut, error=e)
+            if not isinstance(e, Exception):
+                raise
+        else:
+            self.resolve(key, fut, result)
+        return fut, False
+
+    def _finish(self, key, fut, keep: bool) -> None:
+        with self._lock:
+            self._calls.pop(key, None)
+            if keep:
+                self._results[key] = (time.time(), fut)
+                while len(self._results) > self.max_results:
+                    self._results.pop(next(iter(self._results)))
+
+    def do(self, key, fn, *args, **kwargs) -> tuple:
+        """(결과, shared). 합류한 호출은 진행 중인 작업이 끝날 때까지 기다린다."""
+        fut, shared = self.future(key, fn, *args, **kwargs)
+        if shared:
+            try:
+                return fut.result(), True
+            except Exception:
+                raise
+            except BaseException:
+                return self.do(key, fn, *args, **kwargs)
+        return fut.result(), False
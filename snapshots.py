@@ -0,0 +1,148 @@
+"""
+수집 실행 스냅샷 (gzip JSON Lines)
+- 실행 1회 = 파일 1개: 첫 줄은 실행 정보(모드 · 생성 시각 · 요약 · 소스별 건수 · 소요 시간), 다음 줄부터 기사 1건씩
+- 파일 이름이 생성 시각(KST, 마이크로초까지)이라 기간 조회는 디렉터리 목록만으로 끝남 — 헤더만 필요하면 첫 줄만 풀어 읽음
+  같은 이름이 이미 있으면 -1, -2 … 를 붙여 저장 (앱 수집 · 예약 리포트 · 여러 세션이 동시에 저장해도 서로 덮지 않음)
+- 불러올 때는 파일 단위로 풀어 NewsBatch 로 만들고(파일 하나는 실행 1회 분량), 파일은 바뀌지 않으므로 프로세스 메모리에 캐시
+  iter_items 는 한 줄씩 스트리밍 (CLI · 일괄 처리용)
+- 여러 스냅샷 병합 = NewsBatch.concat → 제목 해시 중복 제거(최신 실행 우선) → 최신순 정렬
+- 저장 위치: NEWS_SNAPSHOT_DIR (기본 ./.cache/snapshots), NEWS_SNAPSHOT_DAYS(기본 14)일 지난 파일은 저장 때 정리
+"""
+
+import datetime
+import functools
+import gzip
+import json
+import os
+import threading
+
+from newsbatch import NewsBatch
+from newscore import kst_now
+
+SNAPSHOT_DIR = os.getenv("NEWS_SNAPSHOT_DIR") or os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), ".cache", "snapshots"
+)
+KEEP_DAYS = int(os.getenv("NEWS_SNAPSHOT_DAYS", "14") or 14)
+SUFFIX = ".jsonl.gz"
+_STAMP = "%Y%m%d-%H%M%S-%f"
+
+HEADER_KEYS = (
+    "mode",
+    "date",
+    "generated_at",
+    "provider",
+    "summary_quick",
+    "summary_deep",
+    "source_stats",
+    "source_notes",
+    "timings",
+)
+
+
+def _dir(mode: str) -> str:
+    return os.path.join(SNAPSHOT_DIR, mode)
+
+
+def save(report: dict, at: datetime.datetime = None) -> str:
+    """collect_report 형식의 dict 를 스냅샷으로 기록하고 경로를 돌려준다."""
+    at = at or kst_now()
+    os.makedirs(_dir(report["mode"]), exist_ok=True)
+    stem = os.path.join(_dir(report["mode"]), at.strftime(_STAMP))
+    header = {key: report.get(key) for key in HEADER_KEYS}
+    header["count"] = len(report.get("items", ()))
+    # 임시 파일은 프로세스 · 스레드마다 따로 (동시에 저장하는 쪽과 섞이지 않게)
+    tmp = f"{stem}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with gzip.open(tmp, "wt", encoding="utf-8", compresslevel=6) as f:
+        f.write(json.dumps(header, ensure_ascii=False) + "\n")
+        for item in report.get("items", ()):
+            f.write(json.dumps(item, ensure_ascii=False, separators=(",", ":")) + "\n")
+    path = _publish(tmp, stem)
+    prune(report["mode"], at - datetime.timedelta(days=KEEP_DAYS))
+    return path
+
+
+def _publish(tmp: str, stem: str) -> str:
+    """tmp 를 stem(+번호).jsonl.gz 로 옮긴다. link 는 대상이 있으면 실패하므로 다른 실행의 파일을 덮지 않음."""
+    n = 0
+    try:
+        while True:
+            path = f"{stem}-{n}{SUFFIX}" if n else stem + SUFFIX
+            try:
+                os.link(tmp, path)
+                return path
+            except FileExistsError:
+                n += 1
+    finally:
+        os.remove(tmp)
+
+
+def prune(mode: str, before: datetime.datetime) -> int:
+    cutoff = before.strftime(_STAMP)
+    removed = 0
+    for name in _names(mode):
+        if name < cutoff:
+            try:
+                os.remove(os.path.join(_dir(mode), name + SUFFIX))
+                removed += 1
+            except OSError:
+                pass
+    return removed
+
+
+def _names(mode: str) -> list:
+    try:
+        return sorted(name[: -len(SUFFIX)] for name in os.listdir(_dir(mode)) if name.endswith(SUFFIX))
+    except OSError:
+        return []
+
+
+def list_paths(mode: str, days: float = 7, now: datetime.datetime = None) -> list:
+    """최근 days 일 스냅샷 경로 (최신 → 과거). 파일을 열지 않고 이름으로만 거른다."""
+    cutoff = ((now or kst_now()) - datetime.timedelta(days=days)).strftime(_STAMP)
+    return [os.path.join(_dir(mode), name + SUFFIX) for name in reversed(_names(mode)) if name >= cutoff]
+
+
+def read_header(path: str) -> dict:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return json.loads(f.readline())
+
+
+def iter_items(path: str):
+    """헤더를 건너뛰고 기사를 한 줄씩 풀어 내보낸다 (파일 전체를 메모리에 올리지 않음)."""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        f.readline()
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+@functools.lru_cache(maxsize=128)
+def _load(path: str, mtime: float) -> tuple:
+    with gzip.open(path, "rb") as f:
+        header = json.loads(f.readline())
+        # 줄마다 json.loads 하는 것보다 배열 하나로 묶어 한 번에 파싱하는 쪽이 2배 가까이 빠름
+        lines = [line for line in f.read().splitlines() if line.strip()]
+    return header, NewsBatch.from_items(json.loads(b"[" + b",".join(lines) + b"]"))
+
+
+def load(path: str) -> tuple:
+    """(헤더, NewsBatch). 같은 파일은 한 번만 읽는다."""
+    return _load(path, os.path.getmtime(path))
+
+
+def merge(paths: list) -> tuple:
+    """여러 스냅샷 → (기사 목록, 소스별 고유 건수, 헤더 목록). paths 는 최신 우선 순서."""
+    headers, batches = [], []
+    for path in paths:
+        try:
+            header, batch = load(path)
+        except (OSError, ValueError, EOFError):
+            continue
+        headers.append(header)
+        batches.append(batch)
+    merged = NewsBatch.concat(batches).dedup().sort_desc()
+    return merged.to_items(), merged.source_counts(), headers
+
+
+def load_recent(mode: str, days: float = 7) -> tuple:
+    return merge(list_paths(mode, days))
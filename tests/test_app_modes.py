@@ -0,0 +1,107 @@
+"""
+대시보드 모드 전환 — 사전 생성 리포트와 공용 저장소(ItemStore) 중 무엇을 보여 주는지 확인
+- 수집은 모의 서버(mockserver)를 상대로, 기록 · 리포트 · 스냅샷 파일은 임시 디렉터리에
+"""
+
+import os
+
+import pytest
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+import alerts
+import history
+import mockserver
+import newscore
+import ratelimit
+import reports
+import snapshots
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cryotostock.py")
+STOCK, COIN = "📈 주식 뉴스", "🪙 코인 뉴스"
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    srv = mockserver.MockServer(0).start()
+    monkeypatch.setattr(newscore, "MOCK_BASE", srv.base)
+    monkeypatch.setattr(history, "DB_PATH", str(tmp_path / "history.sqlite"))
+    monkeypatch.setattr(ratelimit, "DB_PATH", str(tmp_path / "ratelimit.sqlite"))
+    monkeypatch.setattr(reports, "REPORT_DIR", str(tmp_path / "reports"))
+    monkeypatch.setattr(snapshots, "SNAPSHOT_DIR", str(tmp_path / "snapshots"))
+    monkeypatch.setattr(alerts, "WATCHLISTS_FILE", str(tmp_path / "watchlists.json"))
+    monkeypatch.setattr(alerts, "OUTBOX_FILE", str(tmp_path / "alerts.jsonl"))
+    monkeypatch.setattr(alerts, "_book", None)
+    for key in ("GEMINI_API_KEY", "OPENAI_API_KEY", "APP_PASSWORD"):
+        monkeypatch.setenv(key, "")
+    monkeypatch.setenv("FINNHUB_API_KEY", "mock")
+    st.cache_resource.clear()  # 공용 저장소 · 데이터셋 · 비밀 값을 테스트마다 새로
+    yield srv
+    st.cache_resource.clear()
+    srv.stop()
+
+
+def _coin_report() -> dict:
+    items = [
+        newscore.make_item(title=f"Coin report headline {i}", url=f"https://example.com/c/{i}", source="CoinDesk")
+        for i in range(12)
+    ]
+    return {
+        "mode": "coin",
+        "date": newscore.today_str(),
+        "generated_at": newscore.kst_now().strftime("%Y-%m-%d %H:%M"),
+        "provider": "Gemini 2.5 Pro",
+        "summary_quick": "코인 리포트 요약",
+        "summary_deep": "",
+        "source_stats": {"CoinDesk": len(items)},
+        "source_notes": {},
+        "items": items,
+        "timings": {},
+    }
+
+
+def _shown(at: AppTest) -> list:
+    return [c.value for c in at.caption if "건 표시" in c.value or "사전 생성 리포트" in c.value]
+
+
+def _collect_stock(at: AppTest) -> None:
+    at.run()
+    assert not at.exception
+    next(b for b in at.button if "수집 시작" in b.label).click().run()
+    assert not at.exception
+
+
+def test_report_wins_over_other_mode_store_entries(server):
+    reports.save_report(_coin_report())
+    at = AppTest.from_file(APP, default_timeout=90)
+    _collect_stock(at)
+
+    # 같은 세션에서 코인으로 전환: 저장소에는 주식 소스뿐 → 키워드 기사 대신 리포트
+    at.radio[0].set_value(COIN).run()
+    assert not at.exception
+    shown = _shown(at)
+    assert "12건 표시 중" in shown
+    assert any("사전 생성 리포트" in caption for caption in shown)
+
+    # 새 세션도 같음
+    fresh = AppTest.from_file(APP, default_timeout=90)
+    fresh.run()
+    fresh.radio[0].set_value(COIN).run()
+    assert not fresh.exception
+    assert "12건 표시 중" in _shown(fresh)
+
+
+def test_store_view_newer_than_report_replaces_it(server):
+    report = _coin_report()
+    report["mode"] = "stock"
+    report["generated_at"] = "2000-01-01 00:00"
+    at = AppTest.from_file(APP, default_timeout=90)
+    at.run()
+    reports.save_report(report)
+    _collect_stock(at)
+    at.radio[0].set_value(COIN).run()
+    at.radio[0].set_value(STOCK).run()
+    assert not at.exception
+    shown = _shown(at)
+    assert not any("사전 생성 리포트" in caption for caption in shown)
+    assert shown and shown[0] != "12건 표시 중"
@@ -0,0 +1,66 @@
+"""
+htmltext.html_to_text 가 BeautifulSoup(html.parser) 과 같은 결과를 내는지, RSS 경로가 설명을 한 번만 정리하는지 확인
+- 고정 입력: tests/fixtures/rss_markup.xml (모의 서버 제목 + 흔한 피드 설명 마크업 50건)
+"""
+
+import os
+import re
+
+import pytest
+
+import lazydeps
+import newscore
+from htmltext import html_to_text
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "rss_markup.xml")
+
+
+def _markup() -> bytes:
+    with open(FIXTURE, "rb") as f:
+        return f.read()
+
+
+def _descriptions() -> list:
+    feed = lazydeps.soup(_markup(), "xml")
+    return [el.get_text(strip=True) for el in feed.find_all("description")]
+
+
+def _reference(text: str, sep: str = " ") -> str:
+    soup = lazydeps.soup(text, "html.parser")
+    if sep:
+        return re.sub(r"\s+", " ", soup.get_text(separator=sep)).strip()
+    return soup.get_text(strip=True)
+
+
+@pytest.fixture
+def all_recent(monkeypatch):
+    # 고정 파일의 발행 시각이 지나도 기사가 걸러지지 않도록
+    monkeypatch.setattr(newscore, "is_recent", lambda pub: True)
+
+
+def test_fixture_has_items():
+    assert len(_descriptions()) == 50
+
+
+@pytest.mark.parametrize("sep", [" ", ""])
+def test_matches_beautifulsoup(sep):
+    mismatches = [text for text in _descriptions() if html_to_text(text, sep=sep) != _reference(text, sep)]
+    assert mismatches == []
+
+
+def test_rss_description_cleaned_once(monkeypatch, all_recent):
+    calls = []
+
+    def counting(text, sep=" "):
+        calls.append(text)
+        return html_to_text(text, sep)
+
+    monkeypatch.setattr(newscore, "html_to_text", counting)
+    items = newscore.parse_rss(_markup(), "Fixture")
+    assert len(items) == 50
+    assert len(calls) == 50
+    assert [item["description"] for item in items] == [_reference(text)[:200].rstrip() for text in _descriptions()]
+
+
+def test_fast_and_slow_rss_paths_agree(all_recent):
+    assert newscore.parse_rss(_markup(), "Fixture") == newscore._parse_rss_slow(_markup(), "Fixture")
@@ -0,0 +1,269 @@
+"""
+뉴스 주제 묶기 (로컬 · CPU 전용)
+- 제목 + 설명 앞부분을 단어 · 바이그램 해시 특징(TF-IDF)으로 변환
+- 단일 패스 증분 클러스터링: 가장 가까운 주제 중심과의 코사인 유사도가 임계값 이상이면 합류, 아니면 새 주제
+  (후보 주제는 특징 → 주제 역색인으로만 찾으므로 주제 수가 늘어도 비교 횟수는 공유 단어 수에 비례)
+- 후보는 고유한 단어(종목 · 기관 · 자산 이름 등)를 공유하는 주제로 한정 — "record high" · "shares rise" 같은 시황 상투어만
+  겹치는 서로 다른 기사(금값 · S&P 500 · 비트코인 ETF)는 합치지 않음
+- TopicIndex 는 상태를 유지해 새 기사만 add 해도 됨
+- AI 프롬프트에는 주제별 요약(대표 헤드라인 · 건수 · 소스)을, 화면에는 접을 수 있는 묶음을 제공
+"""
+
+import math
+import re
+import zlib
+
+from newsbatch import title_digest
+from normalize import item_epoch
+
+DIM = 1 << 20
+THRESHOLD = 0.25
+BIGRAM_WEIGHT = 0.5
+DESC_CHARS = 160
+DUPLICATE = 0.6  # 프롬프트에서 대표 기사 · 이미 실은 헤드라인과 단어가 이만큼 겹치면 같은 내용으로 보고 생략
+PROMPT_HEADLINES = 150  # 프롬프트에 싣는 헤드라인 총 상한 (대표 + 관련)
+PROMPT_CHARS = 24000  # 프롬프트 기사 부분 글자 수 상한
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9'&.-]*[a-z0-9]|[a-z0-9]")
+_STOPWORDS = frozenset(
+    """
+    a an the and or but if of to in on at by for with from as into over after before about than then
+    is are was were be been being has have had do does did will would can could should may might must
+    it its this that these those there their they them he she his her we our you your i me my
+    not no yes new says said say up down out more most less least very just also amid vs via per
+    how what why when where who which while all any some each other such only own same so too
+    news report reports update updates live today week year day latest breaking
+    """.split()
+)
+
+# 시황 기사에 두루 나오는 단어 (어간 처리 후 형태 포함) — 이것만 겹쳐서는 같은 주제로 묶지 않음
+_GENERIC = frozenset(
+    """
+    share stock price market index future record high higher low lower top big
+    hit rise rising rose riser fall falling fell jump jumped surge surged soar soared climb climbed gain gained
+    rally rallie rallied rallying slide slid drop dropped sink sank tumble tumbled plunge plunged rebound rebounded
+    slip slipped edge edged boost boosted extend extended trim trimmed
+    earning beat miss missed estimate forecast quarter quarterly result revenue profit sale outlook guidance
+    inflow outflow investor trader trading analyst expect expected demand supply volume growth level
+    rate cut hike bet hope fear concern worry sign signal data deal plan
+    million billion trillion percent pct first second third month
+    """.split()
+)
+
+# 같은 대상을 가리키는 흔한 표기
+_ALIASES = {
+    "federal": "fed",
+    "fomc": "fed",
+    "btc": "bitcoin",
+    "eth": "ethereum",
+    "ether": "ethereum",
+    "crude": "oil",
+    "s&p": "sp500",
+    "spx": "sp500",
+}
+
+
+def _stem(tok: str) -> str:
+    if tok in _ALIASES:
+        return _ALIASES[tok]
+    # 복수형 정도만 맞춤 (etfs → etf, rates → rate). 's 소유격도 제거
+    if tok.endswith("'s"):
+        return tok[:-2]
+    if len(tok) > 3 and tok.endswith("s") and not tok.endswith("ss"):
+        return tok[:-1]
+    return tok
+
+
+def _tokens(text: str) -> list:
+    return [_stem(tok) for tok in _TOKEN.findall(text.lower()) if tok not in _STOPWORDS and (len(tok) > 1 or tok.isdigit())]
+
+
+def _hash(term: str) -> int:
+    return zlib.crc32(term.encode()) & (DIM - 1)
+
+
+def _features(item: dict) -> tuple:
+    """해시 특징 → 빈도 (바이그램은 BIGRAM_WEIGHT), 라벨용 원문 토큰, 고유 단어(_GENERIC · 숫자 제외)의 해시."""
+    words = _tokens(item.get("title", "") + " " + (item.get("description") or "")[:DESC_CHARS])
+    terms = [(w, 1.0) for w in words] + [(f"{a} {b}", BIGRAM_WEIGHT) for a, b in zip(words, words[1:])]
+    counts, names = {}, {}
+    for term, weight in terms:
+        h = _hash(term)
+        counts[h] = counts.get(h, 0.0) + weight
+        names[h] = term
+    anchors = {_hash(w) for w in words if w not in _GENERIC and not w.isdigit()}
+    return counts, names, anchors
+
+
+class Topic:
+    __slots__ = ("id", "members", "centroid", "norm", "_sq", "latest")
+
+    def __init__(self, topic_id: int):
+        self.id = topic_id
+        self.members = []  # (item, vector)
+        self.centroid = {}  # 멤버 벡터 합
+        self.norm = 0.0
+        self._sq = 0.0
+        self.latest = float("-inf")
+
+    def add(self, item: dict, vec: dict) -> None:
+        self.members.append((item, vec))
+        for h, w in vec.items():
+            old = self.centroid.get(h, 0.0)
+            self.centroid[h] = old + w
+            self._sq += w * (2 * old + w)
+        self.norm = math.sqrt(self._sq)
+        ts = item_epoch(item)
+        if not math.isnan(ts):
+            self.latest = max(self.latest, ts)
+
+    def similarity(self, vec: dict) -> float:
+        if not self.norm:
+            return 0.0
+        return sum(w * self.centroid.get(h, 0.0) for h, w in vec.items()) / self.norm
+
+
+class TopicIndex:
+    def __init__(self, threshold: float = THRESHOLD):
+        self.threshold = threshold
+        self.topics = []
+        self.docs = 0
+        self._df = {}
+        self._postings = {}  # 특징 → 주제 id 집합
+        self._names = {}
+        self._seen = set()
+        self.topic_of = {}  # 제목 해시 → 주제
+
+    def add(self, items) -> int:
+        """새 기사만 반영하고 추가된 건수를 돌려준다 (제목 해시 기준으로 이미 본 기사는 건너뜀)."""
+        added = 0
+        for item in items:
+            key = title_digest(item.get("title", ""))
+            if key in self._seen:
+                continue
+            self._seen.add(key)
+            self.topic_of[key] = self._add(item)
+            added += 1
+        return added
+
+    def _vector(self, counts: dict) -> dict:
+        self.docs += 1
+        for h in counts:
+            self._df[h] = self._df.get(h, 0) + 1
+        vec = {h: (1 + math.log(tf) if tf >= 1 else tf) * (math.log((1 + self.docs) / (1 + self._df[h])) + 1) for h, tf in counts.items()}
+        norm = math.sqrt(sum(w * w for w in vec.values())) or 1.0
+        return {h: w / norm for h, w in vec.items()}
+
+    def _add(self, item: dict) -> Topic:
+        counts, names, anchors = _features(item)
+        self._names.update(names)
+        vec = self._vector(counts)
+        # 고유 단어를 하나 이상 공유하는 주제만 후보 (상투어만 겹치는 주제는 유사도가 높아도 제외)
+        candidates = set()
+        for h in anchors:
+            candidates.update(self._postings.get(h, ()))
+        best, best_sim = None, self.threshold
+        for topic_id in candidates:
+            sim = self.topics[topic_id].similarity(vec)
+            if sim >= best_sim:
+                best, best_sim = self.topics[topic_id], sim
+        if best is None:
+            best = Topic(len(self.topics))
+            self.topics.append(best)
+        best.add(item, vec)
+        for h in vec:
+            self._postings.setdefault(h, set()).add(best.id)
+        return best
+
+    def label(self, topic: Topic, terms: int = 3) -> str:
+        """중심 벡터에서 가중치가 큰 단어 (바이그램 우선, 겹치는 단어는 생략)."""
+        ranked = sorted(topic.centroid.items(), key=lambda kv: -kv[1])
+        picked = []
+        for h, _ in ranked[: terms * 6]:
+            name = self._names.get(h, "")
+            if not name or any(name in p or p in name for p in picked):
+                continue
+            picked.append(name)
+            if len(picked) == terms:
+                break
+        return " · ".join(picked)
+
+    def summaries(self, min_size: int = 1) -> list:
+        """주제 목록 (큰 주제 → 최신 주제 순). 각 항목: label, size, sources, lead, items."""
+        result = []
+        for topic in self.topics:
+            if len(topic.members) < min_size:
+                continue
+            lead = max(topic.members, key=lambda m: topic.similarity(m[1]))[0]
+            items = [lead] + [item for item, _ in topic.members if item is not lead]
+            sources = sorted({item.get("source", "") for item in items})
+            result.append(
+                {
+                    "id": topic.id,
+                    "label": self.label(topic),
+                    "size": len(items),
+                    "sources": sources,
+                    "lead": lead,
+                    "items": items,
+                    "latest": topic.latest,
+                }
+            )
+        result.sort(key=lambda t: (-t["size"], -t["latest"]))
+        return result
+
+
+def cluster(news_list: list, threshold: float = THRESHOLD) -> list:
+    index = TopicIndex(threshold)
+    index.add(news_list)
+    return index.summaries()
+
+
+def _overlap(a: set, b: set) -> float:
+    return len(a & b) / (min(len(a), len(b)) or 1)
+
+
+def build_topic_text(
+    news_list: list,
+    limit: int = 60,
+    duplicate: float = DUPLICATE,
+    bodies=None,
+    groups=None,
+    max_headlines: int = PROMPT_HEADLINES,
+    max_chars: int = PROMPT_CHARS,
+) -> str:
+    """AI 프롬프트용: 주제당 대표 헤드라인 1건(+설명 또는 본문 발췌)과, 이미 실은 헤드라인과 단어 겹침이 duplicate 미만인
+    관련 헤드라인을 싣는다 (같은 소식의 재탕만 빠짐). 헤드라인 max_headlines 건 · max_chars 자에 닿으면 거기서 멈춤.
+    groups 를 주면 그 순서대로 (ranking.rank_topics — 중요한 주제부터), 없으면 큰 주제 순."""
+    bodies = bodies or {}
+    lines, headlines, chars = [], 0, 0
+
+    def full(line: str) -> bool:
+        return headlines >= max_headlines or chars + len(line) > max_chars
+
+    for topic in (cluster(news_list) if groups is None else groups)[:limit]:
+        lead = topic["lead"]
+        if topic["size"] > 1:
+            head = f"- [주제: {topic['label']} · {topic['size']}건 · {', '.join(topic['sources'][:4])}] {lead['title']}"
+        else:
+            head = f"- [{lead['source']}] {lead['title']}"
+        body = bodies.get(lead.get("url", ""))
+        if body:
+            head += f"\n  본문: {' '.join(body.split())}"
+        elif lead.get("description"):
+            head += f"\n  {lead['description'][:120]}"
+        if full(head):
+            break
+        lines.append(head)
+        headlines, chars = headlines + 1, chars + len(head) + 1
+        shown = [set(_tokens(lead["title"]))]
+        for item in topic["items"][1:]:
+            words = set(_tokens(item["title"]))
+            if any(_overlap(words, seen) >= duplicate for seen in shown):
+                continue
+            line = f"  · [{item['source']}] {item['title']}"
+            if full(line):
+                break
+            shown.append(words)
+            lines.append(line)
+            headlines, chars = headlines + 1, chars + len(line) + 1
+    return "\n".join(lines)